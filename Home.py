@@ -1,26 +1,59 @@
+import glob
+import os
 import streamlit as st
+import db
+import preload
+import profiling
 
-st.set_page_config(page_title="Home", layout="centered", initial_sidebar_state="collapsed")
-st.title("Welcome to Business-Helper Dashboard")
+# Home.py is the router: every page is registered here with st.navigation
+# (Streamlit 1.36+), so the app decides per process which pages exist and
+# every run passes through one place before the page script. The pages live
+# in app_pages/, not pages/: while a pages/ directory exists Streamlit
+# discovers and serves those files on its own, without running Home.py.
+# The Diagnostics page (diagnostics.py) is only served, and listed, with
+# profiling on.
+ROOT = os.path.dirname(os.path.abspath(__file__))
 
-st.markdown("Use the buttons below or the sidebar to navigate between tools.")
 
-# prices 
-st.header("🛒 E-Commerce Tools and Pricing Tools")
-st.page_link("pages/Discount_and_Pricing_Strategy_Assistant.py", label="Discount & Pricing Strategy Assistant", icon="📊")
-st.page_link("pages/Bulk_margin.py", label="Bulk Profit Analyzer", icon="📁")
-st.page_link("pages/Break_even.py", label="Break-Even ROI Simulator", icon="📉")
+def home():
+    profiling.track_run(__file__)
+    st.set_page_config(page_title="Home", layout="centered", initial_sidebar_state="collapsed")
+    st.title("Welcome to Business-Helper Dashboard")
 
-# pharmacies
-st.header("🏥 Pharmacy Management")
-st.page_link("pages/pharmacy_terms.py", label="Pharmacy Terms", icon="📋")
-st.page_link("pages/priority_products.py", label="Sell-out/Priority Products", icon="⭐")
+    st.markdown("Use the buttons below or the sidebar to navigate between tools.")
 
-st.page_link("pages/Natural_Rabatte_Calculator.py", label=" Natural Rabatte Calculator", icon="💰")
-st.page_link("pages/Retail_Price_calculator.py", label="Retail Price Calculator", icon="🛍️")
-st.page_link("pages/Marketing_Activities.py", label="Marketing Activities", icon="📢️")
+    # prices 
+    st.header("🛒 E-Commerce Tools and Pricing Tools")
+    st.page_link("app_pages/Discount_and_Pricing_Strategy_Assistant.py", label="Discount & Pricing Strategy Assistant", icon="📊")
+    st.page_link("app_pages/Bulk_margin.py", label="Bulk Profit Analyzer", icon="📁")
+    st.page_link("app_pages/Break_even.py", label="Break-Even ROI Simulator", icon="📉")
+    st.page_link("app_pages/net_price_matrix.py", label="Catalog Net Price Matrix", icon="🧮")
 
-# administration
-st.header("🗂️ Administrative Tasks")
-st.page_link("pages/Invoice_Tracking.py", label="Invoice Tracking", icon="📑")
-st.page_link("pages/products.py", label="Product List", icon="📦")
\ No newline at end of file
+    # pharmacies
+    st.header("🏥 Pharmacy Management")
+    st.page_link("app_pages/pharmacy_terms.py", label="Pharmacy Terms", icon="📋")
+    st.page_link("app_pages/priority_products.py", label="Sell-out/Priority Products", icon="⭐")
+    st.page_link("app_pages/pharmacy_pnl.py", label="Pharmacy P&L", icon="💹")
+
+    st.page_link("app_pages/Natural_Rabatte_Calculator.py", label=" Natural Rabatte Calculator", icon="💰")
+    st.page_link("app_pages/Retail_Price_calculator.py", label="Retail Price Calculator", icon="🛍️")
+    st.page_link("app_pages/Marketing_Activities.py", label="Marketing Activities", icon="📢️")
+
+    # administration
+    st.header("🗂️ Administrative Tasks")
+    st.page_link("app_pages/Invoice_Tracking.py", label="Invoice Tracking", icon="📑")
+    st.page_link("app_pages/products.py", label="Product List", icon="📦")
+
+
+preload.start()
+pages = [st.Page(home, title="Home", default=True)]
+pages += [st.Page(path) for path in sorted(glob.glob(os.path.join(ROOT, "app_pages", "*.py")))]
+if profiling.ENABLED:
+    pages.append(st.Page(os.path.join(ROOT, "diagnostics.py"), title="Diagnostics", icon="🩺"))
+try:
+    st.navigation(pages).run()
+finally:
+    # end the run's timing and return its connections to the pool here, not
+    # when the script thread is collected
+    profiling.finish_run()
+    db.release()
@@ -0,0 +1,267 @@
+import streamlit as st
+import numpy as np
+import pricing
+import reports
+import profiling
+
+# plotly and crud_products (db, migrations) are imported by the sections that use
+# them, so a first visit that only uses the calculator does not load them
+
+profiling.track_run(__file__)
+st.set_page_config(page_title="Break-Even & Campaign ROI Simulator", layout="wide", initial_sidebar_state="collapsed")
+st.title("🎯 Break-Even & Campaign ROI Simulator")
+
+#inputs and options
+campaign_cost = st.number_input("📢 Total Campaign Budget (BGN)", min_value=0.0, value=2000.0, step=100.0)
+
+st.subheader("📦 Per-Conversion Costs")
+production_cost = st.number_input("Production Cost per Unit", 0.0, value=5.0, step=0.1)
+packaging_cost = st.number_input("Packaging Cost", 0.0, value=0.88, step=0.1)
+delivery_cost = st.number_input("Delivery Cost", 0.0, value=6.0, step=0.1)
+marketing_cost = st.number_input("Marketing Cost per Conversion", 0.0, value=2.0, step=0.1)
+platform_fee = st.number_input("Platform Fee (%)", 0.0, 20.0, value=2.9, step=0.1)
+
+st.subheader("🎁 Promotion Strategy")
+promo_type = st.selectbox("Promotion Type", pricing.PROMO_TYPES)
+unit_price = st.number_input("Selling Price per Unit", 0.01, value=20.0, step=0.1)
+
+discount_percent = 0
+if promo_type == pricing.PROMO_FLAT_DISCOUNT:
+    discount_percent = st.slider("Discount %", 0, 100, 15)
+
+adjusted_price, adjusted_production = pricing.apply_promo(unit_price, production_cost, promo_type, discount_percent)
+
+st.subheader("🔢 Adjusted Values")
+col1, col2 = st.columns(2)
+col1.metric("🛠 Production Cost (Unit => Adjusted)", f"{production_cost:.2f} BGN => {adjusted_production:.2f} BGN")
+col2.metric("💰 Selling Price (Unit => Adjusted)", f"{unit_price:.2f} BGN => {adjusted_price:.2f} BGN")
+
+#calculate
+platform_fee_cost = pricing.platform_fee(adjusted_price, platform_fee)
+total_cost = pricing.total_cost(adjusted_price, adjusted_production, packaging_cost, delivery_cost, marketing_cost, platform_fee)
+net_profit = adjusted_price - total_cost
+
+break_even_conversions = pricing.break_even_conversions(campaign_cost, net_profit)
+max_spend_conversion = campaign_cost / break_even_conversions if break_even_conversions != 0 else 0
+
+st.header("📊 Break-Even Results")
+col1, col2 = st.columns(2)
+col1.metric("Net Profit per Conversion", f"{net_profit:.2f} BGN")
+col2.metric("Break-Even Conversions", f"{break_even_conversions:.0f}")
+st.metric("📏 Max Spend per Conversion", f"{max_spend_conversion:.2f} BGN")
+
+if net_profit <= 0:
+    st.error("⚠️ You're not making profit per conversion.")
+
+#forecast
+st.markdown("---")
+st.subheader("📈 Optional Forecast")
+
+show_forecast = st.checkbox("Estimate based on expected conversions")
+expected_conversions = None
+expected_total_profit = None
+roi_percent = None
+target_cost = None
+
+if show_forecast:
+    expected_conversions = st.number_input("Expected Number of Conversions", min_value=10, step=10, value=1000)
+    expected_total_profit = (net_profit * expected_conversions) - campaign_cost
+    roi_percent = (expected_total_profit / campaign_cost * 100) if campaign_cost > 0 else 0
+
+    st.metric("📈 Forecasted Net Profit", f"{expected_total_profit:.2f} BGN")
+    st.metric("💸 ROI", f"{roi_percent:.2f}%")
+
+    target_cost = adjusted_price - ((expected_total_profit + campaign_cost) / expected_conversions)
+    st.metric("📏 Max Cost per Conversion to Hit Target", f"{target_cost:.2f} BGN")
+
+    if total_cost > target_cost:
+        st.error("⚠️ Too expensive to reach your goal.")
+    else:
+        st.success("✅ Your cost structure supports your profit target.")
+
+show_simulation = st.checkbox("🎲 Simulate ROI under uncertainty (Monte Carlo)")
+simulation = None
+
+if show_simulation:
+    @st.cache_data(max_entries=32, show_spinner=False)
+    def run_simulation(**inputs):
+        return pricing.simulate_roi(**inputs)
+
+    def triangular_inputs(label, low, mode, high, step, key):
+        col1, col2, col3 = st.columns(3)
+        return (
+            col1.number_input(f"{label} – low", 0.0, value=float(low), step=step, key=f"{key}_low"),
+            col2.number_input(f"{label} – most likely", 0.0, value=float(mode), step=step, key=f"{key}_mode"),
+            col3.number_input(f"{label} – high", 0.0, value=float(high), step=step, key=f"{key}_high"),
+        )
+
+    base_conversions = expected_conversions or 1000
+    conversions_dist = triangular_inputs("Conversions", base_conversions * 0.5, base_conversions, base_conversions * 1.5, 10.0, "mc_conv")
+    marketing_dist = triangular_inputs("Marketing cost per conversion", marketing_cost * 0.5, marketing_cost, marketing_cost * 2, 0.1, "mc_mkt")
+    delivery_dist = triangular_inputs("Delivery cost", delivery_cost * 0.9, delivery_cost, delivery_cost * 1.2, 0.1, "mc_del")
+    if promo_type != pricing.PROMO_NONE:
+        uptake_dist = tuple(v / 100 for v in triangular_inputs("Promo uptake (%)", 20, 50, 80, 5.0, "mc_uptake"))
+    else:
+        uptake_dist = (0.0, 0.0, 0.0)
+
+    col1, col2 = st.columns(2)
+    draws = col1.number_input("Draws", 10_000, 5_000_000, 1_000_000, step=100_000)
+    seed = col2.number_input("Random seed", 0, value=42, step=1)
+
+    simulation = run_simulation(
+        price=unit_price, production=production_cost,
+        promo_price=adjusted_price, promo_production=adjusted_production,
+        packaging=packaging_cost, platform_fee_pct=platform_fee, campaign_budget=campaign_cost,
+        conversions=conversions_dist, marketing=marketing_dist, delivery=delivery_dist,
+        promo_uptake=uptake_dist, draws=int(draws), seed=int(seed),
+    )
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("ROI P5", f"{simulation['p5']:.1f}%")
+    col2.metric("ROI P50", f"{simulation['p50']:.1f}%")
+    col3.metric("ROI P95", f"{simulation['p95']:.1f}%")
+    col4.metric("Probability of Loss", f"{simulation['prob_loss'] * 100:.1f}%")
+
+    import plotly.graph_objects as go
+
+    edges = simulation["hist_edges"]
+    fig = go.Figure(go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=simulation["hist_counts"],
+                           width=np.diff(edges), marker_color="#4c78a8"))
+    fig.add_vline(x=0, line_color="red", line_dash="dash")
+    fig.update_layout(title=f"ROI Distribution ({int(draws):,} draws)", xaxis_title="ROI (%)",
+                      yaxis_title="Draws", bargap=0)
+    st.plotly_chart(fig, use_container_width=True)
+
+    if simulation["prob_loss"] > 0.2:
+        st.error("⚠️ More than 1 in 5 simulated outcomes lose money.")
+
+#sensitivity sweep
+st.markdown("---")
+st.subheader("🧮 Sensitivity Sweep")
+
+# break_even is a dense float64 array of every combination: 5M scenarios is 40 MB
+MAX_SWEEP_SCENARIOS = 5_000_000
+
+if st.checkbox("Sweep price, discount, marketing cost and budget"):
+    col1, col2 = st.columns(2)
+    with col1:
+        price_range = st.slider("Selling price range (BGN)", 0.5, 200.0, (min(max(0.5, unit_price * 0.5), 199.5), min(unit_price * 2, 200.0)), step=0.5)
+        discount_range = st.slider("Discount range (%)", 0, 90, (0, 50))
+        marketing_range = st.slider("Marketing cost per conversion range (BGN)", 0.0, 50.0, (0.0, min(max(marketing_cost * 3, 1.0), 50.0)), step=0.5)
+        budget_range = st.slider("Campaign budget range (BGN)", 0.0, 50000.0, (min(campaign_cost * 0.5, 49900.0), min(max(campaign_cost * 2, 100.0), 50000.0)), step=100.0)
+    with col2:
+        n_prices = st.number_input("Price steps", 2, 500, 100)
+        n_discounts = st.number_input("Discount steps", 2, 200, 20)
+        n_marketing = st.number_input("Marketing cost steps", 2, 200, 25)
+        n_budgets = st.number_input("Budget steps", 2, 200, 20)
+
+    scenarios = int(n_prices) * int(n_discounts) * int(n_marketing) * int(n_budgets)
+    if scenarios > MAX_SWEEP_SCENARIOS:
+        st.error(f"⚠️ {scenarios:,} scenarios is too many to evaluate; reduce the steps to at most "
+                 f"{MAX_SWEEP_SCENARIOS:,} combinations in total.")
+    else:
+        prices = np.linspace(*price_range, int(n_prices))
+        discounts = np.linspace(*discount_range, int(n_discounts))
+        marketing_costs = np.linspace(*marketing_range, int(n_marketing))
+        budgets = np.linspace(*budget_range, int(n_budgets))
+
+        grid = pricing.sensitivity_grid(prices, discounts, marketing_costs, budgets,
+                                        production_cost, packaging_cost, delivery_cost, platform_fee)
+        profitable_share = (grid["net_profit"] > 0).mean() * 100
+        st.caption(f"{grid['break_even'].size:,} scenarios evaluated. "
+                   f"A conversion is profitable in {profitable_share:.1f}% of price × discount × marketing combinations.")
+
+        col1, col2 = st.columns(2)
+        marketing_idx = col1.select_slider("Marketing cost slice (BGN)", options=range(len(marketing_costs)),
+                                           value=int(np.abs(marketing_costs - marketing_cost).argmin()),
+                                           format_func=lambda i: f"{marketing_costs[i]:.2f}")
+        budget_idx = col2.select_slider("Campaign budget slice (BGN)", options=range(len(budgets)),
+                                        value=int(np.abs(budgets - campaign_cost).argmin()),
+                                        format_func=lambda i: f"{budgets[i]:.0f}")
+
+        import plotly.graph_objects as go
+
+        profit_slice = grid["net_profit"][:, :, marketing_idx].T
+        fig = go.Figure(go.Heatmap(x=prices, y=discounts, z=profit_slice, colorscale="RdYlGn", zmid=0,
+                                   colorbar={"title": "BGN"}))
+        fig.add_trace(go.Contour(x=prices, y=discounts, z=profit_slice, contours={"start": 0, "end": 0, "coloring": "lines"},
+                                 line={"color": "black", "width": 2}, showscale=False, name="Break-even"))
+        fig.update_layout(title="Net Profit per Conversion", xaxis_title="Selling price (BGN)", yaxis_title="Discount (%)")
+        st.plotly_chart(fig, use_container_width=True)
+
+        break_even_slice = grid["break_even"][:, :, marketing_idx, budget_idx].T
+        # a zero budget breaks even at 0 conversions, which log10 cannot show
+        break_even_slice = np.where(np.isfinite(break_even_slice) & (break_even_slice > 0), break_even_slice, np.nan)
+        fig = go.Figure(go.Contour(x=prices, y=discounts, z=np.log10(break_even_slice), colorscale="Viridis",
+                                   customdata=break_even_slice,
+                                   hovertemplate="price %{x:.2f}<br>discount %{y:.1f}%<br>conversions %{customdata:,.0f}<extra></extra>",
+                                   colorbar={"title": "log10 conv."}))
+        fig.update_layout(title="Break-Even Conversions (blank = loss per conversion or zero budget)",
+                          xaxis_title="Selling price (BGN)", yaxis_title="Discount (%)")
+        st.plotly_chart(fig, use_container_width=True)
+
+#pdf download
+st.markdown("---")
+st.subheader("Download Summary as PDF")
+
+current_summary = reports.roi_summary(
+    "Current scenario", campaign_cost, unit_price, production_cost, packaging_cost, delivery_cost,
+    marketing_cost, platform_fee, promo_type, discount_percent,
+    expected_conversions if show_forecast else None,
+)
+
+backend = st.radio("PDF engine", reports.BACKENDS, horizontal=True)
+
+if st.button("📥 Generate PDF"):
+    pdf_bytes = reports.render(current_summary, backend)
+    st.download_button("📥 Download PDF", pdf_bytes, file_name="campaign_report.pdf", mime="application/pdf")
+
+#saved scenarios and batch reports
+st.markdown("---")
+st.subheader("🗂️ Batch Reports")
+
+saved_scenarios = st.session_state.setdefault("saved_scenarios", [])
+
+col1, col2 = st.columns([3, 1])
+scenario_name = col1.text_input("Scenario name", value=f"Scenario {len(saved_scenarios) + 1}")
+if col2.button("💾 Save current scenario"):
+    saved_scenarios.append({**current_summary, "name": scenario_name})
+    st.success(f"Saved '{scenario_name}'.")
+
+# every report is held in memory until the download is built
+MAX_BATCH_REPORTS = 500
+
+batch_source = st.radio("Report on", ["Saved scenarios", "Every product in the product list"], horizontal=True)
+
+if batch_source == "Saved scenarios":
+    batch = saved_scenarios
+else:
+    import crud_products
+
+    # product costs and list prices from the product list, the other inputs from above;
+    # products without a list price use the selling price above
+    products = crud_products.get_product_costs(MAX_BATCH_REPORTS + 1)
+    if len(products) > MAX_BATCH_REPORTS:
+        st.warning(f"⚠️ The product list has more than {MAX_BATCH_REPORTS:,} products; "
+                   f"only the first {MAX_BATCH_REPORTS:,} by name are included.")
+        products = products[:MAX_BATCH_REPORTS]
+    batch = [
+        reports.roi_summary(p["name"], campaign_cost, p["list_price"] or unit_price, p["production_cost"] or 0.0,
+                            p["packaging_cost"] or 0.0, p["delivery_cost"] or 0.0, marketing_cost,
+                            p["platform_fee_pct"] or 0.0, promo_type, discount_percent,
+                            expected_conversions if show_forecast else None)
+        for p in products
+    ]
+
+st.caption(f"{len(batch)} scenario(s) selected.")
+
+if batch:
+    layout = st.radio("Output", ["One combined PDF (ReportLab)", "One PDF per scenario (ZIP)"], horizontal=True)
+    if st.button("📚 Generate Batch Report"):
+        with st.spinner("Rendering reports..."):
+            if layout.startswith("One combined"):
+                data = reports.roi_report_reportlab(batch)
+                st.download_button("📥 Download Report", data, file_name="campaign_reports.pdf", mime="application/pdf")
+            else:
+                data = reports.render_batch_zip(batch, backend)
+                st.download_button("📥 Download Reports", data, file_name="campaign_reports.zip", mime="application/zip")
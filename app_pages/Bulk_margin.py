@@ -0,0 +1,110 @@
+import streamlit as st
+import pandas as pd
+import margin_engine as engine
+import upload_cache
+import xlsx_ingest
+import profiling
+
+profiling.track_run(__file__)
+st.set_page_config(page_title="Bulk Profit Calculator", layout="wide", initial_sidebar_state="collapsed")
+st.title("📤 Upload Spreadsheet & Calculate Profit per Conversion")
+
+uploaded_file = st.file_uploader("Upload your product file", type=["csv", "xlsx"])
+
+# above this size CSVs are processed in chunks instead of loaded whole
+STREAMING_THRESHOLD_BYTES = 50 * 1024 * 1024
+
+df = None
+header = None
+streaming = False
+selected_sheets = []
+
+if uploaded_file is not None:
+    if uploaded_file.name.endswith(".csv"):
+        streaming = st.checkbox("⚡ Streaming mode (process the file in chunks)",
+                                value=uploaded_file.size > STREAMING_THRESHOLD_BYTES)
+        # in streaming mode only the header is read here
+        df = upload_cache.read_csv(uploaded_file, nrows=0 if streaming else None)
+        header = df.columns.tolist()
+    elif uploaded_file.name.endswith(".xlsx"):
+        # only header rows are read until the columns are mapped
+        sheet_headers = upload_cache.sheet_headers(uploaded_file)
+        sheet_names = list(sheet_headers)
+        if len(sheet_names) > 1 and st.checkbox("📚 Process several sheets together"):
+            selected_sheets = st.multiselect("Select sheets", sheet_names, default=sheet_names)
+        else:
+            selected_sheets = [st.selectbox("Select a sheet", sheet_names)]
+        header = list(dict.fromkeys(col for sheet in selected_sheets for col in sheet_headers[sheet]))
+
+    if header is not None:
+        st.success("✅ File loaded successfully!")
+
+        st.subheader("🧩 Match Columns to Fields")
+
+        columns = [engine.NOT_INCLUDED] + header
+
+        col_product = st.selectbox("Product Name column", columns, index=1 if "Product" in header else 0)
+        col_production = st.selectbox("Production Cost column", columns, index=1 if "Production" in header else 0)
+        col_selling = st.selectbox("Selling Price column", columns, index=1 if "Selling" in header else 0)
+        col_packaging = st.selectbox("Packaging Cost column", columns)
+        col_delivery = st.selectbox("Delivery Cost column", columns)
+        col_marketing = st.selectbox("Marketing Cost column", columns)
+        col_platform = st.selectbox("Platform Fee (%) column", columns)
+
+        mapping = {
+            "product": col_product,
+            "production": col_production,
+            "selling": col_selling,
+            "packaging": col_packaging,
+            "delivery": col_delivery,
+            "marketing": col_marketing,
+            "platform": col_platform,
+        }
+
+        def style_rows(row):
+            if row["Product"] == "Average":
+                return ['background-color: yellow'] * len(row)
+            elif row["Profit Margin (%)"] < 25:
+                return ['background-color: #ffcccc'] * len(row)
+            else:
+                return [''] * len(row)
+
+        if st.button("💡 Calculate Profit per Conversion"):
+            if streaming:
+                uploaded_file.seek(0)
+                with st.spinner("Processing file in chunks..."):
+                    result_file, preview_df, average_row, row_count = engine.stream_margins(uploaded_file, mapping)
+
+                result_df = pd.concat([preview_df, pd.DataFrame([average_row])], ignore_index=True)
+                styled_df = result_df.style.apply(style_rows, axis=1)
+
+                st.subheader("📊 Results (with Styling)")
+                st.caption(f"Processed {row_count:,} rows. Showing the first {len(preview_df):,} and the average over all rows.")
+                st.dataframe(styled_df, use_container_width=True)
+
+                st.download_button("📥 Download Results as CSV", result_file, file_name="profit_results.csv", mime="text/csv")
+                result_file.close()
+            else:
+                per_sheet = len(selected_sheets) > 1
+                if selected_sheets:
+                    with st.spinner("Reading workbook..."):
+                        frames = upload_cache.read_sheets(uploaded_file, selected_sheets, engine.mapped_columns(mapping))
+                    df = xlsx_ingest.combine(frames) if per_sheet else frames[selected_sheets[0]]
+
+                result_df = engine.compute_margins(df, mapping)
+                if per_sheet:
+                    result_df.insert(0, "Sheet", df["Sheet"])
+                    sheet_averages = result_df.groupby("Sheet", sort=False)[engine.AVERAGE_COLUMNS].mean()
+                result_df = pd.concat([result_df, pd.DataFrame([engine.average_row(result_df)])], ignore_index=True)
+
+                styled_df = result_df.style.apply(style_rows, axis=1)
+
+                st.subheader("📊 Results (with Styling)")
+                st.dataframe(styled_df, use_container_width=True)
+
+                if per_sheet:
+                    st.subheader("📚 Averages per Sheet")
+                    st.dataframe(sheet_averages, use_container_width=True)
+
+                csv_download = result_df.to_csv(index=False).encode("utf-8")
+                st.download_button("📥 Download Results as CSV", csv_download, file_name="profit_results.csv", mime="text/csv")
@@ -1,5 +1,8 @@
 import streamlit as st
+import pricing
+import profiling
 
+profiling.track_run(__file__)
 st.set_page_config(page_title="Discount and Pricing", layout="wide", initial_sidebar_state="collapsed")
 
 st.title("📦 Discount & Pricing Strategy Assistant")
@@ -29,9 +32,8 @@ if goal == "📊 Profit per Conversion":
     selling_price = st.number_input("Selling price (BGN)", min_value=0.01, value=20.0, step=0.5)
     marketing_cost = st.number_input("Marketing cost per conversion (BGN)", min_value=0.0, value=5.0, step=0.5)
 
-    total_cost = product_cost + packaging_cost + delivery_cost + marketing_cost + (platform_fee_percent / 100 * selling_price)
-    profit = selling_price - total_cost
-    profit_margin = (profit / selling_price * 100) if selling_price else 0
+    profit = pricing.net_profit(selling_price, product_cost, packaging_cost, delivery_cost, marketing_cost, platform_fee_percent)
+    profit_margin = pricing.margin_pct(profit, selling_price)
 
     st.subheader("📊 Results")
     st.metric("Net Profit per Conversion", f"{profit:.2f} BGN")
@@ -41,8 +43,8 @@ elif goal == "📈 Maximum Marketing Spend":
     selling_price = st.number_input("Selling price (BGN)", min_value=0.01, value=20.0, step=0.5)
     desired_profit = st.number_input("Desired profit per conversion (BGN)", min_value=0.0, value=5.0, step=0.5)
 
-    fixed_costs = product_cost + packaging_cost + delivery_cost + (platform_fee_percent / 100 * selling_price)
-    max_marketing = selling_price - fixed_costs - desired_profit
+    max_marketing = pricing.max_marketing_spend(selling_price, desired_profit, product_cost, packaging_cost,
+                                                delivery_cost, platform_fee_percent)
 
     st.subheader("🎯 Result")
     if max_marketing >= 0:
@@ -54,8 +56,8 @@ elif goal == "💵 What Should I Sell For?":
     marketing_cost = st.number_input("Marketing cost per conversion (BGN)", min_value=0.0, value=5.0, step=0.5)
     desired_profit = st.number_input("Desired profit per conversion (BGN)", min_value=0.0, value=7.0, step=0.5)
 
-    base_cost = product_cost + packaging_cost + delivery_cost + marketing_cost
-    price_required = (base_cost + desired_profit) / (1 - platform_fee_percent / 100)
+    price_required = pricing.required_price(desired_profit, product_cost, packaging_cost, delivery_cost,
+                                            marketing_cost, platform_fee_percent)
 
     st.subheader("💸 Required Selling Price")
     st.success(f"You need to sell at **{price_required:.2f} BGN** per unit to hit your target profit per conversion.")
@@ -65,10 +67,10 @@ elif goal == "🎁 Impact of Buy 2 Get 1 Free Promo":
     marketing_cost = st.number_input("Marketing cost per conversion (BGN)", min_value=0.0, value=5.0, step=0.5)
 
     # In B2G1 promo: sell 3 units for the price of 2
-    effective_price = 2 * selling_price
-    total_cost = (product_cost * 3) + packaging_cost + delivery_cost + marketing_cost + (platform_fee_percent / 100 * selling_price)
-    promo_profit = effective_price - total_cost
-    promo_margin = (promo_profit / effective_price * 100) if effective_price else 0
+    effective_price, promo_production = pricing.apply_promo(selling_price, product_cost, pricing.PROMO_B2G1)
+    promo_profit = pricing.net_profit(effective_price, promo_production, packaging_cost, delivery_cost,
+                                      marketing_cost, platform_fee_percent)
+    promo_margin = pricing.margin_pct(promo_profit, effective_price)
 
     st.subheader("🎁 Promo Results")
     st.metric("Adjusted Price (per combo)", f"{effective_price:.2f} BGN")
@@ -80,8 +82,7 @@ elif goal == "📅 Monthly Profit Projection":
     marketing_cost = st.number_input("Marketing cost per conversion (BGN)", min_value=0.0, value=5.0, step=0.5)
     monthly_conversions = st.number_input("Estimated monthly conversions", min_value=0, value=5, step=5)
 
-    total_cost = product_cost + packaging_cost + delivery_cost + marketing_cost + (platform_fee_percent / 100 * selling_price)
-    profit = selling_price - total_cost
+    profit = pricing.net_profit(selling_price, product_cost, packaging_cost, delivery_cost, marketing_cost, platform_fee_percent)
     monthly_profit = profit * monthly_conversions
 
     st.subheader("📅 Projected Monthly Profit")
@@ -0,0 +1,248 @@
+import streamlit as st
+from datetime import datetime
+from dateutil.relativedelta import relativedelta
+import sqlite3
+import crud_invoices as crud_inv
+import invoice_import
+import upload_cache
+import profiling
+
+profiling.track_run(__file__)
+st.set_page_config(page_title="🧾 Invoice Tracking", layout="wide", initial_sidebar_state="collapsed")
+st.title("🧾 Monthly Invoice Tracking")
+
+def get_month_options(start="2023-01"):
+    start_date = datetime.strptime(start, "%Y-%m")
+    current = datetime.today()
+    return [
+        (current - relativedelta(months=i)).strftime("%Y-%m")
+        for i in range((current.year - start_date.year) * 12 + current.month - start_date.month + 1)
+    ]
+
+months = get_month_options()
+selected_month = st.selectbox("Select Month", months)
+
+companies = {item["id"]: item["name"] for item in crud_inv.get_counterparties()}
+company_ids = list(companies)
+
+
+invoice_labels = {item["id"]: item["label"] for item in crud_inv.get_invoice_labels(selected_month)}
+
+current_id = st.selectbox("🧾 Select an Invoice to Edit", [None] + list(invoice_labels),
+                          format_func=lambda i: "➕ Add New Invoice" if i is None else invoice_labels[i])
+editing_mode = current_id is not None
+row = crud_inv.get_invoice(current_id) if editing_mode else {}
+
+st.markdown("### ✏️ Invoice Form")
+
+with st.form("invoice_form"):
+    invoice_number = st.text_input("Invoice Number", value=row.get("invoice_number", "") if editing_mode else "")
+    invoice_date = st.date_input("Invoice Date", value=datetime.strptime(row["invoice_date"], "%Y-%m-%d") if editing_mode else datetime.today())
+    received_date = st.date_input("Date Received", value=datetime.strptime(row["received_date"], "%Y-%m-%d") if editing_mode else datetime.today())
+
+    selected_company = st.selectbox("Company", company_ids, format_func=companies.get, index=company_ids.index(row["counterparty_id"]) if editing_mode and row["counterparty_id"] in companies else 0) if companies else None
+    
+    amount = st.number_input("Amount (BGN)", min_value=0.0, step=0.01, value=row.get("amount", 0.0) if editing_mode else 0.0)
+    due_date = st.date_input("Due Date", value=datetime.strptime(row["due_date"], "%Y-%m-%d") if editing_mode else datetime.today())
+    status = st.selectbox("Status", crud_inv.STATUSES, index=crud_inv.STATUSES.index(row["status"]) if editing_mode else 0)
+    paid_date = st.date_input("Date Paid", value=datetime.strptime(row["paid_date"], "%Y-%m-%d") if editing_mode and row["paid_date"] else datetime.today() if status == "Paid" else datetime.today())
+
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        submitted = st.form_submit_button("🔄 Update Invoice" if editing_mode else "💾 Save Invoice")
+    with col2:
+        delete_confirmed = st.checkbox("Confirm Delete")
+        delete_clicked = st.form_submit_button("🗑 Delete")
+
+    if submitted:
+        invoice_month = invoice_date.strftime("%Y-%m")
+        if selected_company is None:
+            st.error("❌ Add a company first.")
+        elif invoice_month != selected_month:
+            st.error("❌ Invoice date must be within the selected month.")
+        elif status == "Paid" and not paid_date:
+            st.error("❌ Paid status requires a payment date.")
+        else:
+            paid_val = paid_date.strftime("%Y-%m-%d") if paid_date else None
+            if editing_mode:
+                crud_inv.update_invoice(
+                    current_id, invoice_number, invoice_date.strftime("%Y-%m-%d"), received_date.strftime("%Y-%m-%d"),
+                    selected_company, amount, due_date.strftime("%Y-%m-%d"), paid_val, status
+                )
+                st.success("✅ Invoice updated successfully.")
+            else:
+                crud_inv.create_invoice(
+                    selected_month, invoice_number, invoice_date.strftime("%Y-%m-%d"),
+                    received_date.strftime("%Y-%m-%d"), selected_company, amount,
+                    due_date.strftime("%Y-%m-%d"), paid_val, status
+                )
+                st.success("✅ Invoice saved successfully.")
+            st.rerun()
+
+    if editing_mode and delete_clicked:
+        if delete_confirmed:
+            crud_inv.delete_invoice(current_id)
+            st.success("🗑 Invoice deleted.")
+            st.rerun()
+        else:
+            st.warning("☑️ Please confirm deletion before proceeding.")
+
+with st.expander("➕ Add a new company"):
+    new_company_name = st.text_input("New company name")
+    if st.button("Add Company"):
+        if new_company_name:
+            crud_inv.add_counterparty(new_company_name)
+            st.success(f"✅ '{new_company_name}' added.")
+            st.rerun()
+        else:
+            st.warning("Please enter a company name.")
+
+with st.expander("📥 Bulk import from CSV / Excel"):
+    import_file = st.file_uploader("Accounting export", type=["csv", "xlsx"], key="invoice_import_file")
+    if import_file is not None:
+        if import_file.name.endswith(".csv"):
+            import_df = upload_cache.read_csv(import_file)
+        else:
+            import_sheet = st.selectbox("Sheet", list(upload_cache.sheet_headers(import_file)))
+            import_df = upload_cache.read_sheets(import_file, [import_sheet])[import_sheet]
+
+        guessed = invoice_import.guess_mapping(import_df.columns.tolist())
+        options = [invoice_import.NOT_MAPPED] + import_df.columns.tolist()
+        map_cols = st.columns(4)
+        import_mapping = {
+            field: map_cols[i % 4].selectbox(invoice_import.LABELS[field], options, index=options.index(guessed[field]),
+                                             key=f"invoice_import_{field}")
+            for i, field in enumerate(invoice_import.FIELDS)
+        }
+        date_format = st.selectbox("Date format", list(invoice_import.DATE_FORMATS))
+        only_month = st.checkbox(f"Only accept invoices dated in {selected_month}", value=True)
+
+        try:
+            valid_df, rejected_df = invoice_import.prepare(
+                import_df, import_mapping, invoice_import.DATE_FORMATS[date_format],
+                selected_month if only_month else None
+            )
+        except ValueError as e:
+            st.warning(str(e))
+        else:
+            st.write(f"✅ {len(valid_df)} invoice(s) ready to import, ❌ {len(rejected_df)} row(s) rejected.")
+            if not rejected_df.empty:
+                st.dataframe(rejected_df.head(200), use_container_width=True)
+            new_companies = sorted(set(valid_df["company"]) - set(companies.values()))
+            if new_companies:
+                st.info(f"New companies will be created: {', '.join(new_companies)}")
+
+            if st.button("📥 Import invoices", disabled=valid_df.empty):
+                bar = st.progress(0.0, text="Importing…")
+                result = crud_inv.import_invoices(valid_df, progress=lambda done: bar.progress(done, text="Importing…"))
+                bar.empty()
+                st.success(f"✅ Imported {result['inserted']} new and updated {result['updated']} existing invoice(s); "
+                           f"{result['companies_created']} new company(ies) added.")
+
+st.markdown("---")
+st.markdown(f"### 📋 Invoices for {selected_month}")
+
+
+STATUS_COLORS = {"Unpaid": "#ff0000", "Paid": "#00ff00", "Partially Paid": "#bdbd00"}
+
+def highlight_status(col):
+    # whole column at once instead of one call per cell
+    return "background-color: " + col.map(STATUS_COLORS).fillna("")
+
+month_invoice_count = len(invoice_labels)
+# keyset cursors of the pages visited so far; the last one is the current page
+cursors = st.session_state.setdefault(f"invoice_cursors_{selected_month}", [None])
+page_df = crud_inv.get_invoice_page(selected_month, cursors[-1])
+# deleting the last invoices of a later page leaves its cursor past the end; step back
+while page_df.empty and len(cursors) > 1:
+    cursors.pop()
+    page_df = crud_inv.get_invoice_page(selected_month, cursors[-1])
+
+if not page_df.empty:
+    styled_df = page_df.style.apply(highlight_status, subset=["status"])
+    st.dataframe(styled_df, use_container_width=True, hide_index=True)
+
+    first_row = (len(cursors) - 1) * crud_inv.PAGE_SIZE + 1
+    col1, col2, col3 = st.columns([1, 4, 1])
+    col2.caption(f"Showing {first_row}–{first_row + len(page_df) - 1} of {month_invoice_count} invoices")
+    if col1.button("◀ Previous", disabled=len(cursors) == 1):
+        cursors.pop()
+        st.rerun()
+    if col3.button("Next ▶", disabled=first_row + len(page_df) > month_invoice_count):
+        last = page_df.iloc[-1]
+        cursors.append((last["invoice_date"], int(last["id"])))
+        st.rerun()
+else:
+    st.info("No invoices found for this month.")
+
+
+st.markdown("### 📤 Export")
+if st.button("Prepare CSV export", disabled=month_invoice_count == 0):
+    csv = crud_inv.get_month_invoices(selected_month).to_csv(index=False).encode("utf-8")
+    st.download_button("📥 Download CSV", csv, file_name=f"invoices_{selected_month}.csv", mime="text/csv")
+
+
+st.markdown("---")
+st.markdown("### 📊 Accounts Payable")
+
+today = datetime.today().strftime("%Y-%m-%d")
+ap_df = crud_inv.get_ap_by_company(today)
+if not ap_df.empty:
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Outstanding", f"{ap_df['outstanding'].sum():,.2f}")
+    col2.metric("Overdue", f"{ap_df['overdue'].sum():,.2f}")
+    col3.metric("Invoices", int(ap_df["invoices"].sum()))
+    st.dataframe(ap_df.drop(columns="counterparty_id").round(2), use_container_width=True, hide_index=True)
+    st.caption("Outstanding and overdue count unpaid and partially paid invoices at their full amount.")
+
+    ap_company = st.selectbox("Monthly breakdown for", ap_df["counterparty_id"].tolist(), format_func=companies.get)
+    st.dataframe(crud_inv.get_ap_by_month(ap_company).round(2), use_container_width=True, hide_index=True)
+else:
+    st.info("No invoices recorded yet.")
+
+
+st.markdown("---")
+st.markdown("### 🛠 Manage Companies")
+
+
+if not companies:
+    st.info("No companies found.")
+    st.stop()
+
+selected_company = st.selectbox("Select a company to edit or delete", company_ids, format_func=companies.get)
+selected_name = companies[selected_company]
+
+tab1, tab2 = st.columns(2)
+
+
+with tab1:
+    st.subheader("✏️ Rename Company")
+    new_name = st.text_input("New name", value=selected_name)
+    if st.button("Rename"):
+        if new_name and new_name != selected_name:
+            try:
+                crud_inv.rename_counterparty(selected_company, new_name)
+                st.success(f"✅ '{selected_name}' renamed to '{new_name}'. Please refresh the page to update list.")
+            except sqlite3.IntegrityError:
+                st.error(f"❌ A company named '{new_name}' already exists.")
+        else:
+            st.warning("Enter a different name to update.")
+
+
+with tab2:
+    st.subheader("🗑 Delete Company")
+    invoice_count = crud_inv.count_counterparty_invoices(selected_company)
+    st.info(f"This company is linked to {invoice_count} invoice(s).")
+
+    with st.form("delete_form", clear_on_submit=True):
+        confirm_delete = st.checkbox("I understand and want to delete this company.")
+        delete_clicked = st.form_submit_button("Delete Company")
+
+        if delete_clicked:
+            if not confirm_delete:
+                st.warning("Please confirm deletion before proceeding.")
+            elif crud_inv.delete_counterparty(selected_company):
+                st.success(f"🗑 '{selected_name}' deleted from company list.")
+            else:
+                st.error(f"❌ '{selected_name}' still has {invoice_count} invoice(s); reassign or delete them first.")
+
@@ -0,0 +1,176 @@
+import streamlit as st
+from datetime import datetime
+import pandas as pd
+import crud_marketing as crud_mkt
+import crud_activities as crud_act
+import crud_products
+from dateutil.relativedelta import relativedelta
+import profiling
+
+profiling.track_run(__file__)
+st.set_page_config(page_title="Marketing Activities", layout="wide", initial_sidebar_state="collapsed")
+st.title("📢 Marketing Activities by Month & Pharmacy")
+
+templates = crud_act.get_all_activity_templates()
+
+
+def get_month_options(start="2023-01"):
+    start_date = datetime.strptime(start, "%Y-%m")
+    current = datetime.today()
+    return [
+        (current - relativedelta(months=i)).strftime("%Y-%m")
+        for i in range((current.year - start_date.year) * 12 + current.month - start_date.month + 1)
+    ]
+
+months = get_month_options()
+
+
+current_month = datetime.now().strftime("%Y-%m")
+selected_month = st.selectbox("📅 Select Month (YYYY-MM):", months)
+
+pharmacies = crud_mkt.get_all_pharmacies()
+pharmacy_map = {p["name"]: p["id"] for p in pharmacies}
+selected_pharmacy_name = st.selectbox("🏪 Select Pharmacy:", list(pharmacy_map.keys()))
+selected_pharmacy_id = pharmacy_map[selected_pharmacy_name]
+
+st.divider()
+st.subheader("📋 Assign Activities")
+activity_names = [a["name"] for a in templates]
+# one query for the month's assignments and their attached products
+assignments = crud_act.get_month_assignments(selected_pharmacy_id, selected_month)
+assigned_ids = [a["activity_id"] for a in assignments]
+selected_activities = st.multiselect("Select activities for this month & pharmacy:",
+                                     activity_names,
+                                     default=[a["name"] for a in templates if a["id"] in assigned_ids])
+
+if st.button("💾 Save Assigned Activities"):
+    selected_ids = [a["id"] for a in templates if a["name"] in selected_activities]
+    crud_act.assign_activities_to_pharmacy(selected_pharmacy_id, selected_month, selected_ids)
+    st.success("Activities saved.")
+    st.rerun()
+
+st.divider()
+st.subheader("📦 Attach Products to Assigned Activities")
+product_map = {p["id"]: p["name"] for p in crud_products.get_all_products()}
+
+for assignment in assignments:
+    assignment_id, activity_name = assignment["id"], assignment["name"]
+    st.markdown(f"**🧩 {activity_name}**")
+    selected_names = [product_map[pid] for pid in assignment["product_ids"] if pid in product_map]
+
+    selected = st.multiselect(f"Attach products to '{activity_name}'", options=list(product_map.values()),
+                              default=selected_names, key=f"p_{assignment_id}")
+
+    if st.button(f"💾 Save Products for {activity_name}", key=f"s_{assignment_id}"):
+        crud_act.set_attached_products(assignment_id, [pid for pid, name in product_map.items() if name in selected])
+        st.success("Products saved.")
+        st.rerun()
+
+st.divider()
+st.subheader("📊 Activity Overview")
+
+with st.expander("🔍 Filters", expanded=False):
+    months = crud_act.get_assignment_months()
+    pharmacy_names = {p["id"]: p["name"] for p in pharmacies}
+    activity_names = {a["id"]: a["name"] for a in templates}
+
+    f_month = st.selectbox("Month", months)
+    f_pharmacy = st.selectbox("Pharmacy", [None] + list(pharmacy_names),
+                              format_func=lambda i: "All" if i is None else pharmacy_names[i])
+    f_activity = st.selectbox("Activity", [None] + list(activity_names),
+                              format_func=lambda i: "All" if i is None else activity_names[i])
+    f_product = st.selectbox("Product", [None] + list(product_map),
+                             format_func=lambda i: "All" if i is None else product_map[i])
+
+overview = crud_act.get_activity_overview(f_month, f_pharmacy, f_activity, f_product) if f_month else []
+
+if overview:
+    df = pd.DataFrame(overview)
+    df["products"] = [", ".join(product_map[pid] for pid in ids if pid in product_map) for ids in df["product_ids"]]
+    st.dataframe(df.drop(columns="product_ids"), use_container_width=True)
+
+    with st.expander("⚙️ Manage Assigned Activities", expanded=False):
+        # one editor at a time: a product multiselect per overview row does not scale
+        rows = {row["id"]: row for row in overview}
+        aid = st.selectbox("Assignment", list(rows),
+                           format_func=lambda i: f"{rows[i]['activity']} ({rows[i]['pharmacy']})")
+        row = rows[aid]
+        existing = [product_map[pid] for pid in row["product_ids"] if pid in product_map]
+        selected = st.multiselect(
+            f"Edit attached products for {row['activity']} ({row['pharmacy']})",
+            options=list(product_map.values()),
+            default=existing, key=f"edit_{aid}")
+        col1, col2 = st.columns(2)
+        if col1.button("💾 Save", key=f"u_{aid}"):
+            crud_act.set_attached_products(aid, [pid for pid, name in product_map.items() if name in selected])
+            st.success("Updated.")
+            st.rerun()
+        if col2.button("🗑️ Delete", key=f"d_{aid}"):
+            crud_act.delete_assigned_activity(aid)
+            st.warning("Deleted.")
+            st.rerun()
+else:
+    st.info("No data found.")
+    
+#pharmacy management
+st.divider()
+with st.expander("🏪 Manage Pharmacies", expanded=False):
+    if pharmacies:
+        pharmacy_names = [p["name"] for p in pharmacies]
+        selected = st.selectbox("Select pharmacy to edit or delete", pharmacy_names)
+        selected_id = next(p["id"] for p in pharmacies if p["name"] == selected)
+
+        col1, col2, col3 = st.columns([3, 1, 1])
+        with col1:
+            new_name = st.text_input("Rename to:", value=selected, key="rename_input")
+        with col2:
+            if st.button("💾 Save"):
+                if new_name.strip() and new_name.strip() != selected:
+                    crud_mkt.rename_pharmacy(selected_id, new_name.strip())
+                    st.success("Pharmacy renamed.")
+                    st.rerun()
+        with col3:
+            if st.button("🗑️ Delete"):
+                confirm = st.text_input("Type DELETE to confirm", key="confirm_delete")
+                if confirm == "DELETE":
+                    crud_mkt.delete_pharmacy(selected_id)
+                    st.warning("Pharmacy deleted.")
+                    st.rerun()
+
+    st.markdown("### ➕ Add New Pharmacy")
+    with st.form("add_pharmacy_form"):
+        new_ph_name = st.text_input("New Pharmacy Name:")
+        add_submit = st.form_submit_button("💾 Add Pharmacy")
+        if add_submit:
+            if new_ph_name.strip():
+                crud_mkt.create_pharmacy(new_ph_name.strip())
+                st.success("Pharmacy added.")
+                st.rerun()
+
+st.divider()
+with st.expander("⚙️ Manage Activity Templates", expanded=False):
+    template_map = {a["name"]: a["id"] for a in templates}
+
+    with st.form("add_template"):
+        name = st.text_input("Activity Name")
+        notes = st.text_area("Notes")
+        if st.form_submit_button("➕ Add Activity") and name.strip():
+            crud_act.create_activity_template(name.strip(), notes.strip())
+            st.success("Activity added.")
+            st.rerun()
+
+    if templates:
+        selected_template = st.selectbox("Edit Activity", list(template_map.keys()))
+        activity = next(a for a in templates if a["name"] == selected_template)
+        new_name = st.text_input("Rename", value=activity["name"])
+        new_notes = st.text_area("Edit Notes", value=activity["notes"])
+        col1, col2 = st.columns([1, 1])
+        if col1.button("💾 Save Changes"):
+            crud_act.update_activity_template(activity["id"], new_name, new_notes)
+            st.success("Updated.")
+            st.rerun()
+        if col2.button("🗑️ Delete Activity"):
+            if st.text_input("Type DELETE to confirm") == "DELETE":
+                crud_act.delete_activity_template(activity["id"])
+                st.warning("Deleted.")
+                st.rerun()
\ No newline at end of file
@@ -1,5 +1,7 @@
 import streamlit as st
+import profiling
 
+profiling.track_run(__file__)
 st.set_page_config(page_title="🧾 Recommended Retail Price", layout="wide", initial_sidebar_state="collapsed")
 
 st.title("🧾 Final Retail Price (Based on Fixed Markups)")
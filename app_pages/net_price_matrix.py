@@ -0,0 +1,60 @@
+import streamlit as st
+import crud_products
+import price_matrix
+import profiling
+
+profiling.track_run(__file__)
+st.set_page_config(page_title="Net Price Matrix", layout="wide", initial_sidebar_state="collapsed")
+st.title("🧮 Catalog Net Price Matrix")
+st.caption("Net price, margin and max marketing budget of every product under every pharmacy's terms for a month. "
+           "Net price is the list price after the sell-in discount; the sell-out fee and platform fee are charged on it.")
+
+months = price_matrix.get_months()
+if not months:
+    st.info("No pharmacy terms saved yet.")
+    st.stop()
+
+
+#filters
+col1, col2, col3 = st.columns(3)
+month = col1.selectbox("Month", months)
+division = col2.selectbox("Division", [None] + crud_products.get_divisions(),
+                          format_func=lambda d: "All" if d is None else d)
+roas = col3.number_input("Target ROAS", min_value=0.0, value=2.0, step=0.5,
+                         help="Max marketing budget per unit = margin / (ROAS + 1)")
+
+catalog = price_matrix.load_catalog()
+terms = price_matrix.load_terms(month)
+if division is not None:
+    catalog = price_matrix.subset(catalog, catalog["division"] == division)
+if not len(catalog["name"]) or not len(terms["pharmacy"]):
+    st.info("No products with a list price or no pharmacy terms for this selection.")
+    st.stop()
+
+labels = {"net_price": "Net Price (BGN)", "margin": "Margin (BGN)", "margin_pct": "Margin (%)",
+          "max_budget": "Max Marketing Budget (BGN)"}
+views = {"cell": "Product × pharmacy", "product": "Products (average over pharmacies)",
+         "pharmacy": "Pharmacies (average over products)"}
+col1, col2, col3, col4 = st.columns(4)
+view = col1.selectbox("Rank", price_matrix.VIEWS, format_func=views.get)
+metric = col2.selectbox("Sort by", price_matrix.METRICS, index=1, format_func=labels.get)
+order = col3.radio("Order", ["Highest", "Lowest"], horizontal=True)
+n = col4.number_input("Top N", min_value=1, max_value=100_000, value=100, step=100)
+
+st.caption(f"{len(catalog['name']):,} products × {len(terms['pharmacy']):,} pharmacies = "
+           f"{len(catalog['name']) * len(terms['pharmacy']):,} prices. Products without a list price are not included.")
+
+
+#matrix
+ranked = price_matrix.rank(catalog, terms, metric, view, int(n), order == "Lowest", roas)
+st.dataframe(ranked.round(2), use_container_width=True, hide_index=True)
+
+name = f"net_prices_{month}_{view}"
+col1, col2 = st.columns(2)
+col1.download_button("📥 Download CSV", ranked.to_csv(index=False).encode("utf-8"),
+                     file_name=f"{name}.csv", mime="text/csv")
+if col2.button("📥 Generate XLSX"):
+    with st.spinner("Writing workbook..."):
+        data = price_matrix.to_xlsx(ranked)
+    col2.download_button("📥 Download XLSX", data, file_name=f"{name}.xlsx",
+                         mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
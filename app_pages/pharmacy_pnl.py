@@ -0,0 +1,59 @@
+import streamlit as st
+import crud_marketing as crud_mkt
+import crud_pnl
+import crud_products
+import profiling
+
+profiling.track_run(__file__)
+st.set_page_config(page_title="Pharmacy P&L", layout="wide", initial_sidebar_state="collapsed")
+st.title("💹 Pharmacy P&L by Month & Product")
+st.caption("Per-unit net price, costs, fees and priority payouts of every product a pharmacy carries in a month. "
+           "Fixed fees and marketing spend are split evenly over the pharmacy's products for that month.")
+
+# picks up the pharmacy-months changed since the last visit
+updated = crud_pnl.refresh()
+if updated:
+    st.toast(f"P&L updated for {updated} pharmacy-month(s).")
+
+months = crud_pnl.get_months()
+if not months:
+    st.info("Nothing to show yet: add priority products or attach products to assigned activities.")
+    st.stop()
+
+
+#filters
+labels = {"month": "Month", "pharmacy_name": "Pharmacy", "division": "Division", "product_name": "Product"}
+col1, col2, col3 = st.columns(3)
+group_by = col1.multiselect("Group by", crud_pnl.SLICE_KEYS, default=["pharmacy_name"], format_func=labels.get)
+month_from = col2.selectbox("From month", [None] + months, index=1, format_func=lambda m: "Any" if m is None else m)
+month_to = col3.selectbox("To month", [None] + months, index=1, format_func=lambda m: "Any" if m is None else m)
+
+col1, col2, col3 = st.columns(3)
+pharmacy = col1.selectbox("Pharmacy", [None] + [p["name"] for p in crud_mkt.get_all_pharmacies()],
+                          format_func=lambda p: "All" if p is None else p)
+division = col2.selectbox("Division", [None] + crud_products.get_divisions(),
+                          format_func=lambda d: "All" if d is None else d)
+# the full catalogue is too long for a selectbox; narrow by pharmacy first
+products = {p["id"]: p["name"] for p in crud_pnl.get_products(pharmacy)} if pharmacy else {}
+product_id = col3.selectbox("Product", [None] + list(products), disabled=not pharmacy,
+                            format_func=lambda i: "All" if i is None else products[i],
+                            help="Pick a pharmacy to filter by product.")
+
+
+#slice
+if group_by:
+    pnl = crud_pnl.get_slice(group_by, month_from, month_to, pharmacy, division, product_id)
+    if pnl.empty:
+        st.info("No P&L rows match these filters.")
+    else:
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Pharmacy-product-months", f"{int(pnl['cells'].sum()):,}")
+        col2.metric("Avg Unit Margin (BGN)", f"{(pnl['unit_margin'] * pnl['cells']).sum() / pnl['cells'].sum():.2f}")
+        col3.metric("Fixed Costs (BGN)", f"{pnl['fixed_costs'].sum():,.2f}")
+        col4.metric("Loss-Making", f"{int(pnl['loss_making'].sum()):,}")
+
+        st.dataframe(pnl.rename(columns=labels).round(2), use_container_width=True, hide_index=True)
+        st.download_button("📥 Download CSV", pnl.to_csv(index=False).encode("utf-8"),
+                           file_name="pharmacy_pnl.csv", mime="text/csv")
+else:
+    st.info("Pick at least one column to group by.")
@@ -0,0 +1,135 @@
+import streamlit as st
+import pandas as pd
+from datetime import datetime
+from dateutil.relativedelta import relativedelta
+from st_aggrid import AgGrid, GridOptionsBuilder, GridUpdateMode
+import crud_marketing as crud_mkt
+import crud_terms
+import profiling
+
+
+profiling.track_run(__file__)
+st.set_page_config(page_title="Pharmacy Terms", layout="wide", initial_sidebar_state="collapsed")
+st.title("📋 Monthly Pharmacy Terms")
+
+pharmacy_list = [p["name"] for p in crud_mkt.get_all_pharmacies()]
+
+
+def generate_past_months(start="2023-01"):
+    start_date = datetime.strptime(start, "%Y-%m")
+    current_date = datetime.today()
+    months = []
+    while current_date >= start_date:
+        months.append(current_date.strftime("%Y-%m"))
+        current_date -= relativedelta(months=1)
+    return months
+
+
+month_options = generate_past_months()
+
+
+st.subheader("Enter Terms for This Month")
+
+pharmacy = st.selectbox("Pharmacy", pharmacy_list)
+month = st.selectbox("Month", month_options, index=0)
+
+existing = crud_terms.get_terms(pharmacy, month) or {}
+
+sell_in_discount = st.number_input("Sell-In Discount (%)", min_value=0.0, step=0.1, value=existing.get("sell_in_discount_pct") or 0.0)
+sell_out_pct = st.number_input("Sell-Out Incentive (%)", min_value=0.0, step=0.1, value=existing.get("sell_out_fee_pct") or 0.0)
+sell_out_bgn = st.number_input("Sell-Out Incentive (BGN)", min_value=0.0, step=0.01, value=existing.get("sell_out_fee_bgn") or 0.0)
+marketing_spend = st.number_input("Monthly Marketing Spend (BGN)", min_value=0.0, step=1.0, value=existing.get("marketing_spend_bgn") or 0.0)
+notes = st.text_area("Notes", value=existing.get("notes") or "")
+
+if st.button("💾 Save Terms"):
+    crud_terms.save_terms(pharmacy, month, sell_in_discount, sell_out_pct, sell_out_bgn, marketing_spend, notes)
+    st.success("✅ Terms updated successfully." if existing else "✅ Terms saved successfully.")
+
+
+st.markdown("---")
+st.subheader("📅 View All Saved Terms")
+
+col1, col2, col3 = st.columns(3)
+f_pharmacy = col1.selectbox("Filter by pharmacy", [None] + pharmacy_list, format_func=lambda p: "All" if p is None else p)
+f_from = col2.selectbox("From month", [None] + month_options[::-1], format_func=lambda m: "Any" if m is None else m)
+f_to = col3.selectbox("To month", [None] + month_options, format_func=lambda m: "Any" if m is None else m)
+filters = (f_pharmacy, f_from, f_to)
+
+total = crud_terms.count_terms(*filters)
+# keyset cursors of the pages visited so far; the last one is the current page
+cursors = st.session_state.setdefault(f"terms_cursors_{filters}", [None])
+page_df = crud_terms.get_terms_page(*filters, after=cursors[-1])
+# deleting every row of the last page leaves its cursor past the end; step back
+while page_df.empty and len(cursors) > 1:
+    cursors.pop()
+    page_df = crud_terms.get_terms_page(*filters, after=cursors[-1])
+
+NUMERIC_FIELDS = [f for f in crud_terms.TERM_FIELDS if f != "notes"]
+
+
+def changed_rows(original: pd.DataFrame, edited: pd.DataFrame):
+    """Rows of the page whose term values were edited in the grid, and the labels of rows
+    with a cleared or non-numeric term value, which are left out rather than saved as 0."""
+    edited = edited.assign(id=edited["id"].astype(int)).set_index("id")
+    original = original.set_index("id").loc[edited.index]
+    parsed = edited[NUMERIC_FIELDS].apply(pd.to_numeric, errors="coerce")
+    # a value stored as NULL comes back from the grid empty; only a newly emptied cell is invalid
+    invalid = (parsed.isna() & original[NUMERIC_FIELDS].notna()).any(axis=1)
+    values = parsed.fillna(0.0)
+    edited_notes = edited["notes"].fillna("").astype(str)
+    diff = (values != original[NUMERIC_FIELDS].fillna(0.0)).any(axis=1) | (edited_notes != original["notes"].fillna(""))
+    diff &= ~invalid
+    rows = values[diff].assign(notes=edited_notes[diff])
+    labels = (original["pharmacy_name"] + " " + original["month"])[invalid].tolist()
+    return rows.reset_index().to_dict("records"), labels
+
+
+# shown on the run after a save, which reruns the page
+if "terms_saved" in st.session_state:
+    st.success(st.session_state.pop("terms_saved"))
+
+if not page_df.empty:
+    builder = GridOptionsBuilder.from_dataframe(page_df)
+    builder.configure_default_column(editable=True, resizable=True)
+    builder.configure_column("id", hide=True)
+    builder.configure_column("pharmacy_name", header_name="Pharmacy", editable=False, checkboxSelection=True)
+    builder.configure_column("month", header_name="Month", editable=False)
+    builder.configure_selection("multiple", use_checkbox=True)
+    grid = AgGrid(
+        page_df,
+        gridOptions=builder.build(),
+        update_mode=GridUpdateMode.VALUE_CHANGED | GridUpdateMode.SELECTION_CHANGED,
+        height=420,
+        key=f"terms_grid_{filters}_{len(cursors)}_{st.session_state.get('terms_saves', 0)}",
+    )
+
+    edited = grid["data"]
+    selected = grid["selected_rows"]
+    updates, invalid = changed_rows(page_df, pd.DataFrame(edited)) if edited is not None and len(edited) else ([], [])
+    deleted_ids = [int(i) for i in pd.DataFrame(selected)["id"]] if selected is not None and len(selected) else []
+    updates = [row for row in updates if row["id"] not in deleted_ids]
+    if invalid:
+        st.error("Enter a number for every term before applying changes. Not a number in: " + ", ".join(invalid))
+
+    first_row = (len(cursors) - 1) * crud_terms.PAGE_SIZE + 1
+    col1, col2, col3, col4 = st.columns([1, 3, 2, 1])
+    col2.caption(f"Showing {first_row}–{first_row + len(page_df) - 1} of {total} rows · "
+                 f"{len(updates)} edited, {len(deleted_ids)} selected for deletion")
+    if col3.button("💾 Apply changes", disabled=bool(invalid) or (not updates and not deleted_ids)):
+        crud_terms.apply_term_changes(updates, deleted_ids)
+        # new grid key so the grid reloads from the database
+        st.session_state["terms_saves"] = st.session_state.get("terms_saves", 0) + 1
+        st.session_state["terms_saved"] = f"✅ Saved {len(updates)} row(s), deleted {len(deleted_ids)} row(s)."
+        st.rerun()
+    if col1.button("◀ Previous", disabled=len(cursors) == 1):
+        cursors.pop()
+        st.rerun()
+    if col4.button("Next ▶", disabled=first_row + len(page_df) > total):
+        last = page_df.iloc[-1]
+        cursors.append((last["month"], last["pharmacy_name"]))
+        st.rerun()
+else:
+    st.info("No saved terms match the filters.")
+
+
+st.markdown("💡 **Tip:** If you want to add, edit, or delete pharmacies, go to the *Marketing Activities* page.")
@@ -0,0 +1,125 @@
+import streamlit as st
+import pandas as pd
+from datetime import datetime
+from dateutil.relativedelta import relativedelta
+import crud_marketing as crud_mkt
+import crud_priority
+import crud_products
+import profiling
+
+profiling.track_run(__file__)
+st.set_page_config(page_title="Priority Products", layout="wide", initial_sidebar_state="collapsed")
+st.title("⭐ Mark Priority Products per Pharmacy & Month")
+
+
+def generate_past_months(start="2023-01"):
+    start_date = datetime.strptime(start, "%Y-%m")
+    current_date = datetime.today()
+    months = []
+    while current_date >= start_date:
+        months.append(current_date.strftime("%Y-%m"))
+        current_date -= relativedelta(months=1)
+    return months
+
+month_options = generate_past_months()
+
+month = st.selectbox("Month", month_options, index=0)
+selected_month = month
+
+
+product_list = [p["name"] for p in crud_products.get_all_products()]
+
+
+pharmacy_list = [p["name"] for p in crud_mkt.get_all_pharmacies()]
+
+month_df = crud_priority.get_month_priorities(selected_month)
+existing = month_df.set_index(["pharmacy_name", "product_name"])[crud_priority.PAYOUT_FIELDS]
+
+
+#inputs
+tab_single, tab_batch = st.tabs(["Single entry", "Batch entry"])
+
+with tab_single:
+    pharmacy = st.selectbox("Pharmacy", pharmacy_list)
+    product = st.selectbox("Product Name", product_list)
+    current = existing.loc[(pharmacy, product)] if (pharmacy, product) in existing.index else None
+
+    priority_total = st.number_input("Priority Total per Unit (BGN)", min_value=0.0, step=0.1,
+                                     value=float(current["priority_total"]) if current is not None else 0.0)
+    pharmacist_share = st.number_input("Pharmacist Share (BGN)", min_value=0.0, step=0.1,
+                                       value=float(current["pharmacist_share"]) if current is not None else 0.0)
+    pharmacy_share = st.number_input("Pharmacy Share (BGN)", min_value=0.0, step=0.1,
+                                     value=float(current["pharmacy_share"]) if current is not None else 0.0)
+
+    if st.button("💾 Save Priority Product"):
+        if product:
+            crud_priority.save_priority(pharmacy, product, month, priority_total, pharmacist_share, pharmacy_share)
+            st.success("✅ Priority product updated." if current is not None else "✅ Priority product saved.")
+            st.rerun()
+        else:
+            st.error("❌ No product selected.")
+
+with tab_batch:
+    batch_pharmacies = st.multiselect("Pharmacies", pharmacy_list)
+    batch_products = st.multiselect("Products", product_list)
+
+    if batch_pharmacies and batch_products:
+        grid = pd.MultiIndex.from_product([batch_pharmacies, batch_products], names=["pharmacy_name", "product_name"])
+        batch_df = existing.reindex(grid).fillna(0.0).reset_index()
+        edited = st.data_editor(
+            batch_df,
+            disabled=["pharmacy_name", "product_name"],
+            hide_index=True,
+            use_container_width=True,
+            key=f"priority_batch_{selected_month}",
+        )
+        # entries already saved are always written back; new ones only when something was filled in
+        known = pd.Series(grid.isin(existing.index), index=edited.index)
+        to_save = edited[known | (edited[crud_priority.PAYOUT_FIELDS] > 0).any(axis=1)]
+        if st.button(f"💾 Save {len(to_save)} entries for {selected_month}", disabled=to_save.empty):
+            crud_priority.save_priorities(selected_month, to_save.to_dict("records"))
+            st.success(f"✅ Saved {len(to_save)} priority entries.")
+            st.rerun()
+    else:
+        st.info("Pick pharmacies and products to fill in payouts for all combinations at once.")
+
+
+st.markdown("---")
+st.subheader("📜 Priority Product History")
+
+if not month_df.empty:
+    history = month_df.assign(delete=False)
+    edited_history = st.data_editor(
+        history,
+        column_config={"id": None, "delete": st.column_config.CheckboxColumn("🗑️")},
+        disabled=[col for col in history.columns if col != "delete"],
+        hide_index=True,
+        use_container_width=True,
+        key=f"priority_history_{selected_month}",
+    )
+    delete_ids = edited_history.loc[edited_history["delete"], "id"].astype(int).tolist()
+    if st.button(f"🗑️ Delete {len(delete_ids)} selected", disabled=not delete_ids):
+        crud_priority.delete_priorities(delete_ids)
+        st.warning(f"❌ Deleted {len(delete_ids)} entries for {selected_month}")
+        st.rerun()
+else:
+    st.info("No priority products saved yet.")
+
+
+st.markdown("---")
+st.subheader("📊 Payout Rollups")
+
+labels = {"month": "Month", "pharmacy_name": "Pharmacy", "product_name": "Product"}
+col1, col2, col3 = st.columns(3)
+group_by = col1.multiselect("Group by", crud_priority.ROLLUP_KEYS, default=["month", "pharmacy_name"], format_func=labels.get)
+rollup_from = col2.selectbox("From month", [None] + month_options[::-1], format_func=lambda m: "Any" if m is None else m)
+rollup_to = col3.selectbox("To month", [None] + month_options, format_func=lambda m: "Any" if m is None else m)
+
+if group_by:
+    rollup = crud_priority.get_rollup(group_by, rollup_from, rollup_to)
+    st.dataframe(rollup.rename(columns=labels).round(2), use_container_width=True, hide_index=True)
+    if not rollup.empty:
+        st.download_button("📥 Download CSV", rollup.to_csv(index=False).encode("utf-8"),
+                           file_name="priority_payouts.csv", mime="text/csv")
+else:
+    st.info("Pick at least one column to group by.")
@@ -1,12 +1,14 @@
 import streamlit as st
-import sqlite3
 import pandas as pd
+import db
+import profiling
 
+profiling.track_run(__file__)
 st.set_page_config(page_title="Product Manager", layout="wide", initial_sidebar_state="collapsed")
 st.title("📦 Product List Manager")
 
 
-conn = sqlite3.connect("pharmacy.db")
+conn = db.get_connection()
 cursor = conn.cursor()
 
 
@@ -19,6 +21,7 @@ with st.form("product_form"):
     packaging_cost = st.number_input("Packaging Cost (BGN)", min_value=0.0, step=0.01)
     delivery_cost = st.number_input("Delivery Cost (BGN)", min_value=0.0, step=0.01)
     platform_fee_pct = st.number_input("Platform Fee (%)", min_value=0.0, step=0.1)
+    list_price = st.number_input("List Price (BGN)", min_value=0.0, step=0.01)
     notes = st.text_area("Notes")
 
     submitted = st.form_submit_button("💾 Save Product")
@@ -28,15 +31,15 @@ with st.form("product_form"):
         if existing:
             cursor.execute("""
                 UPDATE products
-                SET division = ?, production_cost = ?, packaging_cost = ?, delivery_cost = ?, platform_fee_pct = ?, notes = ?
+                SET division = ?, production_cost = ?, packaging_cost = ?, delivery_cost = ?, platform_fee_pct = ?, list_price = ?, notes = ?
                 WHERE name = ?
-            """, (division, production_cost, packaging_cost, delivery_cost, platform_fee_pct, notes, name))
+            """, (division, production_cost, packaging_cost, delivery_cost, platform_fee_pct, list_price, notes, name))
             st.success("✅ Product updated successfully.")
         else:
             cursor.execute("""
-                INSERT INTO products (name, division, production_cost, packaging_cost, delivery_cost, platform_fee_pct, notes)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (name, division, production_cost, packaging_cost, delivery_cost, platform_fee_pct, notes))
+                INSERT INTO products (name, division, production_cost, packaging_cost, delivery_cost, platform_fee_pct, list_price, notes)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, (name, division, production_cost, packaging_cost, delivery_cost, platform_fee_pct, list_price, notes))
             st.success("✅ New product added.")
         conn.commit()
 
@@ -49,7 +52,7 @@ filter_division = st.selectbox("Filter by Division", ["All", "LecoVita", "Pharma
 if filter_division != "All":
     query = """
         SELECT name, division, production_cost, packaging_cost,
-               delivery_cost, platform_fee_pct, notes
+               delivery_cost, platform_fee_pct, list_price, notes
         FROM products
         WHERE division = ?
         ORDER BY name
@@ -58,14 +61,14 @@ if filter_division != "All":
 else:
     query = """
         SELECT name, division, production_cost, packaging_cost,
-               delivery_cost, platform_fee_pct, notes
+               delivery_cost, platform_fee_pct, list_price, notes
         FROM products
         ORDER BY name
     """
     products = cursor.execute(query).fetchall()
 
 df = pd.DataFrame(products, columns=[
-    "Product", "Division", "Production Cost", "Packaging", "Delivery", "Platform Fee (%)", "Notes"
+    "Product", "Division", "Production Cost", "Packaging", "Delivery", "Platform Fee (%)", "List Price", "Notes"
 ])
 
 st.dataframe(df, use_container_width=True)
@@ -79,7 +82,7 @@ selected_product = st.selectbox("Select a product to edit", product_names)
 
 
 cursor.execute("""
-    SELECT name, division, production_cost, packaging_cost, delivery_cost, platform_fee_pct, notes
+    SELECT name, division, production_cost, packaging_cost, delivery_cost, platform_fee_pct, list_price, notes
     FROM products
     WHERE name = ?
 """, (selected_product,))
@@ -93,15 +96,16 @@ if prod:
         new_pack = st.number_input("Packaging Cost (BGN)", min_value=0.0, step=0.01, value=prod[3])
         new_del = st.number_input("Delivery Cost (BGN)", min_value=0.0, step=0.01, value=prod[4])
         new_fee = st.number_input("Platform Fee (%)", min_value=0.0, step=0.1, value=prod[5])
-        new_notes = st.text_area("Notes", value=prod[6])
+        new_price = st.number_input("List Price (BGN)", min_value=0.0, step=0.01, value=prod[6] or 0.0)
+        new_notes = st.text_area("Notes", value=prod[7])
 
         save_changes = st.form_submit_button("💾 Save Changes")
         if save_changes:
             cursor.execute("""
                 UPDATE products
-                SET name = ?, division = ?, production_cost = ?, packaging_cost = ?, delivery_cost = ?, platform_fee_pct = ?, notes = ?
+                SET name = ?, division = ?, production_cost = ?, packaging_cost = ?, delivery_cost = ?, platform_fee_pct = ?, list_price = ?, notes = ?
                 WHERE name = ?
-            """, (new_name, new_div, new_prod, new_pack, new_del, new_fee, new_notes, selected_product))
+            """, (new_name, new_div, new_prod, new_pack, new_del, new_fee, new_price, new_notes, selected_product))
             conn.commit()
             st.success("✅ Product updated.")
             st.rerun()
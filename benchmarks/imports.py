@@ -0,0 +1,100 @@
+"""Cold import time of every page, checked against a budget.
+
+    python -m benchmarks.imports
+    python -m benchmarks.imports --pages Break_even Bulk_margin --repeat 9
+
+The top-level imports of each page are run in a fresh interpreter that has
+already imported streamlit and pandas, as a running server has; what is
+measured is what the first hit on the page pays on top of that. The
+slowest top-level modules (from -X importtime) are listed to show where the
+time goes. The budget file maps a page name or "default" to a limit in
+milliseconds; the run exits 1 when a page is over its limit.
+"""
+import argparse
+import ast
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from benchmarks.pages import REPO, page_files
+
+BUDGET = os.path.join(REPO, "benchmarks", "import_budget.json")
+MARKER = "-- page imports --"
+
+PROBE = f"""
+import sys, time
+import streamlit, pandas
+print({MARKER!r}, file=sys.stderr, flush=True)
+start = time.perf_counter()
+exec(compile(sys.argv[1], "page imports", "exec"))
+print((time.perf_counter() - start) * 1000)
+"""
+
+
+def page_imports(path: str) -> str:
+    """The module-level import statements of a page, as source."""
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    return "\n".join(ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom)))
+
+
+def _slowest(importtime: str, top: int):
+    # "import time: self [us] | cumulative | imported package"; only modules loaded after the marker count
+    lines = importtime.split(MARKER, 1)[-1].splitlines()
+    modules = []
+    for line in lines:
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not name.startswith("  "):  # top-level imports only, not their dependencies
+            modules.append((int(cumulative) / 1000, name.strip()))
+    return sorted(modules, reverse=True)[:top]
+
+
+def measure(path: str, repeat: int):
+    """(median ms, [(ms, module)] of the slowest imports in the last run)"""
+    code = page_imports(path)
+    samples, slowest = [], []
+    for _ in range(repeat):
+        run = subprocess.run([sys.executable, "-X", "importtime", "-c", PROBE, code], cwd=REPO,
+                             capture_output=True, text=True, env={**os.environ, "PYTHONPATH": REPO})
+        if run.returncode != 0:
+            raise RuntimeError(f"importing {os.path.basename(path)} failed:\n{run.stderr[-2000:]}")
+        samples.append(float(run.stdout.split()[-1]))
+        slowest = _slowest(run.stderr, 3)
+    return statistics.median(samples), slowest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", nargs="+", help="page names, default all")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget", default=BUDGET)
+    args = parser.parse_args(argv)
+
+    with open(args.budget) as f:
+        budget = json.load(f)
+    pages = page_files()
+    if args.pages:
+        pages = {name: pages[name] for name in args.pages}
+
+    failures = []
+    print(f"{'page':<45}{'ms':>10}{'budget':>10}  slowest imports")
+    for page, path in pages.items():
+        ms, slowest = measure(path, args.repeat)
+        limit = budget.get(page, budget.get("default"))
+        over = limit is not None and ms > limit
+        print(f"{page:<45}{ms:>10.1f}{limit if limit is not None else '-':>10}  "
+              + ", ".join(f"{name} {module_ms:.0f}" for module_ms, name in slowest) + ("  OVER" if over else ""))
+        if over:
+            failures.append(f"{page} imports in {ms:.1f} ms, budget {limit} ms")
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
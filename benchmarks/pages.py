@@ -0,0 +1,236 @@
+"""Full-rerun timings of every page, driven headlessly through Streamlit's AppTest.
+
+    python -m benchmarks.pages                       # scale 0.1, check benchmarks/page_budget.json
+    python -m benchmarks.pages --scale 1 --repeat 3
+    python -m benchmarks.pages --pages Marketing_Activities pharmacy_terms
+
+Each page is loaded and then put through its usual interactions (select a
+month, switch pharmacy, save a form) against copies of the synthetic
+databases from benchmarks.synthetic. For every step the rerun wall time
+(median of --repeat passes), the number of SQL statements executed and the
+peak Python memory allocated on top of what was live before the rerun are
+recorded. Memory is traced in a separate pass so tracemalloc does not
+inflate the timings.
+
+The budget file maps "page", "page/interaction" or "default" to a latency
+limit in milliseconds; the most specific entry applies. The run exits 1 when
+a step is over its limit or raises.
+"""
+import argparse
+import glob
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET = os.path.join(REPO, "benchmarks", "page_budget.json")
+
+
+def _widget(at, kind: str, label: str):
+    for widget in getattr(at, kind):
+        if widget.label == label:
+            return widget
+    raise LookupError(f"no {kind} {label!r} on the page")
+
+
+def _select_next(at, label: str):
+    box = _widget(at, "selectbox", label)
+    box.select_index((box.index + 1) % len(box.options))
+
+
+def _marketing_save(at):
+    _widget(at, "multiselect", "Select activities for this month & pharmacy:").set_value(
+        _widget(at, "multiselect", "Select activities for this month & pharmacy:").options[:2])
+    _widget(at, "button", "💾 Save Assigned Activities").click()
+
+
+def _terms_save(at):
+    field = _widget(at, "number_input", "Sell-In Discount (%)")
+    field.set_value(field.value + 1)
+    _widget(at, "button", "💾 Save Terms").click()
+
+
+def _priority_save(at):
+    field = _widget(at, "number_input", "Priority Total per Unit (BGN)")
+    field.set_value(field.value + 1)
+    _widget(at, "button", "💾 Save Priority Product").click()
+
+
+def _invoice_save(at):
+    # the form only accepts invoices dated in the selected month
+    day = datetime.strptime(_widget(at, "selectbox", "Select Month").value, "%Y-%m").date()
+    _widget(at, "date_input", "Invoice Date").set_value(day)
+    _widget(at, "text_input", "Invoice Number").input(f"BENCH-{time.time_ns()}")
+    _widget(at, "number_input", "Amount (BGN)").set_value(100.0)
+    _widget(at, "button", "💾 Save Invoice").click()
+
+
+# page -> [(interaction, action before the rerun)]; every page is loaded first
+INTERACTIONS = {
+    "Marketing_Activities": [
+        ("select month", lambda at: _select_next(at, "📅 Select Month (YYYY-MM):")),
+        ("switch pharmacy", lambda at: _select_next(at, "🏪 Select Pharmacy:")),
+        ("save form", _marketing_save),
+    ],
+    "pharmacy_terms": [
+        ("select month", lambda at: _select_next(at, "Month")),
+        ("switch pharmacy", lambda at: _select_next(at, "Pharmacy")),
+        ("save form", _terms_save),
+    ],
+    "priority_products": [
+        ("select month", lambda at: _select_next(at, "Month")),
+        ("switch pharmacy", lambda at: _select_next(at, "Pharmacy")),
+        ("save form", _priority_save),
+    ],
+    "Invoice_Tracking": [
+        ("select month", lambda at: _select_next(at, "Select Month")),
+        ("save form", _invoice_save),
+    ],
+    "pharmacy_pnl": [
+        ("select month", lambda at: _select_next(at, "From month")),
+        ("group by product", lambda at: _widget(at, "multiselect", "Group by").set_value(["pharmacy_name", "product_name"])),
+        ("pick pharmacy", lambda at: _widget(at, "selectbox", "Pharmacy").select_index(1)),
+    ],
+    "net_price_matrix": [
+        ("sort by margin %", lambda at: _widget(at, "selectbox", "Sort by").set_value("margin_pct")),
+        ("rank products", lambda at: _widget(at, "selectbox", "Rank").set_value("product")),
+        ("top 10000", lambda at: _widget(at, "number_input", "Top N").set_value(10_000)),
+        ("export xlsx", lambda at: _widget(at, "button", "📥 Generate XLSX").click()),
+    ],
+    "products": [
+        ("filter division", lambda at: _select_next(at, "Filter by Division")),
+        ("save form", lambda at: _widget(at, "button", "💾 Save Changes").click()),
+    ],
+}
+
+
+def page_files():
+    return {os.path.splitext(os.path.basename(path))[0]: path
+            for path in sorted(glob.glob(os.path.join(REPO, "app_pages", "*.py")))
+            + [os.path.join(REPO, "Home.py"), os.path.join(REPO, "diagnostics.py")]}
+
+
+def _run_page(path: str, steps, timeout: float, trace: bool):
+    """One pass over a page: [(interaction, ms, sql statements, peak bytes, error)]."""
+    from streamlit.testing.v1 import AppTest
+
+    import profiling
+
+    at = AppTest.from_file(path, default_timeout=timeout)
+    results = []
+    for name, action in [("load", None)] + steps:
+        if action is not None:
+            try:
+                action(at)
+            # a missing widget or one the interaction does not fit (too few options, ...)
+            # is recorded as this step's error so the other pages still get measured
+            except Exception as e:
+                results.append((name, None, None, None, f"{type(e).__name__}: {e}"))
+                break
+        profiling.clear()
+        if trace:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        at.run()
+        ms = (time.perf_counter() - start) * 1000
+        peak = tracemalloc.get_traced_memory()[1] - before if trace else None
+        error = at.exception[0].value if at.exception else None
+        results.append((name, ms, len(profiling.queries()), peak, error))
+        if error:
+            break
+    return results
+
+
+def measure(pages, repeat: int, timeout: float) -> dict:
+    """{"page/interaction": {"ms", "sql", "peak_mb", "error"}}"""
+    results = {}
+    for page, path in pages.items():
+        passes = [_run_page(path, INTERACTIONS.get(page, []), timeout, trace=False) for _ in range(repeat)]
+        tracemalloc.start()
+        try:
+            traced = _run_page(path, INTERACTIONS.get(page, []), timeout, trace=True)
+        finally:
+            tracemalloc.stop()
+        for i, (name, _, sql, _, error) in enumerate(passes[-1]):
+            # passes that failed at or before this step have no timing for it
+            timings = [p[i][1] for p in passes if len(p) > i and p[i][1] is not None]
+            results[f"{page}/{name}"] = {
+                "ms": round(statistics.median(timings), 1) if timings and not error else None,
+                "sql": sql,
+                "peak_mb": round(traced[i][3] / 2**20, 1) if len(traced) > i and traced[i][3] is not None else None,
+                "error": error,
+            }
+    return results
+
+
+def limit_for(budget: dict, key: str):
+    return budget.get(key, budget.get(key.split("/")[0], budget.get("default")))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=float, default=0.1)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--pages", nargs="+", help="page names, default all")
+    parser.add_argument("--data-dir", default=os.path.join(REPO, "benchmarks", "data"))
+    parser.add_argument("--budget", default=BUDGET)
+    parser.add_argument("--timeout", type=float, default=120, help="seconds per rerun")
+    parser.add_argument("--output", help="write the results as JSON")
+    args = parser.parse_args(argv)
+
+    from benchmarks import synthetic
+
+    seeded = synthetic.ensure_databases(args.scale, args.data_dir, args.seed)
+    # pages save forms, so they run against copies; db and profiling read these at import
+    workdir = tempfile.mkdtemp(prefix="slpub-pages-")
+    pharmacy_db, invoice_db = (shutil.copy(path, workdir) for path in seeded)
+    os.environ["SLPUB_PHARMACY_DB"] = pharmacy_db
+    os.environ["SLPUB_INVOICE_DB"] = invoice_db
+    os.environ["SLPUB_PROFILE"] = "1"
+    sys.path.insert(0, REPO)
+
+    import streamlit.logger
+    streamlit.logger.set_log_level("error")
+
+    pages = page_files()
+    if args.pages:
+        pages = {name: pages[name] for name in args.pages}
+    try:
+        results = measure(pages, args.repeat, args.timeout)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    with open(args.budget) as f:
+        budget = json.load(f)
+
+    failures = []
+    cell = lambda value, width, fmt="": f"{'-' if value is None else format(value, fmt):>{width}}"
+    print(f"{'page/interaction':<45}{'ms':>10}{'sql':>8}{'peak MB':>10}{'budget':>10}")
+    for key, row in results.items():
+        limit = limit_for(budget, key)
+        over = limit is not None and row["ms"] is not None and row["ms"] > limit
+        print(f"{key:<45}{cell(row['ms'], 10, '.1f')}{cell(row['sql'], 8)}{cell(row['peak_mb'], 10)}"
+              f"{cell(limit, 10)}{'  OVER' if over else ''}")
+        if row["error"]:
+            failures.append(f"{key} failed: {row['error']}")
+        elif over:
+            failures.append(f"{key} took {row['ms']:.1f} ms, budget {limit} ms")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    for failure in failures:
+        print(f"FAIL {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
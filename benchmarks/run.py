@@ -0,0 +1,301 @@
+"""Time the data layer against synthetic databases and compare with a baseline.
+
+    python -m benchmarks.run                        # scale 0.1, compare with benchmarks/baseline.json
+    python -m benchmarks.run --scales 0.1 0.5 1     # scaling curve
+    python -m benchmarks.run --check                # exit 1 on a regression
+    python -m benchmarks.run --save-baseline        # record this run as the new baseline
+
+Every function in crud_marketing and crud_activities is timed, plus the SQL
+the pages issue (through the crud modules, and the inline statements of the
+products page). Writes are timed against a throwaway row
+and undone outside the timed section. Databases are generated once per
+scale under --data-dir and reused; delete them to regenerate.
+
+Timings are medians of --repeat calls in milliseconds. A case regresses
+when it is slower than the baseline by more than --tolerance and by more
+than --floor-ms. The defaults leave room for run-to-run noise on shared
+machines; a lost index or an N+1 loop shows up as a multiple of the baseline.
+Baselines are machine specific, so none is committed: record one with
+--save-baseline on the machine that runs the check; --check fails until
+one exists.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+
+def _median_ms(fn, repeat: int, setup=None, undo=None) -> float:
+    samples = []
+    for _ in range(repeat):
+        arg = setup() if setup else None
+        start = time.perf_counter()
+        result = fn(arg) if setup else fn()
+        samples.append((time.perf_counter() - start) * 1000)
+        if undo:
+            undo(arg if setup else result)
+    return statistics.median(samples)
+
+
+def _cases(months):
+    # imported here: db reads the database paths from the environment at import
+    import crud_activities
+    import crud_invoices
+    import crud_marketing
+    import crud_pnl
+    import crud_priority
+    import crud_products
+    import crud_terms
+    import db
+    import price_matrix
+
+    conn = db.get_connection()
+    month = months[-1]
+    pharmacy_id, pharmacy = conn.execute("SELECT id, name FROM pharmacies ORDER BY id LIMIT 1 OFFSET 1").fetchone()
+    template_id = conn.execute("SELECT MIN(id) FROM activity_templates").fetchone()[0]
+    assignment_id = conn.execute(
+        "SELECT MIN(id) FROM assigned_activities WHERE pharmacy_id = ? AND month = ?", (pharmacy_id, month)
+    ).fetchone()[0]
+    product_ids = crud_activities.get_attached_product_ids(assignment_id)
+    product_id, product = conn.execute("SELECT id, name FROM products ORDER BY id LIMIT 1 OFFSET 7").fetchone()
+    division = conn.execute("SELECT division FROM products WHERE id = ?", (product_id,)).fetchone()[0]
+    activity_id = conn.execute("SELECT MIN(id) FROM marketing_activities").fetchone()[0]
+
+    invoices = db.get_connection(db.INVOICE_DB)
+    counterparty_id = invoices.execute("SELECT MIN(id) FROM counterparties").fetchone()[0]
+    invoice_month = invoices.execute("SELECT MAX(month) FROM invoices").fetchone()[0]
+    labels = crud_invoices.get_invoice_labels(invoice_month)
+    last_page = crud_invoices.get_invoice_page(invoice_month)
+    invoice_after = (last_page["invoice_date"].iloc[-1], int(last_page["id"].iloc[-1]))
+    terms_after = (month, pharmacy)
+    terms = crud_terms.get_terms(pharmacy, month)
+    catalog, month_terms = price_matrix.load_catalog(), price_matrix.load_terms(month)
+
+    def save_terms(discount_change):
+        crud_terms.save_terms(pharmacy, month, terms["sell_in_discount_pct"] + discount_change,
+                              *(terms[field] for field in crud_terms.TERM_FIELDS[1:]))
+
+    def last_id(table):
+        return conn.execute(f"SELECT MAX(id) FROM {table}").fetchone()[0]
+
+    def reset_assignments(_):
+        crud_activities.assign_activities_to_pharmacy(pharmacy_id, month, assigned)
+
+    assigned = crud_activities.get_assigned_activity_ids(pharmacy_id, month)
+    others = [t["id"] for t in crud_activities.get_all_activity_templates() if t["id"] not in assigned][:2]
+
+    def execute(path, sql, params=()):
+        return lambda: db.get_connection(path).execute(sql, params).fetchall()
+
+    # (name, fn, setup, undo); with a setup, fn receives its result
+    return [
+        # crud_marketing
+        ("crud_marketing.get_all_pharmacies", crud_marketing.get_all_pharmacies.__wrapped__, None, None),
+        ("crud_marketing.get_all_pharmacies[cached]", crud_marketing.get_all_pharmacies, None, None),
+        ("crud_marketing.create_pharmacy", lambda: crud_marketing.create_pharmacy("Bench pharmacy"), None,
+         lambda _: crud_marketing.delete_pharmacy(last_id("pharmacies"))),
+        ("crud_marketing.rename_pharmacy", lambda: crud_marketing.rename_pharmacy(pharmacy_id, pharmacy + " *"), None,
+         lambda _: crud_marketing.rename_pharmacy(pharmacy_id, pharmacy)),
+        ("crud_marketing.delete_pharmacy", crud_marketing.delete_pharmacy,
+         lambda: (crud_marketing.create_pharmacy("Bench pharmacy"), last_id("pharmacies"))[1], None),
+        ("crud_marketing.create_activity", lambda: crud_marketing.create_activity(pharmacy_id, month, "Bench", ""), None,
+         lambda _: crud_marketing.delete_activity(last_id("marketing_activities"))),
+        ("crud_marketing.update_activity", lambda: crud_marketing.update_activity(activity_id, "Campaign", "bench"),
+         None, None),
+        ("crud_marketing.delete_activity", crud_marketing.delete_activity,
+         lambda: (crud_marketing.create_activity(pharmacy_id, month, "Bench", ""), last_id("marketing_activities"))[1],
+         None),
+        ("crud_marketing.get_activities_for_month",
+         lambda: crud_marketing.get_activities_for_month(pharmacy_id, month), None, None),
+
+        # crud_activities
+        ("crud_activities.get_all_activity_templates", crud_activities.get_all_activity_templates.__wrapped__, None, None),
+        ("crud_activities.get_all_activity_templates[cached]", crud_activities.get_all_activity_templates, None, None),
+        ("crud_activities.create_activity_template", lambda: crud_activities.create_activity_template("Bench"), None,
+         lambda _: crud_activities.delete_activity_template(last_id("activity_templates"))),
+        ("crud_activities.update_activity_template",
+         lambda: crud_activities.update_activity_template(template_id, "Activity 00", ""), None, None),
+        ("crud_activities.delete_activity_template", crud_activities.delete_activity_template,
+         lambda: (crud_activities.create_activity_template("Bench"), last_id("activity_templates"))[1], None),
+        ("crud_activities.get_assigned_activity_ids",
+         lambda: crud_activities.get_assigned_activity_ids(pharmacy_id, month), None, None),
+        ("crud_activities.get_month_assignments",
+         lambda: crud_activities.get_month_assignments(pharmacy_id, month), None, None),
+        ("crud_activities.get_assignment_months", crud_activities.get_assignment_months, None, None),
+        ("crud_activities.get_activity_overview", lambda: crud_activities.get_activity_overview(month), None, None),
+        ("crud_activities.get_activity_overview[pharmacy]",
+         lambda: crud_activities.get_activity_overview(month, pharmacy_id=pharmacy_id), None, None),
+        ("crud_activities.get_activity_overview[activity]",
+         lambda: crud_activities.get_activity_overview(month, activity_id=template_id), None, None),
+        ("crud_activities.get_activity_overview[product]",
+         lambda: crud_activities.get_activity_overview(month, product_id=product_ids[0]), None, None),
+        ("crud_activities.assign_activities_to_pharmacy",
+         lambda: crud_activities.assign_activities_to_pharmacy(pharmacy_id, month, assigned[1:] + others), None,
+         reset_assignments),
+        ("crud_activities.delete_assigned_activity", crud_activities.delete_assigned_activity,
+         lambda: (crud_activities.assign_activities_to_pharmacy(pharmacy_id, month, assigned + others[:1]),
+                  conn.execute("SELECT id FROM assigned_activities WHERE pharmacy_id = ? AND month = ? AND activity_id = ?",
+                               (pharmacy_id, month, others[0])).fetchone()[0])[1],
+         reset_assignments),
+        ("crud_activities.get_attached_product_ids",
+         lambda: crud_activities.get_attached_product_ids(assignment_id), None, None),
+        ("crud_activities.set_attached_products",
+         lambda: crud_activities.set_attached_products(assignment_id, product_ids[1:] + [product_id]), None,
+         lambda _: crud_activities.set_attached_products(assignment_id, product_ids)),
+
+        # pages: Marketing Activities, products, Break-even
+        ("crud_products.get_all_products", crud_products.get_all_products.__wrapped__, None, None),
+        ("page.products.list", execute(db.PHARMACY_DB, """
+            SELECT name, division, production_cost, packaging_cost, delivery_cost, platform_fee_pct, list_price, notes
+            FROM products ORDER BY name"""), None, None),
+        ("page.products.list[division]", execute(db.PHARMACY_DB, """
+            SELECT name, division, production_cost, packaging_cost, delivery_cost, platform_fee_pct, list_price, notes
+            FROM products WHERE division = ? ORDER BY name""", (division,)), None, None),
+        ("page.products.get", execute(db.PHARMACY_DB, """
+            SELECT name, division, production_cost, packaging_cost, delivery_cost, platform_fee_pct, list_price, notes
+            FROM products WHERE name = ?""", (product,)), None, None),
+        ("page.products.lookup", execute(db.PHARMACY_DB, "SELECT id FROM products WHERE name = ?", (product,)),
+         None, None),
+        ("crud_products.get_product_costs", lambda: crud_products.get_product_costs(500), None, None),
+
+        # pages: pharmacy terms
+        ("crud_terms.get_terms", lambda: crud_terms.get_terms(pharmacy, month), None, None),
+        ("crud_terms.count_terms", crud_terms.count_terms, None, None),
+        ("crud_terms.count_terms[pharmacy]", lambda: crud_terms.count_terms(pharmacy), None, None),
+        ("crud_terms.get_terms_page", crud_terms.get_terms_page, None, None),
+        ("crud_terms.get_terms_page[after]", lambda: crud_terms.get_terms_page(after=terms_after), None, None),
+        ("crud_terms.get_terms_page[months]",
+         lambda: crud_terms.get_terms_page(month_from=months[-12], month_to=months[-6]), None, None),
+
+        # pages: priority products
+        ("crud_priority.get_month_priorities", lambda: crud_priority.get_month_priorities(month), None, None),
+        ("crud_priority.get_rollup[month]", lambda: crud_priority.get_rollup(["month"]), None, None),
+        ("crud_priority.get_rollup[pharmacy,product]",
+         lambda: crud_priority.get_rollup(["pharmacy_name", "product_name"], months[-3], month), None, None),
+
+        # pages: pharmacy P&L; a terms edit marks one pharmacy-month for the refresh
+        ("crud_pnl.refresh[one pharmacy-month]", lambda _: crud_pnl.refresh(),
+         lambda: save_terms(1), lambda _: (save_terms(0), crud_pnl.refresh())),
+        ("crud_pnl.get_months", crud_pnl.get_months, None, None),
+        ("crud_pnl.get_slice[pharmacy]", lambda: crud_pnl.get_slice(["pharmacy_name"], month, month), None, None),
+        ("crud_pnl.get_slice[division,months]",
+         lambda: crud_pnl.get_slice(["month", "division"], months[-12], month), None, None),
+        ("crud_pnl.get_slice[product,pharmacy]",
+         lambda: crud_pnl.get_slice(["product_name"], months[-12], month, pharmacy=pharmacy), None, None),
+
+        # pages: net price matrix, every product x every pharmacy's terms
+        ("price_matrix.load_catalog", price_matrix.load_catalog.__wrapped__, None, None),
+        ("price_matrix.load_terms", lambda: price_matrix.load_terms.__wrapped__(month), None, None),
+        ("price_matrix.grid[margin]", lambda: price_matrix.grid(catalog, month_terms, "margin"), None, None),
+        ("price_matrix.rank[cell]", lambda: price_matrix.rank(catalog, month_terms, "margin_pct", "cell", 1000),
+         None, None),
+        ("price_matrix.rank[product]", lambda: price_matrix.rank(catalog, month_terms, "margin", "product", 1000),
+         None, None),
+
+        # pages: invoice tracking
+        ("crud_invoices.get_counterparties", crud_invoices.get_counterparties.__wrapped__, None, None),
+        ("crud_invoices.get_invoice_labels", lambda: crud_invoices.get_invoice_labels(invoice_month), None, None),
+        ("crud_invoices.get_invoice_page", lambda: crud_invoices.get_invoice_page(invoice_month), None, None),
+        ("crud_invoices.get_invoice_page[after]",
+         lambda: crud_invoices.get_invoice_page(invoice_month, after=invoice_after), None, None),
+        ("crud_invoices.get_month_invoices", lambda: crud_invoices.get_month_invoices(invoice_month), None, None),
+        ("crud_invoices.get_invoice", lambda: crud_invoices.get_invoice(labels[0]["id"]), None, None),
+        ("crud_invoices.count_counterparty_invoices",
+         lambda: crud_invoices.count_counterparty_invoices(counterparty_id), None, None),
+        ("crud_invoices.get_ap_by_company", lambda: crud_invoices.get_ap_by_company(f"{invoice_month}-15"), None, None),
+        ("crud_invoices.get_ap_by_month", lambda: crud_invoices.get_ap_by_month(counterparty_id), None, None),
+    ]
+
+
+def run_scale(scale: float, data_dir: str, repeat: int, seed: int) -> dict:
+    """Benchmark one scale in a child process, so each scale gets fresh db paths and pools."""
+    import subprocess
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.run", "--worker", str(scale), "--data-dir", data_dir,
+         "--repeat", str(repeat), "--seed", str(seed)],
+        check=True, stdout=subprocess.PIPE, text=True,
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def _worker(scale: float, data_dir: str, repeat: int, seed: int) -> dict:
+    from benchmarks import synthetic
+
+    pharmacy_db, invoice_db = synthetic.ensure_databases(scale, data_dir, seed)
+    os.environ["SLPUB_PHARMACY_DB"] = pharmacy_db
+    os.environ["SLPUB_INVOICE_DB"] = invoice_db
+
+    results = {}
+    for name, fn, setup, undo in _cases(synthetic.month_list()):
+        results[name] = round(_median_ms(fn, repeat, setup, undo), 3)
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float, floor_ms: float) -> list:
+    """(scale, case, baseline ms, current ms) for every case slower than allowed."""
+    regressions = []
+    for scale, cases in results.items():
+        for name, ms in cases.items():
+            before = baseline.get(scale, {}).get(name)
+            if before is not None and ms > before * (1 + tolerance) and ms - before > floor_ms:
+                regressions.append((scale, name, before, ms))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", type=float, nargs="+", default=[0.1])
+    parser.add_argument("--repeat", type=int, default=15)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data-dir", default=os.path.join("benchmarks", "data"))
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--output", help="write the results as JSON")
+    parser.add_argument("--tolerance", type=float, default=1.0, help="allowed slowdown, 1.0 = twice as slow")
+    parser.add_argument("--floor-ms", type=float, default=2.0, help="ignore slowdowns smaller than this")
+    parser.add_argument("--check", action="store_true", help="exit 1 when a case regresses")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--worker", type=float, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker is not None:
+        print(json.dumps(_worker(args.worker, args.data_dir, args.repeat, args.seed)))
+        return 0
+
+    results = {f"{scale:g}": run_scale(scale, args.data_dir, args.repeat, args.seed) for scale in args.scales}
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    scales = list(results)
+    print(f"{'case':<55}" + "".join(f"{'x' + s:>12}" for s in scales) + f"{'baseline':>12}")
+    for name in results[scales[0]]:
+        before = baseline.get(scales[-1], {}).get(name)
+        print(f"{name:<55}" + "".join(f"{results[s][name]:>12.3f}" for s in scales)
+              + (f"{before:>12.3f}" if before is not None else f"{'-':>12}"))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.save_baseline:
+        baseline.update(results)
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"baseline saved to {args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline, args.tolerance, args.floor_ms)
+    for scale, name, before, ms in regressions:
+        print(f"REGRESSION x{scale} {name}: {before:.3f} ms -> {ms:.3f} ms")
+    if not baseline:
+        print(f"no baseline at {args.baseline}; run with --save-baseline to record one on this machine")
+        return 1 if args.check else 0
+    return 1 if regressions and args.check else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
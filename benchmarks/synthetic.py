@@ -0,0 +1,195 @@
+"""Synthetic pharmacy.db / invoice_tracking.db at a configurable scale.
+
+Scale 1.0 is the rollout target: 5k pharmacies, 50k products, 36 months of
+assignments, attached products, terms and priority products, and 1M
+invoices. Row counts scale linearly; the activity catalogue and the
+number of months do not.
+"""
+import os
+import sqlite3
+import subprocess
+import sys
+import time
+from datetime import date, timedelta
+from typing import Dict
+
+import numpy as np
+
+import migrations
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FULL_SCALE = {
+    "pharmacies": 5_000,
+    "products": 50_000,
+    "counterparties": 2_000,
+    "invoices": 1_000_000,
+}
+# the activity catalogue and the month range do not grow with scale
+TEMPLATES = 40
+MONTHS = 36
+ACTIVITIES_PER_PHARMACY_MONTH = 3
+PRODUCTS_PER_ASSIGNMENT = 2
+PRIORITIES_PER_PHARMACY_MONTH = 5
+# the divisions offered on the products page
+DIVISIONS = ["Other", "LecoVita", "AdiPharm", "PharmaPlus"]
+STATUSES = ["Paid", "Unpaid", "Partially Paid"]
+
+
+def sizes(scale: float) -> Dict[str, int]:
+    return {name: max(1, int(count * scale)) for name, count in FULL_SCALE.items()}
+
+
+def month_list(months: int = MONTHS, end: date = None):
+    end = end or date.today()
+    year, month = end.year, end.month
+    result = []
+    for _ in range(months):
+        result.append(f"{year:04d}-{month:02d}")
+        year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+    return result[::-1]
+
+
+def _connect(path: str, steps) -> sqlite3.Connection:
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = OFF")
+    migrations.migrate(conn, steps)
+    return conn
+
+
+def build_pharmacy_db(path: str, scale: float = 1.0, seed: int = 0) -> Dict[str, int]:
+    n = sizes(scale)
+    rng = np.random.default_rng(seed)
+    months = month_list()
+    conn = _connect(path, migrations.PHARMACY_MIGRATIONS)
+    with conn:
+        conn.executemany("INSERT INTO pharmacies (name) VALUES (?)",
+                         [(f"Pharmacy {i:05d}",) for i in range(n["pharmacies"])])
+        costs = rng.uniform(0.5, 30, size=(n["products"], 3)).round(2)
+        fees = rng.uniform(0, 15, size=n["products"]).round(1)
+        prices = (costs.sum(axis=1) * rng.uniform(1.2, 3, size=n["products"])).round(2)
+        divisions = rng.integers(0, len(DIVISIONS), size=n["products"])
+        conn.executemany(
+            """INSERT INTO products (name, division, production_cost, packaging_cost, delivery_cost, platform_fee_pct,
+                                     list_price, notes)
+            VALUES (?, ?, ?, ?, ?, ?, ?, '')""",
+            [(f"Product {i:06d}", DIVISIONS[d], *c, f, p)
+             for i, (d, c, f, p) in enumerate(zip(divisions.tolist(), costs.tolist(), fees.tolist(), prices.tolist()))]
+        )
+        conn.executemany("INSERT INTO activity_templates (name, notes) VALUES (?, '')",
+                         [(f"Activity {i:02d}",) for i in range(TEMPLATES)])
+
+        pharmacy_ids = np.arange(1, n["pharmacies"] + 1)
+        month_idx = np.arange(len(months))
+        # distinct templates per pharmacy-month: a random offset plus consecutive steps
+        grid = np.array(np.meshgrid(pharmacy_ids, month_idx, indexing="ij")).reshape(2, -1).T
+        first = rng.integers(0, TEMPLATES, size=len(grid))
+        k = min(ACTIVITIES_PER_PHARMACY_MONTH, TEMPLATES)
+        assignments = [
+            (int(p), months[m], int((f + j) % TEMPLATES) + 1)
+            for (p, m), f in zip(grid.tolist(), first.tolist()) for j in range(k)
+        ]
+        conn.executemany("INSERT INTO assigned_activities (pharmacy_id, month, activity_id) VALUES (?, ?, ?)",
+                         assignments)
+
+        assignment_count = conn.execute("SELECT MAX(id) FROM assigned_activities").fetchone()[0]
+        product_picks = rng.integers(1, n["products"] + 1, size=(assignment_count, PRODUCTS_PER_ASSIGNMENT))
+        conn.executemany(
+            "INSERT OR IGNORE INTO activity_attached_products (activity_id, product_id) VALUES (?, ?)",
+            [(a + 1, int(p)) for a, row in enumerate(product_picks.tolist()) for p in row]
+        )
+
+        terms = rng.uniform(0, 20, size=(len(grid), 4)).round(2)
+        conn.executemany(
+            """INSERT INTO pharmacy_terms (pharmacy_name, month, sell_in_discount_pct, sell_out_fee_pct,
+                                           sell_out_fee_bgn, marketing_spend_bgn, notes)
+            VALUES (?, ?, ?, ?, ?, ?, '')""",
+            [(f"Pharmacy {p - 1:05d}", months[m], *t) for (p, m), t in zip(grid.tolist(), terms.tolist())]
+        )
+
+        priority_products = rng.integers(0, n["products"], size=(len(grid), PRIORITIES_PER_PHARMACY_MONTH))
+        payouts = rng.uniform(0.1, 5, size=(len(grid), 2)).round(2)
+        conn.executemany(
+            """INSERT OR IGNORE INTO priority_products (pharmacy_name, product_name, month,
+                                                        priority_total, pharmacist_share, pharmacy_share)
+            VALUES (?, ?, ?, ?, ?, ?)""",
+            [(f"Pharmacy {p - 1:05d}", f"Product {prod:06d}", months[m], a + b, a, b)
+             for (p, m), row, (a, b) in zip(grid.tolist(), priority_products.tolist(), payouts.tolist())
+             for prod in row]
+        )
+
+        conn.executemany(
+            "INSERT INTO marketing_activities (pharmacy_id, month, name, notes) VALUES (?, ?, ?, '')",
+            [(int(p), months[m], "Campaign") for p, m in grid[::7].tolist()]
+        )
+    conn.close()
+
+    # build the P&L cube as the first refresh after a deploy would; db binds its
+    # database path at import, so this runs in its own interpreter
+    subprocess.run([sys.executable, "-c", "import crud_pnl; crud_pnl.refresh()"], cwd=REPO, check=True,
+                   env={**os.environ, "SLPUB_PHARMACY_DB": os.path.abspath(path), "SLPUB_PROFILE": "0"})
+
+    conn = sqlite3.connect(path)
+    counts = {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] for table in (
+        "pharmacies", "products", "activity_templates", "assigned_activities", "activity_attached_products",
+        "pharmacy_terms", "priority_products", "marketing_activities", "pnl_cube")}
+    conn.execute("ANALYZE")
+    conn.close()
+    return counts
+
+
+def build_invoice_db(path: str, scale: float = 1.0, seed: int = 0) -> Dict[str, int]:
+    n = sizes(scale)
+    rng = np.random.default_rng(seed + 1)
+    months = month_list()
+    conn = _connect(path, migrations.INVOICE_MIGRATIONS)
+    with conn:
+        conn.executemany("INSERT INTO counterparties (name) VALUES (?)",
+                         [(f"Supplier {i:04d}",) for i in range(n["counterparties"])])
+
+        count = n["invoices"]
+        month_idx = np.sort(rng.integers(0, len(months), size=count))
+        day = rng.integers(1, 29, size=count)
+        counterparty = rng.integers(1, n["counterparties"] + 1, size=count)
+        amount = rng.lognormal(6, 1, size=count).round(2)
+        status = rng.choice(len(STATUSES), size=count, p=[0.7, 0.2, 0.1])
+        terms_days = rng.choice([14, 30, 60], size=count)
+        pay_days = rng.integers(0, 75, size=count)
+
+        def rows():
+            for i in range(count):
+                month = months[month_idx[i]]
+                invoice_date = date(int(month[:4]), int(month[5:]), int(day[i]))
+                paid = STATUSES[status[i]] == "Paid"
+                yield (
+                    month, f"INV-{i:07d}", invoice_date.isoformat(), invoice_date.isoformat(),
+                    int(counterparty[i]), float(amount[i]),
+                    (invoice_date + timedelta(days=int(terms_days[i]))).isoformat(),
+                    (invoice_date + timedelta(days=int(pay_days[i]))).isoformat() if paid else None,
+                    STATUSES[status[i]],
+                )
+
+        conn.executemany(
+            """INSERT INTO invoices (month, invoice_number, invoice_date, received_date, counterparty_id,
+                                     amount, due_date, paid_date, status)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            rows()
+        )
+    counts = {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+              for table in ("counterparties", "invoices", "ap_summary", "ap_open_items")}
+    conn.execute("ANALYZE")
+    conn.close()
+    return counts
+
+
+def ensure_databases(scale: float, data_dir: str, seed: int = 0):
+    """(pharmacy db, invoice db) paths for a scale under data_dir, built on first use."""
+    os.makedirs(data_dir, exist_ok=True)
+    pharmacy_db = os.path.join(data_dir, f"pharmacy-{scale:g}.db")
+    invoice_db = os.path.join(data_dir, f"invoice_tracking-{scale:g}.db")
+    for path, build in ((pharmacy_db, build_pharmacy_db), (invoice_db, build_invoice_db)):
+        if not os.path.exists(path):
+            start = time.perf_counter()
+            counts = build(path, scale, seed)
+            print(f"built {path} in {time.perf_counter() - start:.1f}s: {counts}", file=sys.stderr)
+    return pharmacy_db, invoice_db
@@ -1,63 +1,141 @@
-import sqlite3
-from typing import List, Dict
+import json
+from typing import List, Dict, Optional
 
-DB_PATH = "pharmacy.db"
-
-def get_connection():
-    return sqlite3.connect(DB_PATH)
+import db
 
 #templates
 
+@db.cached()
 def get_all_activity_templates() -> List[Dict]:
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT id, name, notes FROM activity_templates ORDER BY name")
-    result = [{"id": row[0], "name": row[1], "notes": row[2]} for row in cursor.fetchall()]
-    conn.close()
-    return result
+    conn = db.get_connection()
+    rows = conn.execute("SELECT id, name, notes FROM activity_templates ORDER BY name").fetchall()
+    return [{"id": row[0], "name": row[1], "notes": row[2]} for row in rows]
 
 def create_activity_template(name: str, notes: str = ""):
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("INSERT INTO activity_templates (name, notes) VALUES (?, ?)", (name, notes))
-    conn.commit()
-    conn.close()
+    with db.transaction() as conn:
+        conn.execute("INSERT INTO activity_templates (name, notes) VALUES (?, ?)", (name, notes))
 
 def update_activity_template(activity_id: int, name: str, notes: str):
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("UPDATE activity_templates SET name = ?, notes = ? WHERE id = ?", (name, notes, activity_id))
-    conn.commit()
-    conn.close()
+    with db.transaction() as conn:
+        conn.execute("UPDATE activity_templates SET name = ?, notes = ? WHERE id = ?", (name, notes, activity_id))
 
 def delete_activity_template(activity_id: int):
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM activity_templates WHERE id = ?", (activity_id,))
-    conn.commit()
-    conn.close()
+    with db.transaction() as conn:
+        conn.execute("DELETE FROM activity_templates WHERE id = ?", (activity_id,))
 
 #assigned
 
 def get_assigned_activity_ids(pharmacy_id: int, month: str) -> List[int]:
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute(
+    conn = db.get_connection()
+    rows = conn.execute(
         "SELECT activity_id FROM assigned_activities WHERE pharmacy_id = ? AND month = ?",
         (pharmacy_id, month)
-    )
-    result = [row[0] for row in cursor.fetchall()]
-    conn.close()
-    return result
+    ).fetchall()
+    return [row[0] for row in rows]
+
+def get_month_assignments(pharmacy_id: int, month: str) -> List[Dict]:
+    """A pharmacy's assignments for the month with their attached product ids, in one query."""
+    conn = db.get_connection()
+    rows = conn.execute("""
+        SELECT aa.id, aa.activity_id, at.name,
+               (SELECT json_group_array(ap.product_id) FROM activity_attached_products ap
+                WHERE ap.activity_id = aa.id) AS product_ids
+        FROM assigned_activities aa
+        JOIN activity_templates at ON aa.activity_id = at.id
+        WHERE aa.pharmacy_id = ? AND aa.month = ?
+        ORDER BY aa.id
+    """, (pharmacy_id, month)).fetchall()
+    return [
+        {"id": row[0], "activity_id": row[1], "name": row[2], "product_ids": json.loads(row[3])}
+        for row in rows
+    ]
+
+def get_assignment_months() -> List[str]:
+    conn = db.get_connection()
+    rows = conn.execute("SELECT DISTINCT month FROM assigned_activities ORDER BY month DESC").fetchall()
+    return [row[0] for row in rows]
+
+def get_activity_overview(month: str, pharmacy_id: Optional[int] = None, activity_id: Optional[int] = None,
+                          product_id: Optional[int] = None) -> List[Dict]:
+    """All assignments of a month, optionally narrowed to one pharmacy, activity or attached product."""
+    conditions = ["aa.month = ?"]
+    params = [month]
+    if pharmacy_id is not None:
+        conditions.append("aa.pharmacy_id = ?")
+        params.append(pharmacy_id)
+    if activity_id is not None:
+        conditions.append("aa.activity_id = ?")
+        params.append(activity_id)
+    if product_id is not None:
+        conditions.append(
+            "EXISTS (SELECT 1 FROM activity_attached_products ap WHERE ap.activity_id = aa.id AND ap.product_id = ?)"
+        )
+        params.append(product_id)
+
+    conn = db.get_connection()
+    rows = conn.execute(f"""
+        SELECT aa.id, aa.month, p.name, at.name,
+               (SELECT json_group_array(ap.product_id) FROM activity_attached_products ap
+                WHERE ap.activity_id = aa.id) AS product_ids
+        FROM assigned_activities aa
+        JOIN pharmacies p ON aa.pharmacy_id = p.id
+        JOIN activity_templates at ON aa.activity_id = at.id
+        WHERE {" AND ".join(conditions)}
+        ORDER BY p.name, at.name
+    """, params).fetchall()
+    return [
+        {"id": row[0], "month": row[1], "pharmacy": row[2], "activity": row[3], "product_ids": json.loads(row[4])}
+        for row in rows
+    ]
 
 def assign_activities_to_pharmacy(pharmacy_id: int, month: str, activity_ids: List[int]):
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM assigned_activities WHERE pharmacy_id = ? AND month = ?", (pharmacy_id, month))
-    for aid in activity_ids:
-        cursor.execute(
-            "INSERT INTO assigned_activities (pharmacy_id, month, activity_id) VALUES (?, ?, ?)",
-            (pharmacy_id, month, aid)
+    # apply only the difference so kept assignments keep their id and attached products
+    wanted = set(activity_ids)
+    with db.transaction() as conn:
+        existing = set(get_assigned_activity_ids(pharmacy_id, month))
+        removed = [(pharmacy_id, month, aid) for aid in existing - wanted]
+        added = [(pharmacy_id, month, aid) for aid in wanted - existing]
+        conn.executemany(
+            """DELETE FROM activity_attached_products WHERE activity_id IN (
+                SELECT id FROM assigned_activities WHERE pharmacy_id = ? AND month = ? AND activity_id = ?
+            )""",
+            removed
+        )
+        conn.executemany(
+            "DELETE FROM assigned_activities WHERE pharmacy_id = ? AND month = ? AND activity_id = ?",
+            removed
+        )
+        conn.executemany(
+            """INSERT INTO assigned_activities (pharmacy_id, month, activity_id) VALUES (?, ?, ?)
+            ON CONFLICT (pharmacy_id, month, activity_id) DO NOTHING""",
+            added
+        )
+
+def delete_assigned_activity(assignment_id: int):
+    with db.transaction() as conn:
+        conn.execute("DELETE FROM activity_attached_products WHERE activity_id = ?", (assignment_id,))
+        conn.execute("DELETE FROM assigned_activities WHERE id = ?", (assignment_id,))
+
+#attached products
+
+def get_attached_product_ids(assignment_id: int) -> List[int]:
+    conn = db.get_connection()
+    rows = conn.execute(
+        "SELECT product_id FROM activity_attached_products WHERE activity_id = ?",
+        (assignment_id,)
+    ).fetchall()
+    return [row[0] for row in rows]
+
+def set_attached_products(assignment_id: int, product_ids: List[int]):
+    wanted = set(product_ids)
+    with db.transaction() as conn:
+        existing = set(get_attached_product_ids(assignment_id))
+        conn.executemany(
+            "DELETE FROM activity_attached_products WHERE activity_id = ? AND product_id = ?",
+            [(assignment_id, pid) for pid in existing - wanted]
+        )
+        conn.executemany(
+            """INSERT INTO activity_attached_products (activity_id, product_id) VALUES (?, ?)
+            ON CONFLICT (activity_id, product_id) DO NOTHING""",
+            [(assignment_id, pid) for pid in wanted - existing]
         )
-    conn.commit()
-    conn.close()
\ No newline at end of file
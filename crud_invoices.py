@@ -0,0 +1,211 @@
+from typing import Callable, List, Dict, Optional, Tuple
+
+import pandas as pd
+
+import db
+
+STATUSES = ["Unpaid", "Paid", "Partially Paid"]
+PAGE_SIZE = 50
+
+INVOICE_FIELDS = """
+    i.id, i.month, i.invoice_number, i.invoice_date, i.received_date,
+    i.counterparty_id, c.name AS company, i.amount, i.due_date, i.paid_date, i.status
+"""
+INVOICE_FROM = "invoices i JOIN counterparties c ON c.id = i.counterparty_id"
+
+def _as_dict(cursor, row) -> Dict:
+    return {col[0]: value for col, value in zip(cursor.description, row)}
+
+#listing
+
+def get_invoice_labels(month: str) -> List[Dict]:
+    # just enough to fill the edit selector, served from idx_invoices_month_date
+    conn = db.get_connection(db.INVOICE_DB)
+    rows = conn.execute(
+        f"SELECT i.id, i.invoice_number, c.name FROM {INVOICE_FROM} WHERE i.month = ? ORDER BY i.invoice_date, i.id",
+        (month,)
+    ).fetchall()
+    return [{"id": row[0], "label": f"{row[1]} ({row[2]})"} for row in rows]
+
+def get_invoice_page(month: str, after: Optional[Tuple[str, int]] = None, limit: int = PAGE_SIZE) -> pd.DataFrame:
+    """One page of a month's invoices in (invoice_date, id) order.
+
+    ``after`` is the (invoice_date, id) of the last row of the previous page;
+    the next page is a keyset seek on the month index, not an OFFSET scan.
+    """
+    conn = db.get_connection(db.INVOICE_DB)
+    if after is None:
+        sql = f"SELECT {INVOICE_FIELDS} FROM {INVOICE_FROM} WHERE i.month = ? ORDER BY i.invoice_date, i.id LIMIT ?"
+        params = (month, limit)
+    else:
+        sql = f"""SELECT {INVOICE_FIELDS} FROM {INVOICE_FROM}
+            WHERE i.month = ? AND (i.invoice_date, i.id) > (?, ?)
+            ORDER BY i.invoice_date, i.id LIMIT ?"""
+        params = (month, after[0], after[1], limit)
+    return pd.read_sql_query(sql, conn, params=params)
+
+def get_month_invoices(month: str) -> pd.DataFrame:
+    conn = db.get_connection(db.INVOICE_DB)
+    return pd.read_sql_query(
+        f"SELECT {INVOICE_FIELDS} FROM {INVOICE_FROM} WHERE i.month = ? ORDER BY i.invoice_date, i.id",
+        conn, params=(month,)
+    )
+
+def get_invoice(invoice_id: int) -> Optional[Dict]:
+    conn = db.get_connection(db.INVOICE_DB)
+    cursor = conn.execute(f"SELECT {INVOICE_FIELDS} FROM {INVOICE_FROM} WHERE i.id = ?", (invoice_id,))
+    row = cursor.fetchone()
+    return _as_dict(cursor, row) if row else None
+
+#writes
+
+def create_invoice(month: str, invoice_number: str, invoice_date: str, received_date: str, counterparty_id: int,
+                   amount: float, due_date: str, paid_date: Optional[str], status: str):
+    with db.transaction(db.INVOICE_DB) as conn:
+        conn.execute("""
+            INSERT INTO invoices (
+                month, invoice_number, invoice_date, received_date,
+                counterparty_id, amount, due_date, paid_date, status
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (month, invoice_number, invoice_date, received_date, counterparty_id, amount, due_date, paid_date, status))
+
+def update_invoice(invoice_id: int, invoice_number: str, invoice_date: str, received_date: str, counterparty_id: int,
+                   amount: float, due_date: str, paid_date: Optional[str], status: str):
+    with db.transaction(db.INVOICE_DB) as conn:
+        conn.execute("""
+            UPDATE invoices SET
+                invoice_number = ?, invoice_date = ?, received_date = ?, counterparty_id = ?,
+                amount = ?, due_date = ?, paid_date = ?, status = ?
+            WHERE id = ?
+        """, (invoice_number, invoice_date, received_date, counterparty_id, amount, due_date, paid_date, status, invoice_id))
+
+def delete_invoice(invoice_id: int):
+    with db.transaction(db.INVOICE_DB) as conn:
+        conn.execute("DELETE FROM invoices WHERE id = ?", (invoice_id,))
+
+#bulk import
+
+IMPORT_BATCH_ROWS = 500
+
+def import_invoices(rows: pd.DataFrame, progress: Optional[Callable[[float], None]] = None) -> Dict[str, int]:
+    """Upsert prepared invoice rows (see invoice_import.prepare) in one transaction.
+
+    Unknown companies are created. An invoice whose (invoice_number, company)
+    already exists is updated, anything else is inserted. ``progress`` is
+    called with the fraction of rows written after every batch.
+    """
+    if rows.empty:
+        return {"inserted": 0, "updated": 0, "companies_created": 0}
+    names = rows["company"].unique().tolist()
+    with db.transaction(db.INVOICE_DB) as conn:
+        before = conn.total_changes
+        conn.executemany("INSERT OR IGNORE INTO counterparties (name) VALUES (?)", [(name,) for name in names])
+        created = conn.total_changes - before
+
+        ids = dict(conn.execute("SELECT name, id FROM counterparties").fetchall())
+        counterparty_ids = rows["company"].map(ids).astype(int)
+        placeholders = ",".join("?" * len(names))
+        existing = set(conn.execute(
+            f"SELECT DISTINCT counterparty_id, invoice_number FROM invoices WHERE counterparty_id IN ({placeholders})",
+            [ids[name] for name in names]
+        ).fetchall())
+
+        records = list(zip(
+            rows["month"], rows["invoice_number"], rows["invoice_date"], rows["received_date"],
+            counterparty_ids.tolist(), rows["amount"].astype(float).tolist(), rows["due_date"], rows["paid_date"], rows["status"],
+        ))
+        updates = [r for r in records if (r[4], r[1]) in existing]
+        inserts = [r for r in records if (r[4], r[1]) not in existing]
+
+        done = 0
+        for start in range(0, len(updates), IMPORT_BATCH_ROWS):
+            batch = updates[start:start + IMPORT_BATCH_ROWS]
+            conn.executemany("""
+                UPDATE invoices SET
+                    month = ?, invoice_date = ?, received_date = ?, amount = ?,
+                    due_date = ?, paid_date = ?, status = ?
+                WHERE counterparty_id = ? AND invoice_number = ?
+            """, [(r[0], r[2], r[3], r[5], r[6], r[7], r[8], r[4], r[1]) for r in batch])
+            done += len(batch)
+            if progress:
+                progress(done / len(records))
+        for start in range(0, len(inserts), IMPORT_BATCH_ROWS):
+            batch = inserts[start:start + IMPORT_BATCH_ROWS]
+            conn.executemany("""
+                INSERT INTO invoices (
+                    month, invoice_number, invoice_date, received_date,
+                    counterparty_id, amount, due_date, paid_date, status
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, batch)
+            done += len(batch)
+            if progress:
+                progress(done / len(records))
+    return {"inserted": len(inserts), "updated": len(updates), "companies_created": created}
+
+#counterparties
+
+@db.cached(db.INVOICE_DB)
+def get_counterparties() -> List[Dict]:
+    conn = db.get_connection(db.INVOICE_DB)
+    rows = conn.execute("SELECT id, name FROM counterparties ORDER BY name").fetchall()
+    return [{"id": row[0], "name": row[1]} for row in rows]
+
+def add_counterparty(name: str):
+    with db.transaction(db.INVOICE_DB) as conn:
+        conn.execute("INSERT OR IGNORE INTO counterparties (name) VALUES (?)", (name,))
+
+def rename_counterparty(counterparty_id: int, new_name: str):
+    # invoices hold the id, so this is the only row that changes
+    with db.transaction(db.INVOICE_DB) as conn:
+        conn.execute("UPDATE counterparties SET name = ? WHERE id = ?", (new_name, counterparty_id))
+
+def count_counterparty_invoices(counterparty_id: int) -> int:
+    conn = db.get_connection(db.INVOICE_DB)
+    return conn.execute("SELECT COUNT(*) FROM invoices WHERE counterparty_id = ?", (counterparty_id,)).fetchone()[0]
+
+def delete_counterparty(counterparty_id: int) -> bool:
+    """Delete a company that has no invoices; returns False (and keeps it) otherwise."""
+    with db.transaction(db.INVOICE_DB) as conn:
+        cursor = conn.execute("""
+            DELETE FROM counterparties
+            WHERE id = ? AND NOT EXISTS (SELECT 1 FROM invoices WHERE counterparty_id = ?)
+        """, (counterparty_id, counterparty_id))
+        return cursor.rowcount > 0
+
+#accounts payable (ap_summary / ap_open_items are kept current by triggers)
+
+def get_ap_by_company(as_of: str) -> pd.DataFrame:
+    """Per company: invoice count and total, outstanding, overdue as of ``as_of`` and average days to pay."""
+    conn = db.get_connection(db.INVOICE_DB)
+    return pd.read_sql_query("""
+        SELECT c.id AS counterparty_id,
+               c.name AS company,
+               s.invoices,
+               s.total_amount,
+               s.outstanding,
+               COALESCE(o.overdue, 0) AS overdue,
+               s.avg_days_to_pay
+        FROM (
+            SELECT counterparty_id,
+                   SUM(invoice_count) AS invoices,
+                   SUM(total_amount) AS total_amount,
+                   SUM(CASE WHEN status <> 'Paid' THEN total_amount ELSE 0 END) AS outstanding,
+                   SUM(days_to_pay_total) / NULLIF(SUM(paid_count), 0) AS avg_days_to_pay
+            FROM ap_summary GROUP BY counterparty_id
+        ) s
+        JOIN counterparties c ON c.id = s.counterparty_id
+        LEFT JOIN (
+            SELECT counterparty_id, SUM(open_amount) AS overdue
+            FROM ap_open_items WHERE due_date < ? GROUP BY counterparty_id
+        ) o ON o.counterparty_id = s.counterparty_id
+        ORDER BY s.outstanding DESC, c.name
+    """, conn, params=(as_of,))
+
+def get_ap_by_month(counterparty_id: int) -> pd.DataFrame:
+    conn = db.get_connection(db.INVOICE_DB)
+    return pd.read_sql_query("""
+        SELECT month, status, invoice_count, total_amount,
+               days_to_pay_total / NULLIF(paid_count, 0) AS avg_days_to_pay
+        FROM ap_summary WHERE counterparty_id = ?
+        ORDER BY month DESC, status
+    """, conn, params=(counterparty_id,))
@@ -1,76 +1,49 @@
-import sqlite3
 from typing import List, Optional, Dict
 
-DB_PATH = "pharmacy.db"
-
-def get_connection():
-    return sqlite3.connect(DB_PATH)
+import db
 
 #all pharmacies
+@db.cached()
 def get_all_pharmacies() -> List[Dict]:
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT id, name FROM pharmacies ORDER BY name")
-    result = [{"id": row[0], "name": row[1]} for row in cursor.fetchall()]
-    conn.close()
-    return result
+    conn = db.get_connection()
+    rows = conn.execute("SELECT id, name FROM pharmacies ORDER BY name").fetchall()
+    return [{"id": row[0], "name": row[1]} for row in rows]
 
 def create_pharmacy(name: str):
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("INSERT INTO pharmacies (name) VALUES (?)", (name,))
-    conn.commit()
-    conn.close()
+    with db.transaction() as conn:
+        conn.execute("INSERT INTO pharmacies (name) VALUES (?)", (name,))
 
 def rename_pharmacy(pharmacy_id: int, new_name: str):
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("UPDATE pharmacies SET name = ? WHERE id = ?", (new_name, pharmacy_id))
-    conn.commit()
-    conn.close()
+    with db.transaction() as conn:
+        conn.execute("UPDATE pharmacies SET name = ? WHERE id = ?", (new_name, pharmacy_id))
 
 def delete_pharmacy(pharmacy_id: int):
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM pharmacies WHERE id = ?", (pharmacy_id,))
-    conn.commit()
-    conn.close()
+    with db.transaction() as conn:
+        conn.execute("DELETE FROM pharmacies WHERE id = ?", (pharmacy_id,))
 
 #activities
 def create_activity(pharmacy_id: int, month: str, name: str, notes: str):
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute(
-        "INSERT INTO marketing_activities (pharmacy_id, month, name, notes) VALUES (?, ?, ?, ?)",
-        (pharmacy_id, month, name, notes)
-    )
-    conn.commit()
-    conn.close()
+    with db.transaction() as conn:
+        conn.execute(
+            "INSERT INTO marketing_activities (pharmacy_id, month, name, notes) VALUES (?, ?, ?, ?)",
+            (pharmacy_id, month, name, notes)
+        )
 
 def update_activity(activity_id: int, name: str, notes: str):
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute(
-        "UPDATE marketing_activities SET name = ?, notes = ? WHERE id = ?",
-        (name, notes, activity_id)
-    )
-    conn.commit()
-    conn.close()
+    with db.transaction() as conn:
+        conn.execute(
+            "UPDATE marketing_activities SET name = ?, notes = ? WHERE id = ?",
+            (name, notes, activity_id)
+        )
 
 def delete_activity(activity_id: int):
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM marketing_activities WHERE id = ?", (activity_id,))
-    conn.commit()
-    conn.close()
+    with db.transaction() as conn:
+        conn.execute("DELETE FROM marketing_activities WHERE id = ?", (activity_id,))
 
 def get_activities_for_month(pharmacy_id: int, month: str) -> List[Dict]:
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute(
+    conn = db.get_connection()
+    rows = conn.execute(
         "SELECT id, name, notes FROM marketing_activities WHERE pharmacy_id = ? AND month = ? ORDER BY id DESC",
         (pharmacy_id, month)
-    )
-    result = [{"id": row[0], "name": row[1], "notes": row[2]} for row in cursor.fetchall()]
-    conn.close()
-    return result
\ No newline at end of file
+    ).fetchall()
+    return [{"id": row[0], "name": row[1], "notes": row[2]} for row in rows]
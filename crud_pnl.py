@@ -0,0 +1,155 @@
+from typing import Dict, List, Optional, Sequence
+
+import pandas as pd
+
+import db
+
+# Per-unit P&L of each product a pharmacy carries in a month, from its terms
+# (sell-in discount, sell-out fee), the priority payout and the product costs.
+# The pharmacy-month's fixed fees (sell-out fee in BGN and marketing spend)
+# are split evenly over its products in fixed_cost_share.
+
+SLICE_KEYS = ["month", "pharmacy_name", "division", "product_name"]
+
+# CROSS JOIN keeps pnl_dirty as the outer loop, so refreshing a few
+# pharmacy-months probes the inputs by key instead of scanning them
+REBUILD_SQL = """
+    WITH in_play (month, pharmacy_name, product_id, payout, activities) AS (
+        SELECT d.month, d.pharmacy_name, pr.id, COALESCE(pp.priority_total, 0), 0
+        FROM pnl_dirty d
+        CROSS JOIN priority_products pp ON pp.pharmacy_name = d.pharmacy_name AND pp.month = d.month
+        JOIN products pr ON pr.name = pp.product_name
+        UNION ALL
+        SELECT d.month, d.pharmacy_name, ap.product_id, 0, 1
+        FROM pnl_dirty d
+        CROSS JOIN pharmacies ph ON ph.name = d.pharmacy_name
+        CROSS JOIN assigned_activities aa ON aa.pharmacy_id = ph.id AND aa.month = d.month
+        CROSS JOIN activity_attached_products ap ON ap.activity_id = aa.id
+    ),
+    cells AS (
+        SELECT month, pharmacy_name, product_id, SUM(payout) AS payout, SUM(activities) AS activities,
+               COUNT(*) OVER (PARTITION BY month, pharmacy_name) AS products
+        FROM in_play
+        GROUP BY month, pharmacy_name, product_id
+    ),
+    priced AS (
+        SELECT c.*, COALESCE(p.list_price, 0) AS list_price,
+               COALESCE(p.list_price, 0) * (1 - COALESCE(t.sell_in_discount_pct, 0) / 100.0) AS net_price,
+               COALESCE(p.production_cost, 0) + COALESCE(p.packaging_cost, 0) + COALESCE(p.delivery_cost, 0)
+                   AS base_cost,
+               COALESCE(p.platform_fee_pct, 0) AS platform_fee_pct,
+               COALESCE(t.sell_out_fee_pct, 0) AS sell_out_fee_pct,
+               COALESCE(t.sell_out_fee_bgn, 0) + COALESCE(t.marketing_spend_bgn, 0) AS fixed_costs
+        FROM cells c
+        JOIN products p ON p.id = c.product_id
+        LEFT JOIN pharmacy_terms t ON t.pharmacy_name = c.pharmacy_name AND t.month = c.month
+    )
+    INSERT INTO pnl_cube (month, pharmacy_name, product_id, list_price, net_price, unit_cost, sell_out_fee,
+                          priority_payout, unit_margin, fixed_cost_share, activities)
+    SELECT month, pharmacy_name, product_id, list_price, net_price,
+           base_cost + net_price * platform_fee_pct / 100,
+           net_price * sell_out_fee_pct / 100,
+           payout,
+           net_price - (base_cost + net_price * platform_fee_pct / 100) - net_price * sell_out_fee_pct / 100 - payout,
+           fixed_costs / products,
+           activities
+    FROM priced
+"""
+
+#maintenance
+
+def pending() -> int:
+    """Pharmacy-months changed since the last refresh."""
+    conn = db.get_connection()
+    return conn.execute("SELECT COUNT(*) FROM pnl_dirty").fetchone()[0]
+
+def refresh() -> int:
+    """Rebuild the cube for the pharmacy-months marked dirty; returns how many were rebuilt."""
+    if not pending():
+        return 0
+    # take the write lock first so concurrent refreshes rebuild each pair once
+    with db.transaction(immediate=True) as conn:
+        count = conn.execute("SELECT COUNT(*) FROM pnl_dirty").fetchone()[0]
+        conn.execute("DELETE FROM pnl_cube WHERE (month, pharmacy_name) IN (SELECT month, pharmacy_name FROM pnl_dirty)")
+        conn.execute(REBUILD_SQL)
+        conn.execute("DELETE FROM pnl_dirty")
+    return count
+
+def rebuild() -> int:
+    """Mark every pharmacy-month in the cube or its inputs dirty and refresh."""
+    with db.transaction() as conn:
+        conn.execute("""
+            INSERT OR IGNORE INTO pnl_dirty (month, pharmacy_name)
+            SELECT month, pharmacy_name FROM pnl_cube
+            UNION SELECT month, pharmacy_name FROM priority_products
+            UNION SELECT aa.month, p.name FROM assigned_activities aa JOIN pharmacies p ON p.id = aa.pharmacy_id
+        """)
+    return refresh()
+
+#slicing
+
+def get_months() -> List[str]:
+    conn = db.get_connection()
+    return [row[0] for row in conn.execute("SELECT DISTINCT month FROM pnl_cube ORDER BY month DESC")]
+
+def get_products(pharmacy: str) -> List[Dict]:
+    """Products in the cube for one pharmacy, across all months."""
+    conn = db.get_connection()
+    rows = conn.execute("""
+        SELECT p.id, p.name FROM products p
+        WHERE p.id IN (SELECT product_id FROM pnl_cube WHERE pharmacy_name = ?)
+        ORDER BY p.name
+    """, (pharmacy,)).fetchall()
+    return [{"id": row[0], "name": row[1]} for row in rows]
+
+def get_slice(group_by: Sequence[str], month_from: Optional[str] = None, month_to: Optional[str] = None,
+              pharmacy: Optional[str] = None, division: Optional[str] = None,
+              product_id: Optional[int] = None) -> pd.DataFrame:
+    """Cube totals grouped by any of SLICE_KEYS, optionally narrowed on each dimension.
+
+    Per-unit figures are averaged over the cells in a group; fixed costs are
+    summed, and break_even_units is the sum over profitable cells of fixed
+    cost share / unit margin.
+    """
+    keys = [key for key in SLICE_KEYS if key in group_by]
+    if not keys:
+        raise ValueError(f"group_by must include one of {SLICE_KEYS}")
+    conditions, params = [], []
+    if month_from is not None:
+        conditions.append("c.month >= ?")
+        params.append(month_from)
+    if month_to is not None:
+        conditions.append("c.month <= ?")
+        params.append(month_to)
+    if pharmacy is not None:
+        conditions.append("c.pharmacy_name = ?")
+        params.append(pharmacy)
+    if division is not None:
+        conditions.append("p.division = ?")
+        params.append(division)
+    if product_id is not None:
+        conditions.append("c.product_id = ?")
+        params.append(product_id)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    positions = ", ".join(str(i + 1) for i in range(len(keys)))
+    columns = ", ".join({"month": "c.month", "pharmacy_name": "c.pharmacy_name", "division": "p.division",
+                         "product_name": "p.name AS product_name"}[key] for key in keys)
+    conn = db.get_connection()
+    return pd.read_sql_query(f"""
+        SELECT {columns},
+               COUNT(*) AS cells,
+               AVG(c.net_price) AS net_price,
+               AVG(c.unit_cost) AS unit_cost,
+               AVG(c.sell_out_fee) AS sell_out_fee,
+               AVG(c.priority_payout) AS priority_payout,
+               AVG(c.unit_margin) AS unit_margin,
+               SUM(c.fixed_cost_share) AS fixed_costs,
+               SUM(CASE WHEN c.unit_margin > 0 THEN c.fixed_cost_share / c.unit_margin END) AS break_even_units,
+               SUM(c.unit_margin <= 0) AS loss_making,
+               SUM(c.activities) AS activities
+        FROM pnl_cube c
+        JOIN products p ON p.id = c.product_id
+        {where}
+        GROUP BY {positions}
+        ORDER BY {positions}
+    """, conn, params=params)
@@ -0,0 +1,77 @@
+from typing import List, Dict, Optional, Sequence
+
+import pandas as pd
+
+import db
+
+PAYOUT_FIELDS = ["priority_total", "pharmacist_share", "pharmacy_share"]
+ROLLUP_KEYS = ["month", "pharmacy_name", "product_name"]
+
+UPSERT_SQL = """
+    INSERT INTO priority_products (
+        pharmacy_name, product_name, month,
+        priority_total, pharmacist_share, pharmacy_share
+    ) VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT (pharmacy_name, product_name, month) DO UPDATE SET
+        priority_total = excluded.priority_total,
+        pharmacist_share = excluded.pharmacist_share,
+        pharmacy_share = excluded.pharmacy_share
+"""
+
+#entries
+
+def get_month_priorities(month: str) -> pd.DataFrame:
+    conn = db.get_connection()
+    return pd.read_sql_query("""
+        SELECT id, pharmacy_name, product_name, month,
+               priority_total, pharmacist_share, pharmacy_share
+        FROM priority_products
+        WHERE month = ?
+        ORDER BY pharmacy_name, product_name
+    """, conn, params=(month,))
+
+def save_priority(pharmacy: str, product: str, month: str, priority_total: float,
+                  pharmacist_share: float, pharmacy_share: float):
+    with db.transaction() as conn:
+        conn.execute(UPSERT_SQL, (pharmacy, product, month, priority_total, pharmacist_share, pharmacy_share))
+
+def save_priorities(month: str, rows: List[Dict]):
+    """Upsert many (pharmacy_name, product_name, PAYOUT_FIELDS) rows for one month in one transaction."""
+    with db.transaction() as conn:
+        conn.executemany(UPSERT_SQL, [
+            (row["pharmacy_name"], row["product_name"], month,
+             row["priority_total"], row["pharmacist_share"], row["pharmacy_share"])
+            for row in rows
+        ])
+
+def delete_priorities(ids: List[int]):
+    with db.transaction() as conn:
+        conn.executemany("DELETE FROM priority_products WHERE id = ?", [(i,) for i in ids])
+
+#rollups
+
+def get_rollup(group_by: Sequence[str], month_from: Optional[str] = None, month_to: Optional[str] = None) -> pd.DataFrame:
+    """Payout totals grouped by any of ROLLUP_KEYS, optionally within a month range."""
+    keys = [key for key in ROLLUP_KEYS if key in group_by]
+    if not keys:
+        raise ValueError(f"group_by must include one of {ROLLUP_KEYS}")
+    conditions, params = [], []
+    if month_from is not None:
+        conditions.append("month >= ?")
+        params.append(month_from)
+    if month_to is not None:
+        conditions.append("month <= ?")
+        params.append(month_to)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    columns = ", ".join(keys)
+    conn = db.get_connection()
+    return pd.read_sql_query(f"""
+        SELECT {columns},
+               COUNT(*) AS entries,
+               SUM(priority_total) AS priority_total,
+               SUM(pharmacist_share) AS pharmacist_share,
+               SUM(pharmacy_share) AS pharmacy_share
+        FROM priority_products {where}
+        GROUP BY {columns}
+        ORDER BY {columns}
+    """, conn, params=params)
@@ -0,0 +1,25 @@
+from typing import List, Dict
+
+import db
+
+#all products
+@db.cached()
+def get_all_products() -> List[Dict]:
+    conn = db.get_connection()
+    rows = conn.execute("SELECT id, name FROM products ORDER BY name").fetchall()
+    return [{"id": row[0], "name": row[1]} for row in rows]
+
+@db.cached()
+def get_divisions() -> List[str]:
+    conn = db.get_connection()
+    return [row[0] for row in conn.execute("SELECT DISTINCT division FROM products WHERE division <> '' ORDER BY division")]
+
+#cost and list price per product, for the Break-even batch reports
+def get_product_costs(limit: int) -> List[Dict]:
+    conn = db.get_connection()
+    rows = conn.execute("""
+        SELECT name, production_cost, packaging_cost, delivery_cost, platform_fee_pct, list_price
+        FROM products ORDER BY name LIMIT ?
+    """, (limit,)).fetchall()
+    fields = ["name", "production_cost", "packaging_cost", "delivery_cost", "platform_fee_pct", "list_price"]
+    return [dict(zip(fields, row)) for row in rows]
@@ -0,0 +1,90 @@
+from typing import List, Dict, Optional, Tuple
+
+import pandas as pd
+
+import db
+
+PAGE_SIZE = 100
+
+TERM_FIELDS = ["sell_in_discount_pct", "sell_out_fee_pct", "sell_out_fee_bgn", "marketing_spend_bgn", "notes"]
+
+def _filters(pharmacy: Optional[str], month_from: Optional[str], month_to: Optional[str]):
+    conditions, params = [], []
+    if pharmacy is not None:
+        conditions.append("pharmacy_name = ?")
+        params.append(pharmacy)
+    if month_from is not None:
+        conditions.append("month >= ?")
+        params.append(month_from)
+    if month_to is not None:
+        conditions.append("month <= ?")
+        params.append(month_to)
+    return conditions, params
+
+#single pharmacy & month
+
+def get_terms(pharmacy: str, month: str) -> Optional[Dict]:
+    conn = db.get_connection()
+    cursor = conn.execute(
+        f"SELECT id, pharmacy_name, month, {', '.join(TERM_FIELDS)} FROM pharmacy_terms WHERE pharmacy_name = ? AND month = ?",
+        (pharmacy, month)
+    )
+    row = cursor.fetchone()
+    return {col[0]: value for col, value in zip(cursor.description, row)} if row else None
+
+def save_terms(pharmacy: str, month: str, sell_in_discount_pct: float, sell_out_fee_pct: float,
+               sell_out_fee_bgn: float, marketing_spend_bgn: float, notes: str):
+    with db.transaction() as conn:
+        conn.execute("""
+            INSERT INTO pharmacy_terms (
+                pharmacy_name, month, sell_in_discount_pct,
+                sell_out_fee_pct, sell_out_fee_bgn, marketing_spend_bgn, notes
+            ) VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (pharmacy_name, month) DO UPDATE SET
+                sell_in_discount_pct = excluded.sell_in_discount_pct,
+                sell_out_fee_pct = excluded.sell_out_fee_pct,
+                sell_out_fee_bgn = excluded.sell_out_fee_bgn,
+                marketing_spend_bgn = excluded.marketing_spend_bgn,
+                notes = excluded.notes
+        """, (pharmacy, month, sell_in_discount_pct, sell_out_fee_pct, sell_out_fee_bgn, marketing_spend_bgn, notes))
+
+#listing
+
+def count_terms(pharmacy: Optional[str] = None, month_from: Optional[str] = None,
+                month_to: Optional[str] = None) -> int:
+    conditions, params = _filters(pharmacy, month_from, month_to)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    conn = db.get_connection()
+    return conn.execute(f"SELECT COUNT(*) FROM pharmacy_terms {where}", params).fetchone()[0]
+
+def get_terms_page(pharmacy: Optional[str] = None, month_from: Optional[str] = None, month_to: Optional[str] = None,
+                   after: Optional[Tuple[str, str]] = None, limit: int = PAGE_SIZE) -> pd.DataFrame:
+    """One page of terms, newest month first, then by pharmacy.
+
+    ``after`` is the (month, pharmacy_name) of the last row of the previous
+    page; (pharmacy_name, month) is unique, so the keyset is exact.
+    """
+    conditions, params = _filters(pharmacy, month_from, month_to)
+    if after is not None:
+        # written so the month index is seeked and only each month's rows are sorted
+        conditions.append("month <= ? AND (month < ? OR pharmacy_name > ?)")
+        params += [after[0], after[0], after[1]]
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    conn = db.get_connection()
+    return pd.read_sql_query(f"""
+        SELECT id, pharmacy_name, month, {', '.join(TERM_FIELDS)}
+        FROM pharmacy_terms {where}
+        ORDER BY month DESC, pharmacy_name
+        LIMIT ?
+    """, conn, params=params + [limit])
+
+#batched edits
+
+def apply_term_changes(updates: List[Dict], deleted_ids: List[int]):
+    """Write edited rows (dicts with id and TERM_FIELDS) and delete rows, in one transaction."""
+    with db.transaction() as conn:
+        conn.executemany(
+            f"UPDATE pharmacy_terms SET {', '.join(f'{field} = ?' for field in TERM_FIELDS)} WHERE id = ?",
+            [[row[field] for field in TERM_FIELDS] + [row["id"]] for row in updates]
+        )
+        conn.executemany("DELETE FROM pharmacy_terms WHERE id = ?", [(i,) for i in deleted_ids])
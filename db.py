@@ -0,0 +1,228 @@
+import functools
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+import migrations
+import profiling
+
+PHARMACY_DB = os.environ.get("SLPUB_PHARMACY_DB", "pharmacy.db")
+INVOICE_DB = os.environ.get("SLPUB_INVOICE_DB", "invoice_tracking.db")
+
+BUSY_TIMEOUT_MS = 5000
+STATEMENT_CACHE_SIZE = 256
+MAX_IDLE_CONNECTIONS = 8
+
+# Streamlit runs every script run in its own thread, so a connection is leased
+# to the current thread for the whole run and goes back to the pool at
+# release(), which the Home.py router calls when the run ends (or, failing
+# that, when the thread finishes). The next rerun picks it up again (and its
+# statement cache).
+_pools = {}
+_pools_lock = threading.Lock()
+_local = threading.local()
+
+# schema migrations run once per database per process, on the first connection
+_migrated = set()
+_migrate_lock = threading.Lock()
+
+
+def _migrations_for(path: str):
+    return {
+        PHARMACY_DB: migrations.PHARMACY_MIGRATIONS,
+        INVOICE_DB: migrations.INVOICE_MIGRATIONS,
+    }.get(path)
+
+
+# Data versions for the read-through cache. A database's version moves on
+# every commit made through this process and whenever a connection's
+# PRAGMA data_version shows a commit from another connection or process.
+_versions = {}
+_versions_lock = threading.Lock()
+
+
+def _bump(path: str):
+    with _versions_lock:
+        _versions[path] = _versions.get(path, 0) + 1
+
+
+class _Connection(sqlite3.Connection):
+    path = None
+    last_data_version = None
+    savepoints = 0
+
+    def commit(self):
+        wrote = self.in_transaction
+        super().commit()
+        if wrote:
+            _bump(self.path)
+
+
+class _ProfiledConnection(_Connection):
+    # Connection.execute does not go through cursor(), so route it explicitly
+    def cursor(self, factory=None):
+        return super().cursor(factory or profiling.TimedCursor)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+def _configure(conn: sqlite3.Connection):
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+    conn.execute("PRAGMA synchronous = NORMAL")
+
+
+def _open(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(
+        path,
+        timeout=BUSY_TIMEOUT_MS / 1000,
+        check_same_thread=False,
+        cached_statements=STATEMENT_CACHE_SIZE,
+        factory=_ProfiledConnection if profiling.ENABLED else _Connection,
+    )
+    conn.path = path
+    if profiling.ENABLED:
+        conn.set_trace_callback(profiling.trace_statement)
+    _configure(conn)
+    with _migrate_lock:
+        if path not in _migrated:
+            steps = _migrations_for(path)
+            if steps:
+                migrations.migrate(conn, steps)
+            _migrated.add(path)
+    return conn
+
+
+def _pool(path: str) -> queue.LifoQueue:
+    with _pools_lock:
+        return _pools.setdefault(path, queue.LifoQueue())
+
+
+def _checkout(path: str) -> sqlite3.Connection:
+    try:
+        return _pool(path).get_nowait()
+    except queue.Empty:
+        return _open(path)
+
+
+def _checkin(path: str, conn: sqlite3.Connection):
+    try:
+        if conn.in_transaction:
+            conn.rollback()
+    except sqlite3.Error:
+        conn.close()
+        return
+    pool = _pool(path)
+    if pool.qsize() >= MAX_IDLE_CONNECTIONS:
+        conn.close()
+    else:
+        pool.put(conn)
+
+
+class _Lease:
+    def __init__(self, path: str):
+        self.path = path
+        self.conn = _checkout(path)
+
+    def release(self):
+        if self.conn is not None:
+            conn, self.conn = self.conn, None
+            _checkin(self.path, conn)
+
+    def __del__(self):
+        self.release()
+
+
+def get_connection(path: str = None) -> sqlite3.Connection:
+    path = path or PHARMACY_DB
+    leases = getattr(_local, "leases", None)
+    if leases is None:
+        leases = _local.leases = {}
+    if path not in leases:
+        leases[path] = _Lease(path)
+    return leases[path].conn
+
+
+def release():
+    """Return the current thread's connections to the pool; the next get_connection() leases again."""
+    leases = getattr(_local, "leases", None)
+    _local.leases = None
+    for lease in (leases or {}).values():
+        lease.release()
+
+
+@contextmanager
+def transaction(path: str = None, immediate: bool = False):
+    """Commit on success, roll back on error.
+
+    Inside another transaction on the same connection this is a savepoint, so
+    only the inner block is undone on error and the outer one commits it.
+    ``immediate`` takes the write lock up front (BEGIN IMMEDIATE); it has no
+    effect when nested.
+    """
+    conn = get_connection(path)
+    if conn.in_transaction:
+        conn.savepoints += 1
+        name = f"nested_{conn.savepoints}"
+        conn.execute(f"SAVEPOINT {name}")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute(f"ROLLBACK TO {name}")
+            raise
+        finally:
+            conn.execute(f"RELEASE {name}")
+            conn.savepoints -= 1
+        return
+
+    # begin explicitly, so a nested transaction() sees this one even before
+    # its first statement
+    conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+    try:
+        yield conn
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
+
+
+def data_version(path: str = None) -> int:
+    path = path or PHARMACY_DB
+    conn = get_connection(path)
+    current = conn.execute("PRAGMA data_version").fetchone()[0]
+    if current != conn.last_data_version:
+        # a connection seen for the first time has no baseline, so it
+        # invalidates too rather than risk serving data cached before it opened
+        conn.last_data_version = current
+        _bump(path)
+    return _versions.get(path, 0)
+
+
+def cached(path: str = None):
+    """Read-through cache for small reference lookups, invalidated by data_version().
+
+    Results are shared by all sessions of the process and must be treated as
+    read-only by callers.
+    """
+    def decorator(fn):
+        entries = {}
+
+        @functools.wraps(fn)
+        def wrapper(*args):
+            version = data_version(path)
+            hit = entries.get(args)
+            if hit is not None and hit[0] == version:
+                return hit[1]
+            value = fn(*args)
+            entries[args] = (version, value)
+            return value
+
+        wrapper.cache_clear = entries.clear
+        return wrapper
+    return decorator
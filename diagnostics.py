@@ -0,0 +1,63 @@
+import streamlit as st
+import pandas as pd
+import profiling
+
+st.set_page_config(page_title="Diagnostics", layout="wide", initial_sidebar_state="collapsed")
+st.title("🩺 Diagnostics")
+
+if not profiling.ENABLED:
+    st.info("Profiling is off. Start the app with SLPUB_PROFILE=1 to record query and rerun timings.")
+    st.stop()
+
+runs = pd.DataFrame(profiling.runs(), columns=["run_id", "page", "ms", "queries", "statements", "at"])
+queries = pd.DataFrame(profiling.queries(), columns=["run_id", "page", "sql", "ms", "rows", "site", "at"])
+
+col1, col2, col3 = st.columns([1, 1, 4])
+col1.metric("Runs recorded", len(runs))
+col2.metric("Queries recorded", len(queries))
+if col3.button("🧹 Clear samples"):
+    profiling.clear()
+    st.rerun()
+
+
+st.subheader("⏱️ Rerun time per page")
+if not runs.empty:
+    per_page = runs.groupby("page").agg(
+        runs=("ms", "size"),
+        p50_ms=("ms", "median"),
+        p95_ms=("ms", lambda ms: ms.quantile(0.95)),
+        max_ms=("ms", "max"),
+        queries_per_run=("queries", "mean"),
+        statements_per_run=("statements", "mean"),
+    ).sort_values("p95_ms", ascending=False)
+    st.dataframe(per_page.round(1), use_container_width=True)
+else:
+    st.info("No page runs recorded yet.")
+
+
+st.subheader("🐢 Slowest queries")
+if not queries.empty:
+    by_statement = queries.groupby(["sql", "site"]).agg(
+        calls=("ms", "size"),
+        total_ms=("ms", "sum"),
+        p95_ms=("ms", lambda ms: ms.quantile(0.95)),
+        max_ms=("ms", "max"),
+        avg_rows=("rows", "mean"),
+        pages=("page", lambda pages: ", ".join(sorted(pages.dropna().unique()))),
+    ).sort_values("total_ms", ascending=False).reset_index()
+    st.dataframe(by_statement.head(50).round(2), use_container_width=True, hide_index=True)
+
+    st.subheader("🔁 N+1 suspects")
+    st.caption(f"The same statement from the same call site {profiling.N_PLUS_ONE_REPEATS}+ times in one run.")
+    per_run = queries.dropna(subset=["run_id"]).groupby(["run_id", "page", "sql", "site"]).size().rename("repeats")
+    suspects = per_run[per_run >= profiling.N_PLUS_ONE_REPEATS].reset_index()
+    if not suspects.empty:
+        st.dataframe(
+            suspects.groupby(["page", "sql", "site"]).agg(runs=("run_id", "nunique"), max_repeats=("repeats", "max"))
+            .sort_values("max_repeats", ascending=False).reset_index(),
+            use_container_width=True, hide_index=True,
+        )
+    else:
+        st.success("No repeated statements found.")
+else:
+    st.info("No queries recorded yet.")
@@ -0,0 +1,128 @@
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from crud_invoices import STATUSES
+
+NOT_MAPPED = "Not mapped"
+
+# field -> column holding it in the uploaded file (or NOT_MAPPED)
+FIELDS = ["invoice_number", "company", "invoice_date", "received_date", "amount", "due_date", "paid_date", "status"]
+REQUIRED = ["invoice_number", "company", "invoice_date", "amount", "due_date"]
+LABELS = {
+    "invoice_number": "Invoice Number",
+    "company": "Company",
+    "invoice_date": "Invoice Date",
+    "received_date": "Date Received",
+    "amount": "Amount (BGN)",
+    "due_date": "Due Date",
+    "paid_date": "Date Paid",
+    "status": "Status",
+}
+
+DATE_FORMATS = {
+    "Auto": None,
+    "YYYY-MM-DD": "%Y-%m-%d",
+    "DD.MM.YYYY": "%d.%m.%Y",
+    "DD/MM/YYYY": "%d/%m/%Y",
+    "MM/DD/YYYY": "%m/%d/%Y",
+}
+
+def guess_mapping(header: List[str]) -> Dict[str, str]:
+    """Map each field to the column whose name matches it or its label, ignoring case and separators."""
+    normalize = lambda name: "".join(ch for ch in str(name).lower() if ch.isalnum())
+    by_name = {normalize(col): col for col in header}
+    mapping = {}
+    for field in FIELDS:
+        for candidate in (field, LABELS[field], LABELS[field].split(" (")[0]):
+            if normalize(candidate) in by_name:
+                mapping[field] = by_name[normalize(candidate)]
+                break
+        else:
+            mapping[field] = NOT_MAPPED
+    return mapping
+
+
+def _text(col: pd.Series) -> pd.Series:
+    # numeric invoice numbers come back as floats when the column has blanks
+    if pd.api.types.is_float_dtype(col) and (col.dropna() % 1 == 0).all():
+        col = col.astype("Int64")
+    return col.astype("string").str.strip().fillna("")
+
+
+def _dates(col: pd.Series, date_format: Optional[str]) -> pd.Series:
+    if pd.api.types.is_datetime64_any_dtype(col):
+        return col
+    return pd.to_datetime(col, format=date_format, errors="coerce")
+
+
+def _amounts(col: pd.Series) -> pd.Series:
+    if not pd.api.types.is_numeric_dtype(col):
+        col = col.astype("string").str.replace(r"\s", "", regex=True).str.replace(",", ".", regex=False)
+    return pd.to_numeric(col, errors="coerce")
+
+
+def prepare(df: pd.DataFrame, mapping: Dict[str, str], date_format: Optional[str] = None,
+            month: Optional[str] = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Validate an accounting export column-wise.
+
+    Returns (valid, rejected). ``valid`` has the invoice columns (company by name), one row per
+    (invoice_number, company) with the last occurrence in the file winning.
+    ``rejected`` holds the offending source rows with an ``error`` column.
+    When ``month`` is given only invoices dated in that month are accepted.
+    """
+    get = lambda field: df[mapping[field]] if mapping.get(field, NOT_MAPPED) != NOT_MAPPED else None
+    errors = pd.Series("", index=df.index)
+
+    def reject(mask, reason):
+        errors[mask] += reason + "; "
+
+    missing = [LABELS[field] for field in REQUIRED if get(field) is None]
+    if missing:
+        raise ValueError(f"Map a column for: {', '.join(missing)}")
+
+    invoice_number = _text(get("invoice_number"))
+    company = _text(get("company"))
+    invoice_date = _dates(get("invoice_date"), date_format)
+    received_date = _dates(get("received_date"), date_format) if get("received_date") is not None else invoice_date
+    due_date = _dates(get("due_date"), date_format)
+    paid_date = _dates(get("paid_date"), date_format) if get("paid_date") is not None else pd.Series(pd.NaT, index=df.index)
+    amount = _amounts(get("amount"))
+
+    if get("status") is not None:
+        canonical = {status.lower(): status for status in STATUSES}
+        raw_status = _text(get("status"))
+        status = raw_status.str.lower().map(canonical)
+        status[raw_status == ""] = "Unpaid"
+        reject(status.isna(), "unknown status")
+    else:
+        status = pd.Series("Unpaid", index=df.index)
+
+    reject(invoice_number == "", "missing invoice number")
+    reject(company == "", "missing company")
+    reject(invoice_date.isna(), "bad invoice date")
+    reject(received_date.isna() & invoice_date.notna(), "bad received date")
+    reject(due_date.isna(), "bad due date")
+    reject(amount.isna(), "bad amount")
+    reject(amount < 0, "negative amount")
+    reject((status == "Paid") & paid_date.isna(), "paid without payment date")
+    invoice_month = invoice_date.dt.strftime("%Y-%m")
+    if month is not None:
+        reject(invoice_date.notna() & (invoice_month != month), f"not dated in {month}")
+
+    valid = pd.DataFrame({
+        "month": invoice_month,
+        "invoice_number": invoice_number,
+        "invoice_date": invoice_date.dt.strftime("%Y-%m-%d"),
+        "received_date": received_date.dt.strftime("%Y-%m-%d"),
+        "company": company,
+        "amount": amount,
+        "due_date": due_date.dt.strftime("%Y-%m-%d"),
+        "paid_date": paid_date.dt.strftime("%Y-%m-%d"),
+        "status": status,
+    })
+    ok = errors == ""
+    valid = valid[ok].drop_duplicates(["invoice_number", "company"], keep="last").reset_index(drop=True)
+    valid["paid_date"] = valid["paid_date"].astype(object).where(valid["paid_date"].notna(), None)
+    rejected = df[~ok].assign(error=errors[~ok].str.rstrip("; "))
+    return valid, rejected
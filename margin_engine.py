@@ -0,0 +1,124 @@
+import tempfile
+from typing import Dict, IO, Optional, Tuple
+
+import pandas as pd
+
+import pricing
+
+NOT_INCLUDED = "Not included"
+
+# field -> column holding it in the uploaded file (or NOT_INCLUDED)
+FIELDS = ["product", "production", "selling", "packaging", "delivery", "marketing", "platform"]
+
+RESULT_COLUMNS = [
+    "Product",
+    "Selling Price",
+    "Total Cost",
+    "Net Profit",
+    "Profit Margin (%)",
+    "Max Marketing Budget (2x ROAS)",
+    "Max Marketing Budget (3x ROAS)",
+]
+AVERAGE_COLUMNS = RESULT_COLUMNS[1:]
+
+CHUNK_ROWS = 200_000
+SPOOL_MAX_BYTES = 16 * 1024 * 1024
+PREVIEW_ROWS = 1_000
+
+
+def mapped_columns(mapping: Dict[str, str]):
+    return sorted({col for col in mapping.values() if col != NOT_INCLUDED})
+
+
+def _column(df: pd.DataFrame, mapping: Dict[str, str], field: str, default):
+    col = mapping.get(field, NOT_INCLUDED)
+    return df[col] if col != NOT_INCLUDED else default
+
+
+def compute_margins(df: pd.DataFrame, mapping: Dict[str, str]) -> pd.DataFrame:
+    result_df = pd.DataFrame(index=df.index)
+
+    result_df["Product"] = _column(df, mapping, "product", "Unnamed Product")
+    result_df["Selling Price"] = _column(df, mapping, "selling", 0.0)
+
+    production = _column(df, mapping, "production", 0.0)
+    packaging = _column(df, mapping, "packaging", 0.0)
+    delivery = _column(df, mapping, "delivery", 0.0)
+    marketing = _column(df, mapping, "marketing", 0.0)
+    platform_fee = _column(df, mapping, "platform", 0.0)
+
+    result_df["Total Cost"] = pricing.total_cost(
+        result_df["Selling Price"], production, packaging, delivery, marketing, platform_fee
+    )
+
+    result_df["Net Profit"] = result_df["Selling Price"] - result_df["Total Cost"]
+    result_df["Profit Margin (%)"] = pricing.margin_pct(result_df["Net Profit"], result_df["Selling Price"]).round(2)
+
+    result_df["Max Marketing Budget (2x ROAS)"] = pricing.roas_budget(result_df["Net Profit"], 2).round(2)
+    result_df["Max Marketing Budget (3x ROAS)"] = pricing.roas_budget(result_df["Net Profit"], 3).round(2)
+    return result_df
+
+
+def average_row(result_df: pd.DataFrame) -> Dict:
+    row = {"Product": "Average"}
+    row.update({col: result_df[col].mean() for col in AVERAGE_COLUMNS})
+    return row
+
+
+class RunningAverages:
+    """Column means accumulated chunk by chunk (NaN skipped, like Series.mean)."""
+
+    def __init__(self):
+        self.sums = dict.fromkeys(AVERAGE_COLUMNS, 0.0)
+        self.counts = dict.fromkeys(AVERAGE_COLUMNS, 0)
+
+    def update(self, result_df: pd.DataFrame):
+        for col in AVERAGE_COLUMNS:
+            values = pd.to_numeric(result_df[col], errors="coerce")
+            self.sums[col] += float(values.sum())
+            self.counts[col] += int(values.count())
+
+    def row(self) -> Dict:
+        row = {"Product": "Average"}
+        for col in AVERAGE_COLUMNS:
+            row[col] = self.sums[col] / self.counts[col] if self.counts[col] else float("nan")
+        return row
+
+
+def stream_margins(
+    source,
+    mapping: Dict[str, str],
+    chunksize: int = CHUNK_ROWS,
+    preview_rows: int = PREVIEW_ROWS,
+) -> Tuple[IO[bytes], pd.DataFrame, Dict, int]:
+    """Compute margins for a CSV without holding it in memory.
+
+    Only the mapped columns are read, ``chunksize`` rows at a time. Results are
+    written as CSV to a spooled temp file (in memory up to SPOOL_MAX_BYTES, then
+    on disk). Returns the rewound file, the first ``preview_rows`` result rows,
+    the average row and the number of data rows processed.
+    """
+    usecols = mapped_columns(mapping)
+    out = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES, mode="w+b")
+    averages = RunningAverages()
+    preview: Optional[pd.DataFrame] = None
+    rows = 0
+
+    reader = pd.read_csv(source, usecols=usecols or None, chunksize=chunksize)
+    for chunk in reader:
+        result_df = compute_margins(chunk, mapping)
+        averages.update(result_df)
+        out.write(result_df.to_csv(index=False, header=rows == 0, columns=RESULT_COLUMNS).encode("utf-8"))
+        if preview is None or len(preview) < preview_rows:
+            head = result_df.head(preview_rows - (0 if preview is None else len(preview)))
+            preview = head if preview is None else pd.concat([preview, head], ignore_index=True)
+        rows += len(result_df)
+
+    if rows == 0:
+        out.write((",".join(RESULT_COLUMNS) + "\n").encode("utf-8"))
+        preview = pd.DataFrame(columns=RESULT_COLUMNS)
+
+    summary = averages.row()
+    out.write(pd.DataFrame([summary], columns=RESULT_COLUMNS).to_csv(index=False, header=False).encode("utf-8"))
+    out.seek(0)
+    return out, preview.reset_index(drop=True), summary, rows
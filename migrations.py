@@ -0,0 +1,411 @@
+import sqlite3
+from typing import List, Sequence
+
+# Each entry is one schema version: migration N brings PRAGMA user_version from
+# N-1 to N. Append new migrations, never edit ones that have shipped.
+
+# P&L cube. pnl_cube holds the per-unit economics of every product in play for
+# a pharmacy in a month (it has a priority payout there or is attached to one
+# of the pharmacy's assigned activities). Triggers on the input tables only
+# record the affected (month, pharmacy_name) pairs in pnl_dirty; crud_pnl
+# rebuilds those pairs. ``select`` yields (month, pharmacy_name) for {row}.
+
+_PNL_BY_NAME = "SELECT {row}.month, {row}.pharmacy_name"
+_PNL_BY_PHARMACY = "SELECT {row}.month, name FROM pharmacies WHERE id = {row}.pharmacy_id"
+_PNL_BY_ASSIGNMENT = """SELECT aa.month, p.name FROM assigned_activities aa
+            JOIN pharmacies p ON p.id = aa.pharmacy_id WHERE aa.id = {row}.activity_id"""
+_PNL_PRODUCT_COSTS = ["production_cost", "packaging_cost", "delivery_cost", "platform_fee_pct", "list_price"]
+
+
+def _pnl_mark(select: str) -> str:
+    # an upsert, not INSERT OR IGNORE: an upsert firing the trigger would override OR IGNORE
+    return f"INSERT INTO pnl_dirty (month, pharmacy_name) SELECT * FROM ({select}) WHERE true ON CONFLICT DO NOTHING;"
+
+
+def _pnl_triggers(table: str, select: str) -> List[str]:
+    mark = lambda row: _pnl_mark(select.format(row=row))
+    return [
+        f"CREATE TRIGGER trg_{table}_pnl_insert AFTER INSERT ON {table} BEGIN {mark('NEW')} END",
+        f"CREATE TRIGGER trg_{table}_pnl_delete AFTER DELETE ON {table} BEGIN {mark('OLD')} END",
+        f"CREATE TRIGGER trg_{table}_pnl_update AFTER UPDATE ON {table} BEGIN {mark('OLD')} {mark('NEW')} END",
+    ]
+
+
+def _pnl_reference_triggers() -> List[str]:
+    cost_changed = " OR ".join(f"OLD.{col} IS NOT NEW.{col}" for col in _PNL_PRODUCT_COSTS)
+    return [
+        f"""CREATE TRIGGER trg_products_pnl_costs AFTER UPDATE OF {', '.join(_PNL_PRODUCT_COSTS)} ON products
+        WHEN {cost_changed} BEGIN
+            {_pnl_mark("SELECT month, pharmacy_name FROM pnl_cube WHERE product_id = NEW.id")}
+        END""",
+        f"""CREATE TRIGGER trg_products_pnl_rename AFTER UPDATE OF name ON products WHEN OLD.name <> NEW.name BEGIN
+            {_pnl_mark("SELECT month, pharmacy_name FROM priority_products WHERE product_name IN (OLD.name, NEW.name)")}
+        END""",
+        f"""CREATE TRIGGER trg_products_pnl_insert AFTER INSERT ON products BEGIN
+            {_pnl_mark("SELECT month, pharmacy_name FROM priority_products WHERE product_name = NEW.name")}
+        END""",
+        f"""CREATE TRIGGER trg_products_pnl_delete AFTER DELETE ON products BEGIN
+            {_pnl_mark("SELECT month, pharmacy_name FROM pnl_cube WHERE product_id = OLD.id")}
+        END""",
+        f"""CREATE TRIGGER trg_pharmacies_pnl_rename AFTER UPDATE OF name ON pharmacies WHEN OLD.name <> NEW.name BEGIN
+            {_pnl_mark("SELECT month, OLD.name FROM assigned_activities WHERE pharmacy_id = NEW.id")}
+            {_pnl_mark("SELECT month, NEW.name FROM assigned_activities WHERE pharmacy_id = NEW.id")}
+        END""",
+        f"""CREATE TRIGGER trg_pharmacies_pnl_delete AFTER DELETE ON pharmacies BEGIN
+            {_pnl_mark("SELECT month, OLD.name FROM assigned_activities WHERE pharmacy_id = OLD.id")}
+        END""",
+    ]
+
+
+PHARMACY_MIGRATIONS: List[Sequence[str]] = [
+    # 1: baseline schema
+    (
+        """CREATE TABLE IF NOT EXISTS pharmacies (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL
+        )""",
+        """CREATE TABLE IF NOT EXISTS products (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL UNIQUE,
+            division TEXT DEFAULT '',
+            production_cost REAL DEFAULT 0,
+            packaging_cost REAL DEFAULT 0,
+            delivery_cost REAL DEFAULT 0,
+            platform_fee_pct REAL DEFAULT 0,
+            notes TEXT DEFAULT ''
+        )""",
+        """CREATE TABLE IF NOT EXISTS pharmacy_terms (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            pharmacy_name TEXT NOT NULL,
+            month TEXT NOT NULL,
+            sell_in_discount_pct REAL DEFAULT 0,
+            sell_out_fee_pct REAL DEFAULT 0,
+            sell_out_fee_bgn REAL DEFAULT 0,
+            marketing_spend_bgn REAL DEFAULT 0,
+            notes TEXT DEFAULT ''
+        )""",
+        """CREATE TABLE IF NOT EXISTS priority_products (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            pharmacy_name TEXT NOT NULL,
+            product_name TEXT NOT NULL,
+            month TEXT NOT NULL,
+            priority_total REAL DEFAULT 0,
+            pharmacist_share REAL DEFAULT 0,
+            pharmacy_share REAL DEFAULT 0
+        )""",
+        """CREATE TABLE IF NOT EXISTS marketing_activities (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            pharmacy_id INTEGER NOT NULL,
+            month TEXT NOT NULL,
+            name TEXT NOT NULL,
+            notes TEXT,
+            FOREIGN KEY(pharmacy_id) REFERENCES pharmacies(id)
+        )""",
+        """CREATE TABLE IF NOT EXISTS activity_templates (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            notes TEXT
+        )""",
+        """CREATE TABLE IF NOT EXISTS assigned_activities (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            pharmacy_id INTEGER NOT NULL,
+            month TEXT NOT NULL,
+            activity_id INTEGER NOT NULL,
+            FOREIGN KEY (pharmacy_id) REFERENCES pharmacies(id),
+            FOREIGN KEY (activity_id) REFERENCES activity_templates(id)
+        )""",
+        """CREATE TABLE IF NOT EXISTS activity_attached_products (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            activity_id INTEGER NOT NULL,
+            product_id INTEGER NOT NULL,
+            FOREIGN KEY (activity_id) REFERENCES assigned_activities(id),
+            FOREIGN KEY (product_id) REFERENCES products(id)
+        )""",
+    ),
+    # 2: indexes for the per-month lookups; duplicates are folded first so the
+    # unique indexes can be built on existing databases
+    (
+        """UPDATE activity_attached_products SET activity_id = (
+            SELECT MIN(k.id)
+            FROM assigned_activities a
+            JOIN assigned_activities k
+              ON k.pharmacy_id = a.pharmacy_id AND k.month = a.month AND k.activity_id = a.activity_id
+            WHERE a.id = activity_attached_products.activity_id
+        )
+        WHERE activity_id IN (SELECT id FROM assigned_activities)""",
+        """DELETE FROM assigned_activities WHERE id NOT IN (
+            SELECT MIN(id) FROM assigned_activities GROUP BY pharmacy_id, month, activity_id
+        )""",
+        """DELETE FROM activity_attached_products WHERE id NOT IN (
+            SELECT MIN(id) FROM activity_attached_products GROUP BY activity_id, product_id
+        )""",
+        """DELETE FROM pharmacy_terms WHERE id NOT IN (
+            SELECT MAX(id) FROM pharmacy_terms GROUP BY pharmacy_name, month
+        )""",
+        "CREATE UNIQUE INDEX idx_assigned_activities_pharmacy_month ON assigned_activities (pharmacy_id, month, activity_id)",
+        "CREATE INDEX idx_assigned_activities_month ON assigned_activities (month)",
+        "CREATE UNIQUE INDEX idx_attached_products_activity ON activity_attached_products (activity_id, product_id)",
+        "CREATE UNIQUE INDEX idx_pharmacy_terms_pharmacy_month ON pharmacy_terms (pharmacy_name, month)",
+        "CREATE INDEX idx_pharmacy_terms_month ON pharmacy_terms (month, pharmacy_name)",
+        "CREATE INDEX idx_priority_products_month ON priority_products (month, pharmacy_name)",
+    ),
+    # 3: one priority entry per pharmacy, product and month (the latest save wins)
+    (
+        """DELETE FROM priority_products WHERE id NOT IN (
+            SELECT MAX(id) FROM priority_products GROUP BY pharmacy_name, product_name, month
+        )""",
+        "CREATE UNIQUE INDEX idx_priority_products_key ON priority_products (pharmacy_name, product_name, month)",
+    ),
+    # 4: list price per product and the P&L cube; every pharmacy-month starts
+    # dirty, so the first refresh builds the cube
+    (
+        "ALTER TABLE products ADD COLUMN list_price REAL DEFAULT 0",
+        "CREATE INDEX idx_priority_products_product ON priority_products (product_name)",
+        "CREATE INDEX idx_pharmacies_name ON pharmacies (name)",
+        """CREATE TABLE pnl_cube (
+            month TEXT NOT NULL,
+            pharmacy_name TEXT NOT NULL,
+            product_id INTEGER NOT NULL,
+            list_price REAL NOT NULL,
+            net_price REAL NOT NULL,
+            unit_cost REAL NOT NULL,
+            sell_out_fee REAL NOT NULL,
+            priority_payout REAL NOT NULL,
+            unit_margin REAL NOT NULL,
+            fixed_cost_share REAL NOT NULL,
+            activities INTEGER NOT NULL,
+            PRIMARY KEY (month, pharmacy_name, product_id)
+        ) WITHOUT ROWID""",
+        "CREATE INDEX idx_pnl_cube_product ON pnl_cube (product_id, month)",
+        "CREATE INDEX idx_pnl_cube_pharmacy ON pnl_cube (pharmacy_name, month)",
+        """CREATE TABLE pnl_dirty (
+            month TEXT NOT NULL,
+            pharmacy_name TEXT NOT NULL,
+            PRIMARY KEY (month, pharmacy_name)
+        ) WITHOUT ROWID""",
+        *_pnl_triggers("pharmacy_terms", _PNL_BY_NAME),
+        *_pnl_triggers("priority_products", _PNL_BY_NAME),
+        *_pnl_triggers("assigned_activities", _PNL_BY_PHARMACY),
+        *_pnl_triggers("activity_attached_products", _PNL_BY_ASSIGNMENT),
+        *_pnl_reference_triggers(),
+        """INSERT OR IGNORE INTO pnl_dirty (month, pharmacy_name)
+        SELECT month, pharmacy_name FROM priority_products
+        UNION SELECT aa.month, p.name FROM assigned_activities aa JOIN pharmacies p ON p.id = aa.pharmacy_id""",
+    ),
+]
+
+# Accounts-payable aggregates. ap_summary holds count, amount and days-to-pay
+# per month/company/status; ap_open_items holds unpaid amounts per company and
+# due date, so "overdue as of today" is a range sum over a few groups. Both are
+# maintained by triggers on invoices. ``key`` is the column identifying the
+# company on invoices.
+
+_AP_STATUS = "COALESCE({row}.status, 'Unpaid')"
+# 0 rather than NULL when status is NULL, or the paid_count arithmetic goes NULL
+_AP_PAID = "COALESCE(({row}.status = 'Paid' AND {row}.paid_date IS NOT NULL), 0)"
+_AP_DAYS = f"CASE WHEN {_AP_PAID} THEN julianday({{row}}.paid_date) - julianday({{row}}.invoice_date) ELSE 0 END"
+
+
+def _ap_add(row: str, key: str) -> str:
+    status, paid, days = (part.format(row=row) for part in (_AP_STATUS, _AP_PAID, _AP_DAYS))
+    return f"""
+        INSERT INTO ap_summary (month, {key}, status, invoice_count, total_amount, paid_count, days_to_pay_total)
+        VALUES ({row}.month, {row}.{key}, {status}, 1, {row}.amount, {paid}, {days})
+        ON CONFLICT (month, {key}, status) DO UPDATE SET
+            invoice_count = invoice_count + 1,
+            total_amount = total_amount + excluded.total_amount,
+            paid_count = paid_count + excluded.paid_count,
+            days_to_pay_total = days_to_pay_total + excluded.days_to_pay_total;
+        INSERT INTO ap_open_items ({key}, due_date, open_count, open_amount)
+        SELECT {row}.{key}, {row}.due_date, 1, {row}.amount WHERE {status} <> 'Paid'
+        ON CONFLICT ({key}, due_date) DO UPDATE SET
+            open_count = open_count + 1,
+            open_amount = open_amount + excluded.open_amount;"""
+
+
+def _ap_remove(row: str, key: str) -> str:
+    status, paid, days = (part.format(row=row) for part in (_AP_STATUS, _AP_PAID, _AP_DAYS))
+    return f"""
+        UPDATE ap_summary SET
+            invoice_count = invoice_count - 1,
+            total_amount = total_amount - {row}.amount,
+            paid_count = paid_count - {paid},
+            days_to_pay_total = days_to_pay_total - ({days})
+        WHERE month = {row}.month AND {key} = {row}.{key} AND status = {status};
+        DELETE FROM ap_summary
+        WHERE month = {row}.month AND {key} = {row}.{key} AND status = {status} AND invoice_count <= 0;
+        UPDATE ap_open_items SET
+            open_count = open_count - 1,
+            open_amount = open_amount - {row}.amount
+        WHERE {key} = {row}.{key} AND due_date = {row}.due_date AND {status} <> 'Paid';
+        DELETE FROM ap_open_items
+        WHERE {key} = {row}.{key} AND due_date = {row}.due_date AND open_count <= 0;"""
+
+
+def _ap_triggers(key: str) -> List[str]:
+    return [
+        f"CREATE TRIGGER trg_invoices_ap_insert AFTER INSERT ON invoices BEGIN {_ap_add('NEW', key)} END",
+        f"CREATE TRIGGER trg_invoices_ap_delete AFTER DELETE ON invoices BEGIN {_ap_remove('OLD', key)} END",
+        f"CREATE TRIGGER trg_invoices_ap_update AFTER UPDATE ON invoices BEGIN "
+        f"{_ap_remove('OLD', key)} {_ap_add('NEW', key)} END",
+    ]
+
+
+def _ap_backfill(key: str) -> List[str]:
+    status, paid, days = (part.format(row="invoices") for part in (_AP_STATUS, _AP_PAID, _AP_DAYS))
+    return [
+        f"""INSERT INTO ap_summary (month, {key}, status, invoice_count, total_amount, paid_count, days_to_pay_total)
+        SELECT month, {key}, {status}, COUNT(*), SUM(amount), SUM({paid}), SUM({days})
+        FROM invoices GROUP BY month, {key}, {status}""",
+        f"""INSERT INTO ap_open_items ({key}, due_date, open_count, open_amount)
+        SELECT {key}, due_date, COUNT(*), SUM(amount)
+        FROM invoices WHERE {status} <> 'Paid' GROUP BY {key}, due_date""",
+    ]
+
+
+def ap_drift(conn: sqlite3.Connection, key: str = "counterparty_id") -> List[tuple]:
+    """Aggregate rows that differ from a full rebuild from invoices; empty when the triggers are exact."""
+    status, paid, days = (part.format(row="invoices") for part in (_AP_STATUS, _AP_PAID, _AP_DAYS))
+    summary = f"""
+        SELECT 'ap_summary', month, {key}, status, invoice_count, ROUND(total_amount, 4), paid_count,
+               ROUND(days_to_pay_total, 4) FROM ap_summary"""
+    summary_rebuilt = f"""
+        SELECT 'ap_summary', month, {key}, {status}, COUNT(*), ROUND(SUM(amount), 4), SUM({paid}),
+               ROUND(SUM({days}), 4) FROM invoices GROUP BY month, {key}, {status}"""
+    open_items = f"""
+        SELECT 'ap_open_items', {key}, due_date, NULL, open_count, ROUND(open_amount, 4), NULL, NULL
+        FROM ap_open_items"""
+    open_items_rebuilt = f"""
+        SELECT 'ap_open_items', {key}, due_date, NULL, COUNT(*), ROUND(SUM(amount), 4), NULL, NULL
+        FROM invoices WHERE {status} <> 'Paid' GROUP BY {key}, due_date"""
+    drift = []
+    for stored, rebuilt in ((summary, summary_rebuilt), (open_items, open_items_rebuilt)):
+        drift += conn.execute(f"{stored} EXCEPT {rebuilt}").fetchall()
+        drift += conn.execute(f"{rebuilt} EXCEPT {stored}").fetchall()
+    return drift
+
+
+INVOICE_MIGRATIONS: List[Sequence[str]] = [
+    # 1: baseline schema
+    (
+        """CREATE TABLE IF NOT EXISTS invoices (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            month TEXT NOT NULL,
+            invoice_number TEXT NOT NULL,
+            invoice_date TEXT NOT NULL,
+            received_date TEXT NOT NULL,
+            company TEXT NOT NULL,
+            amount REAL NOT NULL,
+            due_date TEXT NOT NULL,
+            paid_date TEXT,
+            status TEXT DEFAULT 'Unpaid'
+        )""",
+        """CREATE TABLE IF NOT EXISTS counterparties (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT UNIQUE NOT NULL
+        )""",
+    ),
+    # 2: month listing in date order
+    (
+        "CREATE INDEX idx_invoices_month_date ON invoices (month, invoice_date)",
+    ),
+    # 3: accounts-payable aggregates kept current by triggers
+    (
+        """CREATE TABLE ap_summary (
+            month TEXT NOT NULL,
+            company TEXT NOT NULL,
+            status TEXT NOT NULL,
+            invoice_count INTEGER NOT NULL DEFAULT 0,
+            total_amount REAL NOT NULL DEFAULT 0,
+            paid_count INTEGER NOT NULL DEFAULT 0,
+            days_to_pay_total REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (month, company, status)
+        ) WITHOUT ROWID""",
+        """CREATE TABLE ap_open_items (
+            company TEXT NOT NULL,
+            due_date TEXT NOT NULL,
+            open_count INTEGER NOT NULL DEFAULT 0,
+            open_amount REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (company, due_date)
+        ) WITHOUT ROWID""",
+        *_ap_backfill("company"),
+        *_ap_triggers("company"),
+    ),
+    # 4: invoices reference counterparties by id instead of by name; the AP
+    # aggregates are rebuilt on the new key
+    (
+        "INSERT OR IGNORE INTO counterparties (name) SELECT DISTINCT company FROM invoices",
+        "DROP TRIGGER trg_invoices_ap_insert",
+        "DROP TRIGGER trg_invoices_ap_delete",
+        "DROP TRIGGER trg_invoices_ap_update",
+        "DROP TABLE ap_summary",
+        "DROP TABLE ap_open_items",
+        """CREATE TABLE invoices_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            month TEXT NOT NULL,
+            invoice_number TEXT NOT NULL,
+            invoice_date TEXT NOT NULL,
+            received_date TEXT NOT NULL,
+            counterparty_id INTEGER NOT NULL REFERENCES counterparties(id),
+            amount REAL NOT NULL,
+            due_date TEXT NOT NULL,
+            paid_date TEXT,
+            status TEXT DEFAULT 'Unpaid'
+        )""",
+        """INSERT INTO invoices_new (
+            id, month, invoice_number, invoice_date, received_date,
+            counterparty_id, amount, due_date, paid_date, status
+        )
+        SELECT i.id, i.month, i.invoice_number, i.invoice_date, i.received_date,
+               c.id, i.amount, i.due_date, i.paid_date, i.status
+        FROM invoices i JOIN counterparties c ON c.name = i.company""",
+        "DROP TABLE invoices",
+        "ALTER TABLE invoices_new RENAME TO invoices",
+        "CREATE INDEX idx_invoices_month_date ON invoices (month, invoice_date)",
+        "CREATE INDEX idx_invoices_counterparty ON invoices (counterparty_id, month)",
+        """CREATE TABLE ap_summary (
+            month TEXT NOT NULL,
+            counterparty_id INTEGER NOT NULL,
+            status TEXT NOT NULL,
+            invoice_count INTEGER NOT NULL DEFAULT 0,
+            total_amount REAL NOT NULL DEFAULT 0,
+            paid_count INTEGER NOT NULL DEFAULT 0,
+            days_to_pay_total REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (month, counterparty_id, status)
+        ) WITHOUT ROWID""",
+        """CREATE TABLE ap_open_items (
+            counterparty_id INTEGER NOT NULL,
+            due_date TEXT NOT NULL,
+            open_count INTEGER NOT NULL DEFAULT 0,
+            open_amount REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (counterparty_id, due_date)
+        ) WITHOUT ROWID""",
+        *_ap_backfill("counterparty_id"),
+        *_ap_triggers("counterparty_id"),
+    ),
+    # 5: invoice number lookups for the bulk import upsert
+    (
+        "CREATE INDEX idx_invoices_counterparty_number ON invoices (counterparty_id, invoice_number)",
+    ),
+]
+
+
+def migrate(conn: sqlite3.Connection, migrations: List[Sequence[str]]) -> int:
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version >= len(migrations):
+        return version
+
+    # take the write lock before re-reading the version so concurrent workers
+    # starting at the same time apply each migration exactly once
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        for number in range(version + 1, len(migrations) + 1):
+            for statement in migrations[number - 1]:
+                conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {number}")
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
+    return len(migrations)
@@ -0,0 +1,89 @@
+import importlib
+import os
+import threading
+import time
+from typing import Dict
+
+# Optional warm start (SLPUB_PRELOAD=1). The first script run of a fresh
+# server process starts warm() in the background, so the heavy imports,
+# database migrations, shared lookup caches and the P&L cube refresh are
+# done before the first user opens the page that needs them.
+# `python -m preload` runs the same steps at deploy time, which also
+# compiles the bytecode and migrates the databases ahead of the first
+# request.
+
+ENABLED = os.environ.get("SLPUB_PRELOAD") == "1"
+
+# imported lazily or by a single page, so a cold page hit would pay for them
+MODULES = ["openpyxl", "fpdf", "reportlab.platypus", "st_aggrid"]
+
+_started = False
+_lock = threading.Lock()
+
+
+def warm() -> Dict[str, float]:
+    """Import the heavy modules, open both databases and fill the cached lookups; ms per step.
+
+    Warming is best effort: a step that fails is skipped (None) and the page
+    that needs it pays for it on first use, as without preloading.
+    """
+    # imported here: Home imports this module on every run, preloading or not
+    import crud_activities
+    import crud_invoices
+    import crud_marketing
+    import crud_pnl
+    import crud_products
+    import db
+    import price_matrix
+
+    steps = [(f"import {name}", lambda name=name: importlib.import_module(name)) for name in MODULES]
+    steps += [
+        ("open pharmacy db", lambda: db.get_connection(db.PHARMACY_DB)),
+        ("open invoice db", lambda: db.get_connection(db.INVOICE_DB)),
+        ("pharmacies", crud_marketing.get_all_pharmacies),
+        ("activity templates", crud_activities.get_all_activity_templates),
+        ("products", crud_products.get_all_products),
+        ("counterparties", crud_invoices.get_counterparties),
+        ("pnl cube", crud_pnl.refresh),
+        ("price matrix catalog", price_matrix.load_catalog),
+    ]
+    timings = {}
+    try:
+        for name, step in steps:
+            start = time.perf_counter()
+            try:
+                step()
+            except Exception:
+                timings[name] = None
+                continue
+            timings[name] = (time.perf_counter() - start) * 1000
+    finally:
+        db.release()
+    return timings
+
+
+def start():
+    """Run warm() once per process in a background thread; the st.navigation router
+    in Home calls it on every run."""
+    global _started
+    if not ENABLED:
+        return
+    with _lock:
+        if _started:
+            return
+        _started = True
+
+    from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+    # warm() returns the thread's connections to the pool when it is done
+    thread = threading.Thread(target=warm, name="preload", daemon=True)
+    add_script_run_ctx(thread, get_script_run_ctx())
+    thread.start()
+
+
+if __name__ == "__main__":
+    import compileall
+
+    compileall.compile_dir(os.path.dirname(os.path.abspath(__file__)), quiet=1)
+    for step, ms in warm().items():
+        print(f"{step:<30}" + (f"{ms:>10.1f} ms" if ms is not None else f"{'failed':>13}"))
@@ -0,0 +1,170 @@
+import io
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+import db
+import pricing
+
+# Unit economics of every catalog product under every pharmacy's terms for a
+# month: products x pharmacies float32 grids built by broadcasting the
+# product columns against the term columns. At 50k x 500 one grid is 100 MB,
+# so only the metric being ranked is computed for the whole catalog, in place
+# in a single buffer; the full breakdown is computed for the ranked cells only.
+# Products without a list price are left out.
+
+METRICS = ["net_price", "margin", "margin_pct", "max_budget"]
+VIEWS = ["cell", "product", "pharmacy"]
+
+
+#inputs
+
+@db.cached()
+def load_catalog() -> Dict[str, np.ndarray]:
+    conn = db.get_connection()
+    df = pd.read_sql_query("""
+        SELECT name, division, list_price,
+               COALESCE(production_cost, 0) AS production, COALESCE(packaging_cost, 0) AS packaging,
+               COALESCE(delivery_cost, 0) AS delivery, COALESCE(platform_fee_pct, 0) AS platform_fee_pct
+        FROM products
+        WHERE list_price > 0
+        ORDER BY name
+    """, conn)
+    catalog = {col: df[col].to_numpy(dtype=np.float32)
+               for col in ["list_price", "production", "packaging", "delivery", "platform_fee_pct"]}
+    catalog["name"] = df["name"].to_numpy(dtype=object)
+    catalog["division"] = df["division"].fillna("").to_numpy(dtype=object)
+    return catalog
+
+@db.cached()
+def load_terms(month: str) -> Dict[str, np.ndarray]:
+    conn = db.get_connection()
+    df = pd.read_sql_query("""
+        SELECT pharmacy_name, COALESCE(sell_in_discount_pct, 0) AS sell_in_discount_pct,
+               COALESCE(sell_out_fee_pct, 0) AS sell_out_fee_pct
+        FROM pharmacy_terms
+        WHERE month = ?
+        ORDER BY pharmacy_name
+    """, conn, params=(month,))
+    return {
+        "pharmacy": df["pharmacy_name"].to_numpy(dtype=object),
+        "sell_in_discount_pct": df["sell_in_discount_pct"].to_numpy(dtype=np.float32),
+        "sell_out_fee_pct": df["sell_out_fee_pct"].to_numpy(dtype=np.float32),
+    }
+
+def get_months() -> List[str]:
+    conn = db.get_connection()
+    return [row[0] for row in conn.execute("SELECT DISTINCT month FROM pharmacy_terms ORDER BY month DESC")]
+
+def subset(arrays: Dict[str, np.ndarray], mask: np.ndarray) -> Dict[str, np.ndarray]:
+    return {key: values[mask] for key, values in arrays.items()}
+
+
+#engine
+
+def grid(catalog: Dict[str, np.ndarray], terms: Dict[str, np.ndarray], metric: str, roas: float = 2.0) -> np.ndarray:
+    """One metric for every product (rows) x pharmacy (columns), float32.
+
+    Same figures as breakdown(), rearranged so each step is one in-place
+    broadcast over the grid:
+        net = list_price * keep                  keep = 1 - sell_in_discount_pct / 100
+        margin = net * (1 - platform_fee_pct / 100 - sell_out_fee_pct / 100) - base_cost
+    """
+    if metric not in METRICS:
+        raise ValueError(f"metric must be one of {METRICS}")
+    price = catalog["list_price"]
+    keep = 1 - terms["sell_in_discount_pct"] / 100
+    if metric == "net_price":
+        return np.multiply.outer(price, keep)
+
+    base_cost = catalog["production"] + catalog["packaging"] + catalog["delivery"]
+    if metric == "margin_pct":
+        # margin / net * 100 = (1 - fee - sell-out fee - base_cost / net) * 100
+        out = np.divide.outer(base_cost / price, keep)
+        np.subtract((1 - catalog["platform_fee_pct"] / 100)[:, None], out, out=out)
+        out -= (terms["sell_out_fee_pct"] / 100)[None, :]
+        out *= 100
+        return out
+
+    out = np.subtract.outer(1 - catalog["platform_fee_pct"] / 100, terms["sell_out_fee_pct"] / 100)
+    out *= price[:, None]
+    out *= keep[None, :]
+    out -= base_cost[:, None]
+    if metric == "max_budget":
+        out /= roas + 1  # pricing.roas_budget
+    return out
+
+def top(values: np.ndarray, n: int, ascending: bool = False) -> np.ndarray:
+    """Flat indices of the n largest (or smallest) values, best first."""
+    flat = values.ravel()
+    n = min(n, flat.size)
+    if n <= 0:
+        return np.empty(0, dtype=np.intp)
+    if n < flat.size:
+        # partition a float32 copy for the cut-off value; argpartition would
+        # allocate an 8-byte index for every cell of the grid
+        kth = n - 1 if ascending else flat.size - n
+        cutoff = np.partition(flat, kth)[kth]
+        picked = np.flatnonzero(flat <= cutoff if ascending else flat >= cutoff)
+    else:
+        picked = np.arange(flat.size)
+    # ties at the cut-off can add candidates, so sort before trimming to n
+    return picked[np.argsort(flat[picked] if ascending else -flat[picked], kind="stable")[:n]]
+
+def breakdown(catalog: Dict[str, np.ndarray], terms: Dict[str, np.ndarray], rows: np.ndarray, cols: np.ndarray,
+              roas: float = 2.0) -> pd.DataFrame:
+    """Full unit economics of the (product row, pharmacy column) cells picked from a grid."""
+    net_price = catalog["list_price"][rows] * (1 - terms["sell_in_discount_pct"][cols] / 100)
+    sell_out_fee = net_price * terms["sell_out_fee_pct"][cols] / 100
+    production, packaging, delivery = (catalog[col][rows] for col in ["production", "packaging", "delivery"])
+    # the sell-out fee is a per-unit cost like marketing
+    unit_cost = pricing.total_cost(net_price, production, packaging, delivery, sell_out_fee,
+                                   catalog["platform_fee_pct"][rows])
+    margin = net_price - unit_cost
+    return pd.DataFrame({
+        "product": catalog["name"][rows],
+        "division": catalog["division"][rows],
+        "pharmacy": terms["pharmacy"][cols],
+        "list_price": catalog["list_price"][rows],
+        "net_price": net_price,
+        "sell_out_fee": sell_out_fee,
+        "unit_cost": unit_cost,
+        "margin": margin,
+        "margin_pct": pricing.margin_pct(margin, net_price),
+        "max_budget": pricing.roas_budget(margin, roas),
+    })
+
+def rank(catalog: Dict[str, np.ndarray], terms: Dict[str, np.ndarray], metric: str, view: str = "cell",
+         n: int = 100, ascending: bool = False, roas: float = 2.0) -> pd.DataFrame:
+    """Top n cells, or products / pharmacies by their average, ranked on metric."""
+    if view not in VIEWS:
+        raise ValueError(f"view must be one of {VIEWS}")
+    values = grid(catalog, terms, metric, roas)
+    if view == "cell":
+        rows, cols = np.unravel_index(top(values, n, ascending), values.shape)
+        return breakdown(catalog, terms, rows, cols, roas)
+
+    axis = 1 if view == "product" else 0
+    averages = values.mean(axis=axis, dtype=np.float64)
+    picked = top(averages, n, ascending)
+    if view == "product":
+        frame = pd.DataFrame({"product": catalog["name"][picked], "division": catalog["division"][picked],
+                              "list_price": catalog["list_price"][picked]})
+    else:
+        frame = pd.DataFrame({"pharmacy": terms["pharmacy"][picked],
+                              "sell_in_discount_pct": terms["sell_in_discount_pct"][picked],
+                              "sell_out_fee_pct": terms["sell_out_fee_pct"][picked]})
+    frame[f"avg_{metric}"] = averages[picked]
+    frame[f"min_{metric}"] = values.min(axis=axis)[picked]
+    frame[f"max_{metric}"] = values.max(axis=axis)[picked]
+    return frame
+
+
+#export
+
+def to_xlsx(frame: pd.DataFrame, sheet_name: str = "Net prices") -> bytes:
+    buffer = io.BytesIO()
+    # pandas imports openpyxl here, on first export only
+    frame.to_excel(buffer, sheet_name=sheet_name, index=False, engine="openpyxl")
+    return buffer.getvalue()
@@ -0,0 +1,151 @@
+import numpy as np
+import pandas as pd
+
+# Unit economics shared by the calculator pages. Every function works on
+# scalars, NumPy arrays and pandas Series alike (plain broadcasting), so a
+# whole catalog can be priced in one call.
+
+PROMO_NONE = "None"
+PROMO_FLAT_DISCOUNT = "Flat % Discount"
+PROMO_B2G1 = "Buy 2 Get 1 Free"
+PROMO_TYPES = [PROMO_NONE, PROMO_FLAT_DISCOUNT, PROMO_B2G1]
+
+COST_FIELDS = ["production", "packaging", "delivery", "marketing", "platform_fee_pct"]
+
+
+def apply_promo(price, production, promo: str = PROMO_NONE, discount_pct=0.0):
+    """Price and production cost of one promo "basket".
+
+    A flat discount lowers the price. Buy 2 Get 1 Free sells three units for
+    the price of two, so one conversion earns 2x the price and costs 3x the
+    production (packaging and delivery stay per shipment).
+    """
+    if promo == PROMO_FLAT_DISCOUNT:
+        return price * (1 - discount_pct / 100), production
+    if promo == PROMO_B2G1:
+        return price * 2, production * 3
+    return price, production
+
+
+def platform_fee(price, platform_fee_pct=0.0):
+    return platform_fee_pct / 100 * price
+
+
+def total_cost(price, production=0.0, packaging=0.0, delivery=0.0, marketing=0.0, platform_fee_pct=0.0):
+    return production + packaging + delivery + marketing + platform_fee(price, platform_fee_pct)
+
+
+def net_profit(price, production=0.0, packaging=0.0, delivery=0.0, marketing=0.0, platform_fee_pct=0.0):
+    return price - total_cost(price, production, packaging, delivery, marketing, platform_fee_pct)
+
+
+def margin_pct(profit, price):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.divide(profit, price) * 100
+
+
+def max_marketing_spend(price, desired_profit=0.0, production=0.0, packaging=0.0, delivery=0.0, platform_fee_pct=0.0):
+    return net_profit(price, production, packaging, delivery, 0.0, platform_fee_pct) - desired_profit
+
+
+def required_price(desired_profit=0.0, production=0.0, packaging=0.0, delivery=0.0, marketing=0.0, platform_fee_pct=0.0):
+    base_cost = production + packaging + delivery + marketing
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.divide(base_cost + desired_profit, 1 - platform_fee_pct / 100)
+
+
+def break_even_conversions(campaign_budget, profit):
+    """Conversions needed to earn back the budget; inf where a conversion loses money."""
+    profit = np.asarray(profit, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = np.where(profit > 0, np.divide(campaign_budget, profit), np.inf)
+    return result[()] if result.ndim == 0 else result
+
+
+def roas_budget(profit, roas):
+    """Largest marketing spend per conversion that still returns ``roas`` x the spend in profit."""
+    return profit / (roas + 1)
+
+
+def evaluate(frame: pd.DataFrame, promo: str = PROMO_NONE, discount_pct=0.0, campaign_budget=None) -> pd.DataFrame:
+    """Batch unit economics for a frame with ``price`` and any of COST_FIELDS.
+
+    Missing cost columns count as zero. Returns the promo-adjusted price and
+    production cost with total cost, net profit, margin and, when a campaign
+    budget is given, break-even conversions.
+    """
+    get = lambda col: frame[col] if col in frame else 0.0
+    price, production = apply_promo(frame["price"], get("production"), promo, discount_pct)
+
+    result = pd.DataFrame(index=frame.index)
+    result["price"] = price
+    result["production"] = production
+    result["total_cost"] = total_cost(price, production, get("packaging"), get("delivery"),
+                                      get("marketing"), get("platform_fee_pct"))
+    result["net_profit"] = result["price"] - result["total_cost"]
+    result["margin_pct"] = margin_pct(result["net_profit"], result["price"])
+    if campaign_budget is not None:
+        result["break_even_conversions"] = break_even_conversions(campaign_budget, result["net_profit"].to_numpy())
+    return result
+
+
+def sensitivity_grid(prices, discounts_pct, marketing_costs, budgets,
+                     production=0.0, packaging=0.0, delivery=0.0, platform_fee_pct=0.0):
+    """Evaluate every price x discount x marketing cost x campaign budget combination.
+
+    The axes are broadcast against each other, so the whole grid is one NumPy
+    expression. ``net_profit`` has shape (price, discount, marketing) and
+    ``break_even`` has shape (price, discount, marketing, budget).
+    """
+    price = np.asarray(prices, dtype=float)[:, None, None]
+    discount = np.asarray(discounts_pct, dtype=float)[None, :, None]
+    marketing = np.asarray(marketing_costs, dtype=float)[None, None, :]
+    budget = np.asarray(budgets, dtype=float)[None, None, None, :]
+
+    adjusted_price, _ = apply_promo(price, production, PROMO_FLAT_DISCOUNT, discount)
+    profit = net_profit(adjusted_price, production, packaging, delivery, marketing, platform_fee_pct)
+    return {
+        "net_profit": profit,
+        "break_even": break_even_conversions(budget, profit[..., None]),
+    }
+
+
+def _triangular(rng, low, mode, high, size):
+    low, high = min(low, high), max(low, high)
+    if low == high:
+        return np.full(size, float(low))
+    return rng.triangular(low, min(max(mode, low), high), high, size)
+
+
+def simulate_roi(price, production, promo_price, promo_production, packaging, platform_fee_pct, campaign_budget,
+                 conversions, marketing, delivery, promo_uptake, draws=1_000_000, seed=0, bins=60):
+    """Monte Carlo ROI of a campaign.
+
+    ``conversions``, ``marketing`` (cost per conversion), ``delivery`` and
+    ``promo_uptake`` (share of conversions taking the promo price) are
+    (low, most likely, high) triangular distributions. All draws are evaluated
+    as arrays; only summary statistics and a histogram are returned.
+    """
+    rng = np.random.default_rng(seed)
+    n_conversions = np.rint(_triangular(rng, *conversions, draws))
+    marketing_cost = _triangular(rng, *marketing, draws)
+    delivery_cost = _triangular(rng, *delivery, draws)
+    uptake = np.clip(_triangular(rng, *promo_uptake, draws), 0.0, 1.0)
+
+    full_profit = net_profit(price, production, packaging, delivery_cost, marketing_cost, platform_fee_pct)
+    promo_profit = net_profit(promo_price, promo_production, packaging, delivery_cost, marketing_cost, platform_fee_pct)
+    profit = n_conversions * (uptake * promo_profit + (1 - uptake) * full_profit) - campaign_budget
+
+    roi = profit / campaign_budget * 100 if campaign_budget > 0 else np.zeros(draws)
+    p5, p50, p95 = np.percentile(roi, [5, 50, 95])
+    counts, edges = np.histogram(roi, bins=bins)
+    return {
+        "p5": p5,
+        "p50": p50,
+        "p95": p95,
+        "mean": roi.mean(),
+        "prob_loss": (profit < 0).mean(),
+        "profit_p50": np.median(profit),
+        "hist_counts": counts,
+        "hist_edges": edges,
+    }
@@ -0,0 +1,177 @@
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+# Opt-in query and rerun instrumentation (SLPUB_PROFILE=1). Connections from
+# db.py then time every statement through TimedCursor, and pages that call
+# track_run() record their script run time. Samples live in in-process ring
+# buffers and are shown on the Diagnostics page (diagnostics.py), which the
+# app only serves while profiling is on.
+
+ENABLED = os.environ.get("SLPUB_PROFILE") == "1"
+
+MAX_QUERIES = 20_000
+MAX_RUNS = 2_000
+# the same statement this many times in one run is reported as an N+1 pattern
+N_PLUS_ONE_REPEATS = 5
+
+_queries = deque(maxlen=MAX_QUERIES)
+_runs = deque(maxlen=MAX_RUNS)
+_lock = threading.Lock()
+_local = threading.local()
+_run_ids = iter(range(1, sys.maxsize))
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_SKIP_FILES = {os.path.abspath(__file__), os.path.join(_HERE, "db.py")}
+
+
+def normalize_sql(sql: str) -> str:
+    """Collapse whitespace, literals and IN lists so repeats of one statement compare equal."""
+    sql = re.sub(r"\s+", " ", sql).strip()
+    sql = re.sub(r"'(?:[^']|'')*'", "?", sql)
+    sql = re.sub(r"\b\d+(\.\d+)?\b", "?", sql)
+    return re.sub(r"\?(\s*,\s*\?)+", "?, ...", sql)
+
+
+def _call_site() -> str:
+    # first frame in this repo outside the instrumentation itself
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = os.path.abspath(frame.f_code.co_filename)
+        if filename.startswith(_HERE) and filename not in _SKIP_FILES:
+            return f"{os.path.relpath(filename, _HERE)}:{frame.f_lineno}"
+        frame = frame.f_back
+    return "?"
+
+
+class _Run:
+    def __init__(self, page: str):
+        self.id = next(_run_ids)
+        self.page = page
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.statements = 0
+        self.finished = False
+
+    def finish(self):
+        if self.finished:
+            return
+        self.finished = True
+        with _lock:
+            _runs.append({
+                "run_id": self.id,
+                "page": self.page,
+                "ms": (time.perf_counter() - self.started) * 1000,
+                "queries": self.queries,
+                "statements": self.statements,
+                "at": time.time(),
+            })
+
+    def __del__(self):
+        # the Home.py router calls finish_run() when the script ends; this only
+        # covers a page run on its own (AppTest.from_file on a page file)
+        self.finish()
+
+
+def track_run(page_file: str):
+    """Start timing a page script run; call at the top of the page. The run ends at finish_run()."""
+    if not ENABLED:
+        return
+    finish_run()
+    _local.run = _Run(os.path.splitext(os.path.basename(page_file))[0])
+
+
+def finish_run():
+    run = getattr(_local, "run", None)
+    if run is not None:
+        run.finish()
+        _local.run = None
+
+
+def current_run() -> Optional[_Run]:
+    return getattr(_local, "run", None)
+
+
+def trace_statement(sql: str):
+    """sqlite3 trace callback: counts every statement, including those run by triggers."""
+    run = current_run()
+    if run is not None:
+        run.statements += 1
+
+
+class TimedCursor(sqlite3.Cursor):
+    """Records latency, row count and call site of every execute."""
+
+    sample = None
+
+    def _record(self, method, sql, *args):
+        run = current_run()
+        site = _call_site()
+        start = time.perf_counter()
+        try:
+            return method(sql, *args)
+        finally:
+            self.sample = {
+                "run_id": run.id if run else None,
+                "page": run.page if run else None,
+                "sql": normalize_sql(sql),
+                "ms": (time.perf_counter() - start) * 1000,
+                "rows": max(self.rowcount, 0),
+                "site": site,
+                "at": time.time(),
+            }
+            if run is not None:
+                run.queries += 1
+            with _lock:
+                _queries.append(self.sample)
+
+    def _count(self, rows):
+        if self.sample is not None and rows:
+            self.sample["rows"] += len(rows)
+        return rows
+
+    def execute(self, sql, parameters=()):
+        return self._record(super().execute, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self._record(super().executemany, sql, seq_of_parameters)
+
+    def fetchone(self):
+        row = super().fetchone()
+        if row is not None:
+            self._count([row])
+        return row
+
+    def fetchmany(self, size=None):
+        return self._count(super().fetchmany(size if size is not None else self.arraysize))
+
+    def fetchall(self):
+        return self._count(super().fetchall())
+
+    def __next__(self):
+        row = super().__next__()
+        self._count([row])
+        return row
+
+
+#reports
+
+def queries() -> List[Dict]:
+    with _lock:
+        return list(_queries)
+
+
+def runs() -> List[Dict]:
+    with _lock:
+        return list(_runs)
+
+
+def clear():
+    with _lock:
+        _queries.clear()
+        _runs.clear()
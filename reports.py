@@ -0,0 +1,204 @@
+import io
+import multiprocessing
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional
+from xml.sax.saxutils import escape
+
+import pricing
+
+# Campaign ROI reports, rendered straight to bytes (no files on disk).
+# fpdf and reportlab are imported by the renderers: they are slow to import
+# and most reruns of the Break-even page never render a PDF.
+
+BACKEND_FPDF = "FPDF"
+BACKEND_REPORTLAB = "ReportLab"
+BACKENDS = [BACKEND_FPDF, BACKEND_REPORTLAB]
+
+MAX_WORKERS = os.cpu_count() or 1
+# as in xlsx_ingest: render workers must not fork the multi-threaded server
+MP_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn")
+
+
+def roi_summary(name: str, campaign_cost: float, unit_price: float, production_cost: float, packaging_cost: float,
+                delivery_cost: float, marketing_cost: float, platform_fee: float,
+                promo_type: str = pricing.PROMO_NONE, discount_percent: float = 0,
+                expected_conversions: Optional[int] = None) -> Dict:
+    adjusted_price, adjusted_production = pricing.apply_promo(unit_price, production_cost, promo_type, discount_percent)
+    platform_fee_cost = pricing.platform_fee(adjusted_price, platform_fee)
+    total_cost = pricing.total_cost(adjusted_price, adjusted_production, packaging_cost, delivery_cost,
+                                    marketing_cost, platform_fee)
+    net_profit = adjusted_price - total_cost
+    break_even = float(pricing.break_even_conversions(campaign_cost, net_profit))
+
+    summary = {
+        "name": name,
+        "generated_on": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "campaign_cost": campaign_cost,
+        "promo_type": promo_type,
+        "discount_percent": discount_percent,
+        "production_cost": production_cost,
+        "adjusted_production": adjusted_production,
+        "unit_price": unit_price,
+        "adjusted_price": adjusted_price,
+        "packaging_cost": packaging_cost,
+        "delivery_cost": delivery_cost,
+        "marketing_cost": marketing_cost,
+        "platform_fee": platform_fee,
+        "platform_fee_cost": platform_fee_cost,
+        "net_profit": net_profit,
+        "break_even_conversions": break_even,
+        "max_spend_conversion": campaign_cost / break_even if break_even != 0 else 0,
+        "expected_conversions": expected_conversions,
+    }
+    if expected_conversions:
+        expected_total_profit = net_profit * expected_conversions - campaign_cost
+        summary["expected_total_profit"] = expected_total_profit
+        summary["roi_percent"] = expected_total_profit / campaign_cost * 100 if campaign_cost > 0 else 0
+        summary["target_cost"] = adjusted_price - (expected_total_profit + campaign_cost) / expected_conversions
+    return summary
+
+
+def _report_lines(summary: Dict) -> List[List]:
+    """Report body as blocks of (label, value) lines, shared by both backends."""
+    blocks = [
+        [("Campaign Budget:", f"{summary['campaign_cost']:.2f} BGN"),
+         ("Promotion Type:", summary["promo_type"])],
+        [("Production Cost:", f"{summary['production_cost']:.2f} BGN => {summary['adjusted_production']:.2f} BGN"),
+         ("Selling Price:", f"{summary['unit_price']:.2f} BGN => {summary['adjusted_price']:.2f} BGN")],
+        [("Packaging:", f"{summary['packaging_cost']:.2f} BGN"),
+         ("Delivery:", f"{summary['delivery_cost']:.2f} BGN"),
+         ("Marketing:", f"{summary['marketing_cost']:.2f} BGN"),
+         ("Platform Fee:", f"{summary['platform_fee']:.2f}% => {summary['platform_fee_cost']:.2f} BGN")],
+        [("Net Profit per Conversion:", f"{summary['net_profit']:.2f} BGN"),
+         ("Break-Even Conversions:", f"{summary['break_even_conversions']:.0f}"),
+         ("Max Spend per Conversion:", f"{summary['max_spend_conversion']:.2f} BGN")],
+    ]
+    if summary["promo_type"] == pricing.PROMO_FLAT_DISCOUNT:
+        blocks[0].append(("Discount %:", f"{summary['discount_percent']}%"))
+    if summary.get("expected_conversions"):
+        blocks.append([
+            ("Forecasted Conversions:", f"{summary['expected_conversions']}"),
+            ("Forecasted Profit:", f"{summary['expected_total_profit']:.2f} BGN"),
+            ("ROI:", f"{summary['roi_percent']:.2f}%"),
+            ("Max Cost per Conversion for Goal:", f"{summary['target_cost']:.2f} BGN"),
+        ])
+    return blocks
+
+
+def roi_report_fpdf(summary: Dict) -> bytes:
+    from fpdf import FPDF
+
+    pdf = FPDF()
+    pdf.add_page()
+
+    def write_line(label, value=""):
+        # the core fonts are latin-1 only
+        text = f"{label} {value}".encode("latin-1", "replace").decode("latin-1")
+        pdf.cell(0, 10, text, ln=True)
+
+    pdf.set_title("Campaign ROI & Break-Even Report")
+    pdf.set_font("Arial", 'B', 14)
+    write_line("Campaign ROI Report")
+    if summary.get("name"):
+        write_line(summary["name"])
+    pdf.set_font("Arial", size=12)
+    write_line(f"Generated on: {summary['generated_on']}")
+
+    for block in _report_lines(summary):
+        pdf.ln(4)
+        for label, value in block:
+            write_line(label, value)
+
+    out = pdf.output(dest="S")
+    # PyFPDF returns a latin-1 str, fpdf2 returns a bytearray
+    return out.encode("latin-1") if isinstance(out, str) else bytes(out)
+
+
+def roi_report_reportlab(summaries: List[Dict]) -> bytes:
+    """One page per scenario, plus an overview table when there are several."""
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import PageBreak, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4, title="Campaign ROI & Break-Even Report")
+    styles = getSampleStyleSheet()
+    table_style = TableStyle([
+        ("GRID", (0, 0), (-1, -1), 0.25, colors.grey),
+        ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+        ("ALIGN", (1, 1), (-1, -1), "RIGHT"),
+    ])
+
+    story = []
+    if len(summaries) > 1:
+        story.append(Paragraph("Campaign ROI Overview", styles["Title"]))
+        rows = [["Scenario", "Price", "Net Profit", "Break-Even", "ROI"]]
+        for summary in summaries:
+            rows.append([
+                summary["name"],
+                f"{summary['adjusted_price']:.2f}",
+                f"{summary['net_profit']:.2f}",
+                f"{summary['break_even_conversions']:.0f}",
+                f"{summary['roi_percent']:.2f}%" if "roi_percent" in summary else "-",
+            ])
+        overview = Table(rows, repeatRows=1)
+        overview.setStyle(table_style)
+        story += [overview, PageBreak()]
+
+    for i, summary in enumerate(summaries):
+        story.append(Paragraph(f"Campaign ROI Report – {escape(summary['name'] or 'Scenario')}", styles["Title"]))
+        story.append(Paragraph(f"Generated on: {summary['generated_on']}", styles["Normal"]))
+        story.append(Spacer(1, 12))
+        rows = [["Item", "Value"]] + [list(line) for block in _report_lines(summary) for line in block]
+        table = Table(rows, colWidths=[220, 240])
+        table.setStyle(table_style)
+        story.append(table)
+        if i < len(summaries) - 1:
+            story.append(PageBreak())
+
+    doc.build(story)
+    return buffer.getvalue()
+
+
+def render(summary: Dict, backend: str = BACKEND_FPDF) -> bytes:
+    if backend == BACKEND_REPORTLAB:
+        return roi_report_reportlab([summary])
+    return roi_report_fpdf(summary)
+
+
+def _render_job(args):
+    summary, backend = args
+    return summary["name"], render(summary, backend)
+
+
+def _file_name(name: str, used: set) -> str:
+    stem = "".join(c if c.isalnum() or c in "-_" else "_" for c in name).strip("_") or "scenario"
+    candidate, n = stem, 1
+    while candidate in used:
+        n += 1
+        candidate = f"{stem}_{n}"
+    used.add(candidate)
+    return f"{candidate}.pdf"
+
+
+def render_batch_zip(summaries: List[Dict], backend: str = BACKEND_FPDF, max_workers: int = MAX_WORKERS) -> bytes:
+    """Render one PDF per scenario in a process pool and pack them into a ZIP."""
+    jobs = [(summary, backend) for summary in summaries]
+    if len(jobs) > 1 and max_workers > 1:
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(jobs)), mp_context=MP_CONTEXT) as pool:
+            rendered = list(pool.map(_render_job, jobs, chunksize=max(1, len(jobs) // (max_workers * 4))))
+    else:
+        rendered = [_render_job(job) for job in jobs]
+
+    buffer = io.BytesIO()
+    used = set()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, pdf in rendered:
+            archive.writestr(_file_name(name, used), pdf)
+    return buffer.getvalue()
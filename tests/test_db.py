@@ -0,0 +1,47 @@
+import pytest
+
+import db
+
+
+@pytest.fixture
+def path(tmp_path):
+    path = str(tmp_path / "test.db")
+    with db.transaction(path) as conn:
+        conn.execute("CREATE TABLE t (v INTEGER)")
+    yield path
+    db.release()
+
+
+def _values(path):
+    return [row[0] for row in db.get_connection(path).execute("SELECT v FROM t ORDER BY v")]
+
+
+def test_nested_transaction_is_a_savepoint(path):
+    with db.transaction(path) as conn:
+        conn.execute("INSERT INTO t VALUES (1)")
+        with pytest.raises(ValueError):
+            with db.transaction(path) as inner:
+                inner.execute("INSERT INTO t VALUES (2)")
+                raise ValueError
+        with db.transaction(path, immediate=True) as inner:
+            inner.execute("INSERT INTO t VALUES (3)")
+        assert conn.in_transaction
+    assert not conn.in_transaction
+    assert _values(path) == [1, 3]
+
+
+def test_outer_rollback_undoes_nested_transaction(path):
+    with pytest.raises(ValueError):
+        with db.transaction(path) as conn:
+            with db.transaction(path) as inner:
+                inner.execute("INSERT INTO t VALUES (1)")
+            raise ValueError
+    assert _values(path) == []
+
+
+def test_release_returns_the_connection_to_the_pool(path):
+    conn = db.get_connection(path)
+    db.release()
+    assert db.get_connection(path) is conn
+    db.release()
+    db.release()
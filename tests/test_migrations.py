@@ -0,0 +1,54 @@
+import random
+import sqlite3
+
+import migrations
+
+STATUSES = [None, "Paid", "Unpaid", "Partially Paid"]
+
+
+def _invoice_db():
+    conn = sqlite3.connect(":memory:")
+    migrations.migrate(conn, migrations.INVOICE_MIGRATIONS)
+    conn.executemany("INSERT INTO counterparties (name) VALUES (?)", [("Supplier A",), ("Supplier B",)])
+    return conn
+
+
+def _insert(conn, number, counterparty_id, status, paid_date, amount=100.0, month="2024-01"):
+    conn.execute(
+        """INSERT INTO invoices (month, invoice_number, invoice_date, received_date, counterparty_id,
+                                 amount, due_date, paid_date, status)
+        VALUES (?, ?, '2024-01-05', '2024-01-05', ?, ?, '2024-02-05', ?, ?)""",
+        (month, number, counterparty_id, amount, paid_date, status),
+    )
+
+
+def test_null_status_invoice_with_paid_date_is_writable():
+    conn = _invoice_db()
+    _insert(conn, "INV-1", 1, None, "2024-01-20")
+    conn.execute("UPDATE invoices SET amount = 150 WHERE invoice_number = 'INV-1'")
+    assert conn.execute("SELECT status, invoice_count, total_amount, paid_count FROM ap_summary").fetchall() == [
+        ("Unpaid", 1, 150.0, 0)
+    ]
+    conn.execute("DELETE FROM invoices")
+    assert conn.execute("SELECT COUNT(*) FROM ap_summary").fetchone()[0] == 0
+    assert conn.execute("SELECT COUNT(*) FROM ap_open_items").fetchone()[0] == 0
+
+
+def test_ap_triggers_match_a_full_rebuild():
+    conn = _invoice_db()
+    rng = random.Random(0)
+    for i in range(2000):
+        ids = [row[0] for row in conn.execute("SELECT id FROM invoices")]
+        status = rng.choice(STATUSES)
+        paid_date = rng.choice([None, "2024-01-20", "2024-03-01"])
+        op = rng.random()
+        if op < 0.4 or not ids:
+            _insert(conn, f"INV-{i}", rng.choice([1, 2]), status, paid_date, rng.randint(1, 900),
+                    rng.choice(["2024-01", "2024-02"]))
+        elif op < 0.8:
+            conn.execute("UPDATE invoices SET status = ?, paid_date = ?, amount = amount + 1 WHERE id = ?",
+                         (status, paid_date, rng.choice(ids)))
+        else:
+            conn.execute("DELETE FROM invoices WHERE id = ?", (rng.choice(ids),))
+    assert conn.execute("SELECT COUNT(*) FROM invoices WHERE status IS NULL").fetchone()[0] > 0
+    assert migrations.ap_drift(conn) == []
@@ -0,0 +1,101 @@
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, List
+
+import pandas as pd
+
+import xlsx_ingest
+
+# Parsed uploads are shared by all sessions of the process, keyed by a hash of
+# the file content, so widget reruns reuse the frame instead of re-parsing.
+# Cached frames must be treated as read-only by callers.
+MAX_CACHE_BYTES = 512 * 1024 * 1024
+MAX_ENTRIES = 64
+
+_entries = OrderedDict()
+_sizes = {}
+_total_bytes = 0
+_lock = threading.Lock()
+_MISSING = object()
+
+
+def content_hash(uploaded_file) -> str:
+    return hashlib.blake2b(uploaded_file.getvalue(), digest_size=20).hexdigest()
+
+
+def _frame_bytes(value) -> int:
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    return 0
+
+
+def _evict(limit: int):
+    global _total_bytes
+    while _entries and (_total_bytes > limit or len(_entries) > MAX_ENTRIES):
+        key, _ = _entries.popitem(last=False)
+        _total_bytes -= _sizes.pop(key)
+
+
+def _lookup(key: Hashable):
+    with _lock:
+        if key in _entries:
+            _entries.move_to_end(key)
+            return _entries[key]
+    return _MISSING
+
+
+def get_or_parse(key: Hashable, parse: Callable):
+    global _total_bytes
+    value = _lookup(key)
+    if value is not _MISSING:
+        return value
+
+    value = parse()
+    size = _frame_bytes(value)
+    if size > MAX_CACHE_BYTES:
+        return value
+
+    with _lock:
+        if key not in _entries:
+            _entries[key] = value
+            _sizes[key] = size
+            _total_bytes += size
+            _evict(MAX_CACHE_BYTES)
+    return value
+
+
+def clear():
+    global _total_bytes
+    with _lock:
+        _entries.clear()
+        _sizes.clear()
+        _total_bytes = 0
+
+
+def read_csv(uploaded_file, nrows: int = None) -> pd.DataFrame:
+    key = (content_hash(uploaded_file), "csv", nrows)
+    return get_or_parse(key, lambda: pd.read_csv(io.BytesIO(uploaded_file.getvalue()), nrows=nrows))
+
+
+def sheet_headers(uploaded_file) -> Dict[str, List[str]]:
+    key = (content_hash(uploaded_file), "xlsx-headers", None)
+    return get_or_parse(key, lambda: xlsx_ingest.sheet_headers(uploaded_file.getvalue()))
+
+
+def read_sheets(uploaded_file, sheets: List[str], columns: List[str] = None) -> Dict[str, pd.DataFrame]:
+    # whole sheets are cached, so changing the column mapping reuses the parse
+    digest = content_hash(uploaded_file)
+    keys = {sheet: (digest, "xlsx", sheet) for sheet in sheets}
+
+    frames = {sheet: _lookup(key) for sheet, key in keys.items()}
+    frames = {sheet: df for sheet, df in frames.items() if df is not _MISSING}
+    missing = [sheet for sheet in sheets if sheet not in frames]
+    if missing:
+        parsed = xlsx_ingest.read_workbook(uploaded_file.getvalue(), missing)
+        for sheet, df in parsed.items():
+            frames[sheet] = get_or_parse(keys[sheet], lambda df=df: df)
+    if columns is not None:
+        frames = {sheet: df[[c for c in columns if c in df.columns]] for sheet, df in frames.items()}
+    return {sheet: frames[sheet] for sheet in sheets}
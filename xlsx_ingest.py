@@ -0,0 +1,108 @@
+import io
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+# Sheets are read with openpyxl's read-only mode, which streams rows from the
+# sheet XML instead of building the workbook object model, and only the
+# requested columns are kept. Whole workbooks are split one sheet per process.
+# openpyxl is imported on first use, so pages that only handle CSV never load it.
+
+MAX_WORKERS = os.cpu_count() or 1
+# workers never fork the multi-threaded server process: forkserver children fork
+# from a clean single-threaded server process (spawn where it is not available)
+MP_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn")
+
+
+def _open(data: bytes):
+    from openpyxl import load_workbook
+
+    return load_workbook(io.BytesIO(data), read_only=True, data_only=True)
+
+
+def _header_names(row) -> List[str]:
+    # same names pandas would give: blanks become "Unnamed: i", repeats get ".n"
+    names, seen = [], {}
+    for i, value in enumerate(row):
+        name = f"Unnamed: {i}" if value is None else str(value)
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+def sheet_headers(data: bytes) -> Dict[str, List[str]]:
+    wb = _open(data)
+    try:
+        headers = {}
+        for ws in wb.worksheets:
+            first = next(ws.iter_rows(max_row=1, values_only=True), ())
+            headers[ws.title] = _header_names(first)
+        return headers
+    finally:
+        wb.close()
+
+
+def read_sheet(data: bytes, sheet: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    wb = _open(data)
+    try:
+        rows = wb[sheet].iter_rows(values_only=True)
+        header = _header_names(next(rows, ()))
+        wanted = header if columns is None else [c for c in columns if c in header]
+        positions = [header.index(c) for c in wanted]
+
+        records = []
+        for row in rows:
+            if not any(v is not None for v in row):
+                continue
+            records.append([row[i] if i < len(row) else None for i in positions])
+    finally:
+        wb.close()
+
+    df = pd.DataFrame.from_records(records, columns=wanted)
+    return df.infer_objects()
+
+
+# the workbook bytes of the current pool, sent once per worker rather than once per sheet
+_worker_data: Optional[bytes] = None
+
+
+def _init_worker(data: bytes):
+    global _worker_data
+    _worker_data = data
+
+
+def _read_sheet_job(args):
+    sheet, columns = args
+    return sheet, read_sheet(_worker_data, sheet, columns)
+
+
+def read_workbook(
+    data: bytes,
+    sheets: Optional[List[str]] = None,
+    columns: Optional[List[str]] = None,
+    max_workers: int = MAX_WORKERS,
+) -> Dict[str, pd.DataFrame]:
+    if sheets is None:
+        sheets = list(sheet_headers(data))
+    if len(sheets) <= 1 or max_workers <= 1:
+        return {sheet: read_sheet(data, sheet, columns) for sheet in sheets}
+
+    jobs = [(sheet, columns) for sheet in sheets]
+    with ProcessPoolExecutor(max_workers=min(max_workers, len(sheets)), mp_context=MP_CONTEXT,
+                             initializer=_init_worker, initargs=(data,)) as pool:
+        return dict(pool.map(_read_sheet_job, jobs))
+
+
+def combine(frames: Dict[str, pd.DataFrame], sheet_column: str = "Sheet") -> pd.DataFrame:
+    parts = [df.assign(**{sheet_column: sheet}) for sheet, df in frames.items()]
+    if not parts:
+        return pd.DataFrame(columns=[sheet_column])
+    return pd.concat(parts, ignore_index=True)